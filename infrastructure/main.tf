@@ -109,6 +109,7 @@ resource "aws_lambda_function" "predictor" {
 
   s3_bucket = aws_s3_bucket.lambda_artifacts.id
   s3_key    = "${var.environment}/lambda-deployment-latest.zip"
+  publish   = true
 
   environment {
     variables = {
@@ -122,6 +123,17 @@ resource "aws_lambda_function" "predictor" {
   }
 }
 
+# Alias served by API Gateway; scripts/deploy.py moves it (canary, rollback)
+resource "aws_lambda_alias" "live" {
+  name             = "live"
+  function_name    = aws_lambda_function.predictor.function_name
+  function_version = aws_lambda_function.predictor.version
+
+  lifecycle {
+    ignore_changes = [function_version, routing_config]
+  }
+}
+
 # API Gateway (REST API)
 resource "aws_apigatewayv2_api" "predictor_api" {
   name          = "${var.lambda_function_name}-api-${var.environment}"
@@ -157,7 +169,7 @@ resource "aws_apigatewayv2_stage" "default" {
 resource "aws_apigatewayv2_integration" "lambda" {
   api_id             = aws_apigatewayv2_api.predictor_api.id
   integration_type   = "AWS_PROXY"
-  integration_uri    = aws_lambda_function.predictor.invoke_arn
+  integration_uri    = aws_lambda_alias.live.invoke_arn
   integration_method = "POST"
 }
 
@@ -178,6 +190,7 @@ resource "aws_lambda_permission" "api_gateway" {
   statement_id  = "AllowAPIGatewayInvoke"
   action        = "lambda:InvokeFunction"
   function_name = aws_lambda_function.predictor.function_name
+  qualifier     = aws_lambda_alias.live.name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.predictor_api.execution_arn}/*/*"
 }
@@ -240,6 +253,11 @@ output "lambda_function_arn" {
   description = "Lambda function ARN"
 }
 
+output "lambda_alias_arn" {
+  value       = aws_lambda_alias.live.arn
+  description = "ARN of the live alias invoked by API Gateway"
+}
+
 output "lambda_function_name" {
   value       = aws_lambda_function.predictor.function_name
   description = "Lambda function name"
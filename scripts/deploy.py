@@ -0,0 +1,78 @@
+"""Despliega un paquete ya construido a AWS Lambda y API Gateway."""
+
+import argparse
+import sys
+from pathlib import Path
+
+from ml_lambda.config import config
+from ml_lambda.deploy.canary import CanaryConfig
+from ml_lambda.deploy.deployer import AWSDeployer
+from ml_lambda.utils.exceptions import AWSCredentialsError, DeploymentError
+
+
+def parse_args() -> argparse.Namespace:
+    """Parsea los argumentos del despliegue."""
+    parser = argparse.ArgumentParser(description="Desplegar paquete a AWS Lambda")
+    parser.add_argument("--package-path", type=Path, default=Path("deployment_package.zip"))
+    parser.add_argument("--function-name", required=True)
+    parser.add_argument("--environment", default="dev")
+    parser.add_argument("--bucket", default=config.deployment_bucket)
+    parser.add_argument("--api-name", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--canary-percent",
+        type=float,
+        default=None,
+        help="Enviar este porcentaje del tráfico a la versión nueva antes de promoverla",
+    )
+    parser.add_argument("--canary-bake-seconds", type=int, default=CanaryConfig.bake_seconds)
+    parser.add_argument(
+        "--canary-max-p99-increase", type=float, default=CanaryConfig.max_p99_increase
+    )
+    parser.add_argument(
+        "--canary-max-error-rate-increase",
+        type=float,
+        default=CanaryConfig.max_error_rate_increase,
+    )
+    parser.add_argument(
+        "--canary-min-invocations", type=int, default=CanaryConfig.min_invocations
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Despliega el paquete y muestra el resultado."""
+    args = parse_args()
+    deployer = AWSDeployer(
+        environment=args.environment, bucket=args.bucket, max_workers=args.workers
+    )
+    try:
+        canary = None
+        if args.canary_percent is not None:
+            canary = CanaryConfig(
+                traffic_percent=args.canary_percent,
+                bake_seconds=args.canary_bake_seconds,
+                max_p99_increase=args.canary_max_p99_increase,
+                max_error_rate_increase=args.canary_max_error_rate_increase,
+                min_invocations=args.canary_min_invocations,
+            )
+        result = deployer.deploy(
+            args.package_path, args.function_name, api_name=args.api_name, canary=canary
+        )
+    except (FileNotFoundError, ValueError, AWSCredentialsError, DeploymentError) as error:
+        print(f"Deployment failed: {error}", file=sys.stderr)
+        return 1
+
+    print(f"Function: {result.function_arn}")
+    print(f"Version: {result.version}")
+    print(f"Endpoint: {result.api_endpoint}")
+    if result.canary is not None:
+        outcome = "promoted" if result.canary.promote else "rolled back"
+        print(f"Canary {outcome}: {result.canary.reason}")
+        if not result.canary.promote:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ from pathlib import Path
 
 from ml_lambda.config import config
 from ml_lambda.deploy.packager import PackageBuilder
+from ml_lambda.deploy.slimming import SlimmingConfig
 from ml_lambda.utils.exceptions import PackageTooLargeError
 
 
@@ -15,6 +16,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--source-dir", type=Path, default=Path("src"))
     parser.add_argument("--model-path", type=Path, default=config.model_path)
     parser.add_argument("--output-path", type=Path, default=Path("deployment_package.zip"))
+    parser.add_argument("--cache-dir", type=Path, default=config.dependency_cache_dir)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--no-slim", action="store_true")
+    parser.add_argument("--prune-unused", action="store_true")
+    parser.add_argument("--report", type=Path, default=None)
+    parser.add_argument("--layers-dir", type=Path, default=None)
     return parser.parse_args()
 
 
@@ -22,19 +29,48 @@ def main() -> int:
     """Construye el paquete y muestra sus metadatos."""
     args = parse_args()
     try:
-        package_info = PackageBuilder().build(
+        cache_dir = None if args.no_cache else args.cache_dir
+        if args.no_slim:
+            slimming = SlimmingConfig(
+                remove_tests=False,
+                remove_patterns=[],
+                clean_dist_info=False,
+                strip_binaries=False,
+            )
+        else:
+            slimming = SlimmingConfig(prune_unused=args.prune_unused)
+        builder = PackageBuilder(cache_dir=cache_dir, slimming=slimming, report_path=args.report)
+        if args.layers_dir is not None:
+            layered = builder.build_layers(
+                source_dir=args.source_dir,
+                model_path=args.model_path,
+                output_dir=args.layers_dir,
+            )
+            for name, info in (
+                ("Dependencies layer", layered.dependencies),
+                ("Code", layered.code),
+                ("Model layer", layered.model),
+            ):
+                print(f"{name}: {info.path} ({info.size_mb:.2f} MB)")
+            print(f"Manifest: {layered.manifest_path}")
+            return 0
+        package_info = builder.build(
             source_dir=args.source_dir,
             model_path=args.model_path,
             output_path=args.output_path,
         )
-    except (FileNotFoundError, PackageTooLargeError, RuntimeError) as error:
+    except (FileNotFoundError, PackageTooLargeError, RuntimeError, ValueError) as error:
         print(f"Package creation failed: {error}", file=sys.stderr)
+        if isinstance(error, PackageTooLargeError) and args.report is not None:
+            print(f"See the size report: {args.report}", file=sys.stderr)
         return 1
 
     print(f"Package created: {package_info.path}")
     print(f"Size: {package_info.size_mb:.2f} MB")
     print(f"SHA256: {package_info.sha256_hash}")
     print(f"Included files: {len(package_info.included_files)}")
+    if args.report is not None:
+        print(f"Report: {args.report}")
     return 0
 
 
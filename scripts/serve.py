@@ -0,0 +1,40 @@
+"""Sirve lambda_handler por HTTP emulando API Gateway."""
+
+import argparse
+import sys
+
+from ml_lambda.inference.batching import MicroBatcher
+from ml_lambda.inference.server import InferenceServer, bind_socket, run
+
+
+def parse_args() -> argparse.Namespace:
+    """Parsea los argumentos del servidor."""
+    parser = argparse.ArgumentParser(description="Servidor HTTP de inferencia")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=1,
+        help="Agrupar hasta este número de predicciones concurrentes (1 = sin agrupar)",
+    )
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Abre el socket y atiende solicitudes hasta recibir SIGTERM o SIGINT."""
+    args = parse_args()
+    sock = bind_socket(args.host, args.port)
+    host, port = sock.getsockname()[:2]
+    print(f"Serving POST /predict on http://{host}:{port} ({args.workers} workers)", flush=True)
+    batcher = None
+    if args.max_batch_size > 1:
+        batcher = MicroBatcher(args.max_batch_size, args.batch_window_ms)
+    run(InferenceServer(batcher=batcher), sock, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Script de barrido de hiperparámetros en paralelo."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from ml_lambda.config import config
+from ml_lambda.data.processor import DataProcessor
+from ml_lambda.training.sweep import SweepRunner, expand_grid
+from ml_lambda.training.trainer import TrainingConfig
+from ml_lambda.utils.logging import StructuredLogger
+
+
+def parse_args():
+    """Parsea argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Barrido paralelo de configuraciones de entrenamiento"
+    )
+    parser.add_argument(
+        "--grid",
+        required=True,
+        help="Grid en JSON (o ruta a un fichero JSON): campo de TrainingConfig -> lista de valores",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=config.artifacts_dir / "sweep",
+        help="Directorio de resultados del barrido",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Procesos en paralelo (por defecto, uno por CPU)",
+    )
+    parser.add_argument(
+        "--latency-samples",
+        type=int,
+        default=100,
+        help="Predicciones individuales para medir la latencia",
+    )
+    parser.add_argument(
+        "--random-state",
+        type=int,
+        default=config.random_state,
+        help="Semilla aleatoria para reproducibilidad",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=config.data_cache_dir,
+        help="Directorio de caché de datos divididos y normalizados",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Desactivar la caché de datos")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Punto de entrada para el barrido."""
+    args = parse_args()
+    logger = StructuredLogger("sweep")
+
+    grid_path = Path(args.grid)
+    grid = json.loads(grid_path.read_text() if grid_path.is_file() else args.grid)
+    base = TrainingConfig(
+        n_estimators=config.n_estimators,
+        max_depth=config.max_depth,
+        min_samples_split=config.min_samples_split,
+        random_state=args.random_state,
+        n_cv_folds=config.n_cv_folds,
+    )
+    configs = expand_grid(grid, base=base)
+    if not configs:
+        # Una lista de valores vacía en el grid no deja ninguna combinación
+        print(
+            f"El grid no produce ninguna configuración (¿alguna lista vacía?): {grid}",
+            file=sys.stderr,
+        )
+        return 1
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    processor = DataProcessor(
+        test_size=config.test_size, random_state=args.random_state, cache_dir=cache_dir
+    )
+    X_train, X_test, y_train, y_test = processor.load_split_normalized()
+
+    runner = SweepRunner(
+        args.output_dir / "results.jsonl",
+        max_workers=args.workers,
+        latency_samples=args.latency_samples,
+    )
+    already_done = len(runner.load_results())
+    logger.info(
+        "Iniciando barrido", extra={"n_configs": len(configs), "already_done": already_done}
+    )
+    results = runner.run(configs, X_train, y_train, X_test, y_test)
+
+    table_path = args.output_dir / "results.csv"
+    runner.write_table(results, table_path)
+    best = max(results, key=lambda r: (r.accuracy, r.cv_mean))
+    logger.info(
+        "Barrido completado",
+        extra={
+            "table": str(table_path),
+            "best_config": best.config,
+            "best_accuracy": best.accuracy,
+        },
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
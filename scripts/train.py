@@ -8,6 +8,7 @@ from pathlib import Path
 from ml_lambda.config import config
 from ml_lambda.data.processor import DataProcessor
 from ml_lambda.model.serializer import ModelMetadata, ModelSerializer
+from ml_lambda.training.distiller import STUDENT_TYPES, DistillationConfig, ModelDistiller
 from ml_lambda.training.evaluator import ModelEvaluator
 from ml_lambda.training.trainer import ModelTrainer, TrainingConfig
 from ml_lambda.utils.logging import StructuredLogger
@@ -21,6 +22,10 @@ def parse_args():
     parser.add_argument("--min-samples-split", type=int, default=config.min_samples_split, help="Mínimo de muestras para dividir un nodo")
     parser.add_argument("--output-dir", type=Path, default=config.artifacts_dir, help="Directorio de salida para el modelo")
     parser.add_argument("--random-state", type=int, default=config.random_state, help="Semilla aleatoria para reproducibilidad")
+    parser.add_argument("--cache-dir", type=Path, default=config.data_cache_dir, help="Directorio de caché de datos divididos y normalizados")
+    parser.add_argument("--no-cache", action="store_true", help="Desactivar la caché de datos")
+    parser.add_argument("--student", choices=STUDENT_TYPES, default=None, help="Destilar el Random Forest en un modelo estudiante compacto y guardar este")
+    parser.add_argument("--student-max-depth", type=int, default=4, help="Profundidad máxima del árbol estudiante")
     return parser.parse_args()
 
 
@@ -31,12 +36,10 @@ def main() -> int:
     logger.info("Iniciando pipeline de entrenamiento")
 
     # 1. Cargar y procesar datos
-    processor = DataProcessor(test_size=config.test_size, random_state=args.random_state)
-    X, y = processor.load_iris()
-    X_train, X_test, y_train, y_test = processor.split_data(X, y)
-    X_train_norm = processor.normalize(X_train, fit=True)
-    X_test_norm = processor.normalize(X_test, fit=False)
-    logger.info("Datos cargados y procesados", extra={"train_size": len(X_train), "test_size": len(X_test)})
+    cache_dir = None if args.no_cache else args.cache_dir
+    processor = DataProcessor(test_size=config.test_size, random_state=args.random_state, cache_dir=cache_dir)
+    X_train_norm, X_test_norm, y_train, y_test = processor.load_split_normalized()
+    logger.info("Datos cargados y procesados", extra={"train_size": len(X_train_norm), "test_size": len(X_test_norm)})
 
     # 2. Entrenar modelo
     training_config = TrainingConfig(
@@ -56,7 +59,20 @@ def main() -> int:
     evaluator.check_accuracy_threshold(metrics, config.accuracy_threshold)
     logger.info("Modelo evaluado", extra={"accuracy": metrics.accuracy, "f1_score": metrics.f1_score})
 
-    # 4. Guardar modelo
+    training_config_dict = {"n_estimators": training_config.n_estimators, "max_depth": training_config.max_depth, "min_samples_split": training_config.min_samples_split, "random_state": training_config.random_state, "n_cv_folds": training_config.n_cv_folds}
+    model = result.model
+
+    # 4. Destilar (opcional)
+    if args.student is not None:
+        distillation_config = DistillationConfig(student_type=args.student, max_depth=args.student_max_depth, random_state=args.random_state)
+        distilled = ModelDistiller(distillation_config).distill(result.model, X_train_norm, X_test_norm, y_test)
+        evaluator.check_accuracy_threshold(distilled.metrics, config.accuracy_threshold)
+        logger.info("Modelo destilado", extra={"student": args.student, "accuracy": distilled.metrics.accuracy, "fidelity": distilled.fidelity})
+        model = distilled.student
+        metrics = distilled.metrics
+        training_config_dict["distillation"] = distilled.to_training_config(distillation_config)
+
+    # 5. Guardar modelo
     output_path = args.output_dir / config.model_filename
     metadata = ModelMetadata(
         version=config.version,
@@ -66,10 +82,10 @@ def main() -> int:
         n_classes=len(config.class_names),
         feature_names=config.feature_names,
         class_names=config.class_names,
-        training_config={"n_estimators": training_config.n_estimators, "max_depth": training_config.max_depth, "min_samples_split": training_config.min_samples_split, "random_state": training_config.random_state, "n_cv_folds": training_config.n_cv_folds},
+        training_config=training_config_dict,
     )
     serializer = ModelSerializer()
-    model_hash = serializer.save(result.model, metadata, output_path)
+    model_hash = serializer.save(model, metadata, output_path, scaler=processor.scaler)
     logger.info("Modelo guardado", extra={"path": str(output_path), "hash": model_hash})
 
     return 0
@@ -0,0 +1,79 @@
+"""Recomienda la memoria de Lambda con benchmarks locales por tier."""
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+from ml_lambda.config import config
+from ml_lambda.deploy.tuning import (
+    DEFAULT_MEMORY_TIERS,
+    PowerTuner,
+    apply_memory_setting,
+    format_table,
+    recommend,
+)
+
+CONFIG_PATH = Path("src") / "ml_lambda" / "config.py"
+TERRAFORM_PATH = Path("infrastructure") / "main.tf"
+
+
+def parse_args() -> argparse.Namespace:
+    """Parsea los argumentos del ajuste de memoria."""
+    parser = argparse.ArgumentParser(description="Elegir la memoria de la función Lambda")
+    parser.add_argument("--artifacts-dir", type=Path, default=config.artifacts_dir)
+    parser.add_argument("--tiers", type=int, nargs="+", default=list(DEFAULT_MEMORY_TIERS))
+    parser.add_argument("--invocations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--max-p99-ms", type=float, default=None)
+    parser.add_argument("--no-cgroup", action="store_true")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Escribir la memoria recomendada en config.py y en infrastructure/main.tf",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Mide cada tier, muestra la tabla y opcionalmente aplica la recomendación."""
+    args = parse_args()
+    tuner = PowerTuner(
+        artifacts_dir=args.artifacts_dir,
+        tiers=tuple(args.tiers),
+        invocations=args.invocations,
+        warmup=args.warmup,
+        use_cgroup=not args.no_cgroup,
+    )
+    try:
+        results = tuner.run()
+    except (RuntimeError, subprocess.SubprocessError) as error:
+        print(f"Power tuning failed: {error}", file=sys.stderr)
+        return 1
+
+    recommended = recommend(results, args.max_p99_ms)
+    print(format_table(results, recommended))
+    print(f"Recommended memory: {recommended.memory_mb} MB (current: {config.lambda_memory} MB)")
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "recommended_memory_mb": recommended.memory_mb,
+                    "tiers": [asdict(result) for result in results],
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+    if args.apply:
+        apply_memory_setting(recommended.memory_mb, CONFIG_PATH, TERRAFORM_PATH)
+        print(f"Updated {CONFIG_PATH} and {TERRAFORM_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,10 +8,12 @@ import numpy as np
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from ml_lambda.config import config as app_config
 from ml_lambda.data.processor import DataProcessor
 from ml_lambda.training.trainer import ModelTrainer, TrainingConfig
 from ml_lambda.training.evaluator import ModelEvaluator
 from ml_lambda.model.serializer import ModelSerializer, ModelMetadata
+from ml_lambda.model.fusion import fuse_scaler
 from ml_lambda.utils.logging import StructuredLogger
 
 logger = StructuredLogger("verify_serialization")
@@ -23,11 +25,9 @@ def main():
     
     # 1. Load and prepare data
     logger.info("Loading dataset")
-    processor = DataProcessor()
-    X, y = processor.load_iris()
-    X_train, X_test, y_train, y_test = processor.split_data(X, y)
-    X_train = processor.normalize(X_train, fit=True)
-    X_test = processor.normalize(X_test, fit=False)
+    processor = DataProcessor(cache_dir=app_config.data_cache_dir)
+    X_train, X_test, y_train, y_test = processor.load_split_normalized()
+    X_test_raw = processor.scaler.inverse_transform(X_test)
     
     # 2. Train model
     logger.info("Training model")
@@ -76,7 +76,7 @@ def main():
     )
     
     serializer = ModelSerializer()
-    model_hash = serializer.save(result.model, metadata, model_path)
+    model_hash = serializer.save(result.model, metadata, model_path, scaler=processor.scaler)
     
     logger.info("Model saved", path=str(model_path), hash=model_hash)
     
@@ -94,14 +94,19 @@ def main():
     logger.info("Making predictions with loaded model")
     loaded_predictions = loaded.model.predict(X_test)
     loaded_probabilities = loaded.model.predict_proba(X_test)
+
+    # The serving path fuses the saved scaler into the model and feeds raw features
+    fused_model = fuse_scaler(loaded.model, loaded.scaler)
+    fused_predictions = fused_model.predict(X_test_raw)
     
     # 8. Verify predictions are identical
     logger.info("Verifying predictions")
     
     predictions_match = np.array_equal(original_predictions, loaded_predictions)
     probabilities_match = np.allclose(original_probabilities, loaded_probabilities)
+    fused_match = np.array_equal(original_predictions, fused_predictions)
     
-    if predictions_match and probabilities_match:
+    if predictions_match and probabilities_match and fused_match:
         logger.info("✓ Verification PASSED: Predictions are identical after serialization")
         print("\n" + "="*60)
         print("✓ SERIALIZATION VERIFICATION PASSED")
@@ -113,6 +118,7 @@ def main():
         print(f"\nTest samples: {len(X_test)}")
         print(f"Predictions match: {predictions_match}")
         print(f"Probabilities match: {probabilities_match}")
+        print(f"Fused model on raw features matches: {fused_match}")
         print("\nSample predictions (first 5):")
         for i in range(min(5, len(X_test))):
             print(f"  Sample {i+1}: {original_predictions[i]} (prob: {original_probabilities[i].max():.3f})")
@@ -122,13 +128,15 @@ def main():
         logger.error(
             "✗ Verification FAILED: Predictions differ after serialization",
             predictions_match=predictions_match,
-            probabilities_match=probabilities_match
+            probabilities_match=probabilities_match,
+            fused_match=fused_match
         )
         print("\n" + "="*60)
         print("✗ SERIALIZATION VERIFICATION FAILED")
         print("="*60)
         print(f"Predictions match: {predictions_match}")
         print(f"Probabilities match: {probabilities_match}")
+        print(f"Fused model on raw features matches: {fused_match}")
         
         if not predictions_match:
             diff_count = np.sum(original_predictions != loaded_predictions)
@@ -6,6 +6,7 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from ml_lambda.config import config as app_config
 from ml_lambda.data.processor import DataProcessor
 from ml_lambda.training.trainer import ModelTrainer, TrainingConfig
 from ml_lambda.training.evaluator import ModelEvaluator
@@ -19,7 +20,7 @@ def main() -> int:
 
     # 1. Cargar y preparar datos
     print("\n1. Cargando dataset Iris...")
-    processor = DataProcessor(test_size=0.2, random_state=42)
+    processor = DataProcessor(test_size=0.2, random_state=42, cache_dir=app_config.data_cache_dir)
     X, y = processor.load_iris()
     stats = processor.compute_stats(X, y)
 
@@ -31,17 +32,15 @@ def main() -> int:
     for i, (min_val, max_val) in enumerate(stats.feature_ranges):
         print(f"     Feature {i}: [{min_val:.2f}, {max_val:.2f}]")
 
-    # 2. Dividir datos
+    # 2-3. Dividir y normalizar (reutiliza la caché de datos si existe)
     print("\n2. Dividiendo datos (80/20)...")
-    X_train, X_test, y_train, y_test = processor.split_data(X, y)
-    print(f"   - Train: {len(X_train)} muestras")
-    print(f"   - Test: {len(X_test)} muestras")
+    cache_hit = (processor.cache_dir / processor.cache_key()).is_dir()
+    X_train_norm, X_test_norm, y_train, y_test = processor.load_split_normalized()
+    print(f"   - Train: {len(X_train_norm)} muestras")
+    print(f"   - Test: {len(X_test_norm)} muestras")
 
-    # 3. Normalizar
     print("\n3. Normalizando features...")
-    X_train_norm = processor.normalize(X_train, fit=True)
-    X_test_norm = processor.normalize(X_test, fit=False)
-    print("   - Normalización completada")
+    print(f"   - Normalización completada{' (caché)' if cache_hit else ''}")
 
     # 4. Entrenar modelo
     print("\n4. Entrenando modelo RandomForest...")
@@ -1,9 +1,35 @@
 """Configuración centralizada del proyecto."""
 
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+# Variable de entorno que sobrescribe el directorio del modelo (ej: la ruta de
+# una capa de Lambda con el modelo, /opt/artifacts)
+ARTIFACTS_DIR_ENV = "ML_LAMBDA_ARTIFACTS_DIR"
+
+# Variables de entorno de la recarga en caliente del modelo: origen (ruta
+# local o s3://bucket/key) y segundos entre comprobaciones (0 la desactiva)
+MODEL_URI_ENV = "ML_LAMBDA_MODEL_URI"
+MODEL_CHECK_INTERVAL_ENV = "ML_LAMBDA_MODEL_CHECK_INTERVAL"
+
+# Variables de entorno del registro multi-modelo: directorio de modelos
+# (<model_id>/<versión>/model.joblib) y memoria máxima de modelos cargados
+MODELS_DIR_ENV = "ML_LAMBDA_MODELS_DIR"
+MODEL_CACHE_MB_ENV = "ML_LAMBDA_MODEL_CACHE_MB"
+
+# Variable de entorno con la ruta de un modelo candidato evaluado en sombra
+SHADOW_MODEL_PATH_ENV = "ML_LAMBDA_SHADOW_MODEL_PATH"
+
+# Variable de entorno con los segundos entre registros de latencia por etapa
+# (0 los desactiva)
+STAGE_METRICS_INTERVAL_ENV = "ML_LAMBDA_STAGE_METRICS_INTERVAL"
+
+# Variable de entorno con el namespace de CloudWatch de las métricas EMF
+# (vacía o sin definir, las desactiva)
+METRICS_NAMESPACE_ENV = "ML_LAMBDA_METRICS_NAMESPACE"
+
 
 @dataclass
 class Config:
@@ -16,13 +42,19 @@ class Config:
     project_root: Path = field(
         default_factory=lambda: Path(__file__).parent.parent.parent
     )
-    artifacts_dir: Path = field(default_factory=lambda: Path("artifacts"))
+    artifacts_dir: Path = field(
+        default_factory=lambda: Path(os.environ.get(ARTIFACTS_DIR_ENV, "artifacts"))
+    )
     model_filename: str = "model.joblib"
     metadata_filename: str = "model_metadata.json"
 
     # Data
     test_size: float = 0.2
     random_state: int = 42
+    data_cache_dir: Path = field(default_factory=lambda: Path(".cache") / "data")
+    dependency_cache_dir: Path = field(
+        default_factory=lambda: Path(".cache") / "dependencies"
+    )
 
     # Training
     n_estimators: int = 100
@@ -34,11 +66,36 @@ class Config:
     # Inference
     expected_features: int = 4
     max_body_size: int = 1024  # 1KB
+    model_uri: Optional[str] = field(default_factory=lambda: os.environ.get(MODEL_URI_ENV))
+    model_check_interval: float = field(
+        default_factory=lambda: float(os.environ.get(MODEL_CHECK_INTERVAL_ENV, "0"))
+    )
+    models_dir: Optional[Path] = field(
+        default_factory=lambda: Path(os.environ[MODELS_DIR_ENV])
+        if MODELS_DIR_ENV in os.environ
+        else None
+    )
+    model_cache_mb: int = field(
+        default_factory=lambda: int(os.environ.get(MODEL_CACHE_MB_ENV, "64"))
+    )
+    shadow_model_path: Optional[Path] = field(
+        default_factory=lambda: Path(os.environ[SHADOW_MODEL_PATH_ENV])
+        if SHADOW_MODEL_PATH_ENV in os.environ
+        else None
+    )
+    stage_metrics_interval: float = field(
+        default_factory=lambda: float(os.environ.get(STAGE_METRICS_INTERVAL_ENV, "60"))
+    )
+    metrics_namespace: str = field(
+        default_factory=lambda: os.environ.get(METRICS_NAMESPACE_ENV, "")
+    )
 
     # AWS
     aws_region: str = "us-east-1"
     lambda_timeout: int = 30
     lambda_memory: int = 256
+    lambda_runtime: str = "python3.12"
+    deployment_bucket: str = "ml-lambda-deployment-artifacts"
 
     # Logging
     log_level: str = "INFO"
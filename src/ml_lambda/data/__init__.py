@@ -1,5 +1,5 @@
 """Módulo de procesamiento de datos."""
 
-from .processor import DataProcessor, DatasetStats
+from .processor import DataProcessor, DatasetStats, StatsAccumulator
 
-__all__ = ["DataProcessor", "DatasetStats"]
+__all__ = ["DataProcessor", "DatasetStats", "StatsAccumulator"]
@@ -1,15 +1,38 @@
 """Procesamiento y preparación de datos."""
 
-from dataclasses import dataclass
-from typing import Tuple
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
 
+import joblib
 import numpy as np
+import sklearn
 from sklearn.datasets import load_iris as sklearn_load_iris
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
 from ml_lambda.utils.exceptions import DataValidationError
 
+# Filas por bloque en la lectura out-of-core
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Cuantiles por feature incluidos en DatasetStats
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+# Filas retenidas por el sketch de cuantiles (exacto por debajo de este tamaño)
+DEFAULT_SAMPLE_SIZE = 10_000
+
+# Versión del formato de la caché de datos; cambiarla invalida las entradas previas
+CACHE_FORMAT_VERSION = 1
+
+SPLIT_ARRAY_NAMES = ("X_train", "X_test", "y_train", "y_test")
+
 
 @dataclass
 class DatasetStats:
@@ -20,15 +43,200 @@ class DatasetStats:
     n_classes: int
     class_distribution: dict[int, int]
     feature_ranges: list[Tuple[float, float]]
+    feature_means: list[float] = field(default_factory=list)
+    feature_variances: list[float] = field(default_factory=list)
+    feature_quantiles: dict[float, list[float]] = field(default_factory=dict)
+
+
+class StatsAccumulator:
+    """Acumula estadísticas del dataset bloque a bloque.
+
+    Media y varianza se combinan con la fórmula paralela de Chan (Welford
+    por bloques), rangos y distribución de clases se suman, y los cuantiles
+    se estiman sobre una muestra bottom-k: cada fila recibe una clave
+    aleatoria y se conservan las sample_size claves menores, lo que da una
+    muestra uniforme sin reemplazo que también puede combinarse. Dos
+    acumuladores calculados en paralelo se unen con merge().
+    """
+
+    def __init__(
+        self,
+        quantiles: Iterable[float] = DEFAULT_QUANTILES,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        random_state: Optional[int] = None,
+    ):
+        self.quantiles = tuple(quantiles)
+        self.sample_size = sample_size
+        self._rng = np.random.default_rng(random_state)
+        self.n_samples = 0
+        self._mean: Optional[np.ndarray] = None
+        self._m2: Optional[np.ndarray] = None
+        self._min: Optional[np.ndarray] = None
+        self._max: Optional[np.ndarray] = None
+        self._class_counts: dict[int, int] = {}
+        self._sample_keys = np.empty(0)
+        self._sample: Optional[np.ndarray] = None
+
+    def update(self, X: np.ndarray, y: np.ndarray) -> "StatsAccumulator":
+        """Incorpora un bloque de datos.
+
+        Args:
+            X: Features del bloque
+            y: Labels del bloque
+
+        Returns:
+            El propio acumulador, para encadenar llamadas
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) == 0:
+            return self
+
+        chunk = StatsAccumulator(self.quantiles, self.sample_size)
+        chunk.n_samples = len(X)
+        chunk._mean = X.mean(axis=0)
+        chunk._m2 = np.square(X - chunk._mean).sum(axis=0)
+        chunk._min = X.min(axis=0)
+        chunk._max = X.max(axis=0)
+        chunk._class_counts = _class_counts(y)
+        keys = self._rng.random(len(X))
+        keep = self._bottom_k(keys)
+        chunk._sample_keys = keys[keep]
+        chunk._sample = X[keep]
+        return self.merge(chunk)
+
+    def merge(self, other: "StatsAccumulator") -> "StatsAccumulator":
+        """Combina las estadísticas de otro acumulador en este.
+
+        Args:
+            other: Acumulador con estadísticas de otros bloques
+
+        Returns:
+            El propio acumulador
+
+        Raises:
+            DataValidationError: Si el número de features no coincide
+        """
+        if other.n_samples == 0:
+            return self
+        if self.n_samples == 0:
+            self.n_samples = other.n_samples
+            self._mean = other._mean.copy()
+            self._m2 = other._m2.copy()
+            self._min = other._min.copy()
+            self._max = other._max.copy()
+            self._class_counts = dict(other._class_counts)
+            self._sample_keys = other._sample_keys.copy()
+            self._sample = other._sample.copy()
+            return self
+        if other._mean.shape != self._mean.shape:
+            raise DataValidationError(
+                f"Número de features inconsistente: {len(other._mean)} != {len(self._mean)}"
+            )
+
+        n_total = self.n_samples + other.n_samples
+        delta = other._mean - self._mean
+        self._mean = self._mean + delta * (other.n_samples / n_total)
+        self._m2 = self._m2 + other._m2 + np.square(delta) * (
+            self.n_samples * other.n_samples / n_total
+        )
+        self._min = np.minimum(self._min, other._min)
+        self._max = np.maximum(self._max, other._max)
+        for label, count in other._class_counts.items():
+            self._class_counts[label] = self._class_counts.get(label, 0) + count
+
+        keys = np.concatenate([self._sample_keys, other._sample_keys])
+        sample = np.concatenate([self._sample, other._sample])
+        keep = self._bottom_k(keys)
+        self._sample_keys = keys[keep]
+        self._sample = sample[keep]
+        self.n_samples = n_total
+        return self
+
+    def result(self) -> DatasetStats:
+        """Construye DatasetStats con lo acumulado.
+
+        Raises:
+            DataValidationError: Si no se ha acumulado ninguna fila
+        """
+        if self.n_samples == 0:
+            raise DataValidationError("Dataset vacío: no se recibieron bloques con datos")
+
+        variances = self._m2 / self.n_samples
+        quantile_values = np.quantile(self._sample, self.quantiles, axis=0)
+        class_distribution = dict(sorted(self._class_counts.items()))
+        return DatasetStats(
+            n_samples=self.n_samples,
+            n_features=len(self._mean),
+            n_classes=len(class_distribution),
+            class_distribution=class_distribution,
+            feature_ranges=[(float(lo), float(hi)) for lo, hi in zip(self._min, self._max)],
+            feature_means=self._mean.tolist(),
+            feature_variances=variances.tolist(),
+            feature_quantiles={
+                float(q): values.tolist() for q, values in zip(self.quantiles, quantile_values)
+            },
+        )
+
+    def _bottom_k(self, keys: np.ndarray) -> np.ndarray:
+        """Índices de las sample_size claves menores."""
+        if len(keys) <= self.sample_size:
+            return np.arange(len(keys))
+        return np.argpartition(keys, self.sample_size)[: self.sample_size]
+
+
+def _file_digest(path: Path) -> str:
+    """Hash SHA256 del contenido de un archivo."""
+    sha256_hash = hashlib.sha256()
+    with path.open("rb") as source_file:
+        for chunk in iter(lambda: source_file.read(1024 * 1024), b""):
+            sha256_hash.update(chunk)
+    return sha256_hash.hexdigest()
+
+
+def _class_counts(y: np.ndarray) -> dict[int, int]:
+    """Cuenta muestras por clase con un único np.bincount."""
+    y = np.asarray(y)
+    if np.issubdtype(y.dtype, np.integer) and (len(y) == 0 or y.min() >= 0):
+        counts = np.bincount(y)
+        return {int(label): int(counts[label]) for label in np.flatnonzero(counts)}
+    # Labels no enteras o negativas: recurrir a np.unique
+    labels, counts = np.unique(y, return_counts=True)
+    return {int(label): int(count) for label, count in zip(labels, counts)}
+
+
+def _scaler_config(scaler: StandardScaler) -> dict:
+    """Clase y parámetros de un scaler, serializables para la clave de caché."""
+    scaler_class = type(scaler)
+    return {
+        "class": f"{scaler_class.__module__}.{scaler_class.__qualname__}",
+        "params": scaler.get_params(),
+    }
 
 
 class DataProcessor:
     """Procesa y prepara datos para entrenamiento."""
 
-    def __init__(self, test_size: float = 0.2, random_state: int = 42):
+    def __init__(
+        self,
+        test_size: float = 0.2,
+        random_state: int = 42,
+        cache_dir: Optional[Path] = None,
+        scaler_params: Optional[dict] = None,
+    ):
         self.test_size = test_size
         self.random_state = random_state
-        self._scaler = None
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.scaler_params = dict(scaler_params or {})
+        self._scaler: Optional[StandardScaler] = None
+
+    @property
+    def scaler(self) -> Optional[StandardScaler]:
+        """Scaler ajustado por normalize(fit=True), None si no se ha ajustado."""
+        return self._scaler
+
+    def _new_scaler(self) -> StandardScaler:
+        """Crea un scaler sin ajustar con scaler_params."""
+        return StandardScaler(**self.scaler_params)
 
     def load_iris(self) -> Tuple[np.ndarray, np.ndarray]:
         """Carga el dataset Iris.
@@ -41,15 +249,100 @@ class DataProcessor:
         """
         iris = sklearn_load_iris()
         X, y = iris.data, iris.target
+        self._check_nulls(X, y)
+        return X, y
+
+    def load_source(
+        self, source: Path, label_column: int = -1, skip_header: int = 0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Carga completa de un dataset CSV o .npy.
 
-        # Validar que no hay valores nulos
+        Lee la fuente por bloques con iter_chunks(), pero devuelve el dataset
+        entero en memoria: el pico de RAM es del orden del tamaño de los
+        datos. Para fuentes que no caben en memoria, usar iter_chunks() con
+        compute_stats_chunked(), fit_scaler_chunked() y split_chunks().
+
+        Args:
+            source: Ruta al archivo .csv o .npy
+            label_column: Índice de la columna de labels
+            skip_header: Líneas de cabecera a omitir (solo CSV)
+
+        Returns:
+            Tuple de (features, labels)
+        """
+        chunks = list(self.iter_chunks(source, label_column=label_column, skip_header=skip_header))
+        if not chunks:
+            raise DataValidationError(f"Dataset vacío: {source}")
+        return np.vstack([X for X, _ in chunks]), np.concatenate([y for _, y in chunks])
+
+    def iter_chunks(
+        self,
+        source: Path,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        label_column: int = -1,
+        skip_header: int = 0,
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Lee un dataset CSV o .npy por bloques en memoria acotada.
+
+        Cada fila contiene las features y la label en label_column. Los .npy
+        se abren con memory mapping, por lo que solo el bloque actual se
+        materializa en RAM. Cada llamada relee la fuente, de modo que puede
+        usarse una vez por pasada (estadísticas, scaler, división).
+
+        Args:
+            source: Ruta al archivo .csv o .npy
+            chunk_size: Número de filas por bloque
+            label_column: Índice de la columna de labels
+            skip_header: Líneas de cabecera a omitir (solo CSV)
+
+        Yields:
+            Tuple de (features, labels) por bloque
+
+        Raises:
+            DataValidationError: Si un bloque contiene valores nulos o el
+                formato no es soportado
+        """
+        source = Path(source)
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size debe ser positivo, recibido: {chunk_size}")
+
+        for rows in self._iter_rows(source, chunk_size, skip_header):
+            if rows.ndim != 2 or rows.shape[1] < 2:
+                raise DataValidationError(
+                    f"Se esperan filas con features y label, forma recibida: {rows.shape}"
+                )
+            y = rows[:, label_column]
+            X = np.delete(rows, label_column, axis=1)
+            self._check_nulls(X, y)
+            yield X, y.astype(np.int64)
+
+    def _iter_rows(
+        self, source: Path, chunk_size: int, skip_header: int
+    ) -> Iterator[np.ndarray]:
+        """Itera bloques de filas crudas de la fuente."""
+        suffix = source.suffix.lower()
+        if suffix == ".npy":
+            data = np.load(source, mmap_mode="r")
+            for start in range(0, len(data), chunk_size):
+                yield np.array(data[start : start + chunk_size], dtype=np.float64)
+        elif suffix == ".csv":
+            with source.open() as handle:
+                for _ in range(skip_header):
+                    next(handle, None)
+                while lines := list(islice(handle, chunk_size)):
+                    # genfromtxt convierte campos vacíos en NaN para la validación
+                    yield np.genfromtxt(lines, delimiter=",", dtype=np.float64, ndmin=2)
+        else:
+            raise DataValidationError(f"Formato de datos no soportado: {source.suffix}")
+
+    @staticmethod
+    def _check_nulls(X: np.ndarray, y: np.ndarray) -> None:
+        """Valida que features y labels no contienen valores nulos."""
         if np.isnan(X).any():
             raise DataValidationError("Dataset contiene valores nulos en features")
         if np.isnan(y).any():
             raise DataValidationError("Dataset contiene valores nulos en labels")
 
-        return X, y
-
     def split_data(
         self, X: np.ndarray, y: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
@@ -64,6 +357,28 @@ class DataProcessor:
         """
         return train_test_split(X, y, test_size=self.test_size, random_state=self.random_state)
 
+    def split_chunks(
+        self, chunks: Iterable[Tuple[np.ndarray, np.ndarray]]
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Divide en train/test bloque a bloque.
+
+        Cada bloque se reparte con la proporción test_size usando un generador
+        aleatorio sembrado con random_state, por lo que la división es
+        reproducible sin cargar el dataset completo.
+
+        Args:
+            chunks: Bloques (features, labels), ej: de iter_chunks()
+
+        Yields:
+            Tuple de (X_train, X_test, y_train, y_test) por bloque
+        """
+        rng = np.random.default_rng(self.random_state)
+        for X, y in chunks:
+            n_test = int(round(len(X) * self.test_size))
+            is_test = np.zeros(len(X), dtype=bool)
+            is_test[rng.permutation(len(X))[:n_test]] = True
+            yield X[~is_test], X[is_test], y[~is_test], y[is_test]
+
     def normalize(self, X: np.ndarray, fit: bool = False) -> np.ndarray:
         """Normaliza features usando StandardScaler.
 
@@ -75,10 +390,116 @@ class DataProcessor:
             Features normalizados
         """
         if fit or self._scaler is None:
-            self._scaler = StandardScaler()
+            self._scaler = self._new_scaler()
             return self._scaler.fit_transform(X)
         return self._scaler.transform(X)
 
+    def load_split_normalized(
+        self,
+        source: Optional[Path] = None,
+        label_column: int = -1,
+        skip_header: int = 0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Carga, divide y normaliza, reutilizando la caché en disco.
+
+        Con cache_dir configurado, los arrays resultantes se guardan como .npy
+        bajo una clave derivada del contenido de la fuente, test_size,
+        random_state y la configuración del scaler (clase y scaler_params). Una
+        ejecución posterior con la misma clave los abre con memory mapping sin
+        repetir la etapa de datos, y restaura el scaler ajustado. Sin entrada
+        en caché, el dataset se carga completo en memoria (ver load_source).
+
+        Args:
+            source: Dataset CSV/.npy; None para el dataset Iris incluido
+            label_column: Índice de la columna de labels
+            skip_header: Líneas de cabecera a omitir (solo CSV)
+
+        Returns:
+            Tuple de (X_train normalizado, X_test normalizado, y_train, y_test)
+        """
+        entry_dir = None
+        if self.cache_dir is not None:
+            entry_dir = self.cache_dir / self.cache_key(source, label_column, skip_header)
+            if entry_dir.is_dir():
+                self._scaler = joblib.load(entry_dir / "scaler.joblib")
+                return tuple(  # type: ignore[return-value]
+                    np.load(entry_dir / f"{name}.npy", mmap_mode="r")
+                    for name in SPLIT_ARRAY_NAMES
+                )
+
+        if source is None:
+            X, y = self.load_iris()
+        else:
+            X, y = self.load_source(source, label_column, skip_header)
+        X_train, X_test, y_train, y_test = self.split_data(X, y)
+        arrays = (self.normalize(X_train, fit=True), self.normalize(X_test), y_train, y_test)
+
+        if entry_dir is not None:
+            self._write_cache_entry(entry_dir, arrays)
+        return arrays
+
+    def cache_key(
+        self, source: Optional[Path] = None, label_column: int = -1, skip_header: int = 0
+    ) -> str:
+        """Clave de caché para los datos preparados.
+
+        Args:
+            source: Dataset CSV/.npy; None para el dataset Iris incluido
+            label_column: Índice de la columna de labels
+            skip_header: Líneas de cabecera a omitir (solo CSV)
+
+        Returns:
+            Hash SHA256 hexadecimal
+        """
+        if source is None:
+            # Iris viene empaquetado con scikit-learn: su versión identifica los datos
+            source_digest = f"sklearn-iris-{sklearn.__version__}"
+        else:
+            source_digest = _file_digest(Path(source))
+
+        key_data = {
+            "format": CACHE_FORMAT_VERSION,
+            "source": source_digest,
+            "label_column": label_column,
+            "skip_header": skip_header,
+            "test_size": self.test_size,
+            "random_state": self.random_state,
+            "scaler": _scaler_config(self._new_scaler()),
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+    def _write_cache_entry(self, entry_dir: Path, arrays: Tuple[np.ndarray, ...]) -> None:
+        """Escribe una entrada de caché de forma atómica."""
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=entry_dir.parent))
+        try:
+            for name, array in zip(SPLIT_ARRAY_NAMES, arrays):
+                np.save(staging_dir / f"{name}.npy", array)
+            joblib.dump(self._scaler, staging_dir / "scaler.joblib")
+            os.replace(staging_dir, entry_dir)
+        except OSError:
+            # Otra ejecución escribió la misma entrada primero
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            if not entry_dir.is_dir():
+                raise
+
+    def fit_scaler_chunked(
+        self, chunks: Iterable[Tuple[np.ndarray, np.ndarray]]
+    ) -> StandardScaler:
+        """Ajusta el scaler de forma incremental con partial_fit.
+
+        Args:
+            chunks: Bloques (features, labels) de entrenamiento
+
+        Returns:
+            Scaler ajustado, usado después por normalize(fit=False)
+        """
+        scaler = self._new_scaler()
+        for X, _ in chunks:
+            scaler.partial_fit(X)
+        self._scaler = scaler
+        return scaler
+
     def compute_stats(self, X: np.ndarray, y: np.ndarray) -> DatasetStats:
         """Calcula estadísticas del dataset.
 
@@ -87,22 +508,26 @@ class DataProcessor:
             y: Labels del dataset
 
         Returns:
-            DatasetStats con n_samples, distribución, rangos
+            DatasetStats con n_samples, distribución, rangos, media, varianza
+            y cuantiles por feature
         """
-        n_samples, n_features = X.shape
-        unique_classes = np.unique(y)
-        n_classes = len(unique_classes)
+        return StatsAccumulator(random_state=self.random_state).update(X, y).result()
 
-        # Distribución de clases
-        class_distribution = {int(c): int(np.sum(y == c)) for c in unique_classes}
+    def compute_stats_chunked(
+        self, chunks: Iterable[Tuple[np.ndarray, np.ndarray]]
+    ) -> DatasetStats:
+        """Calcula estadísticas del dataset de forma incremental.
 
-        # Rangos de features
-        feature_ranges = [(float(X[:, i].min()), float(X[:, i].max())) for i in range(n_features)]
+        Args:
+            chunks: Bloques (features, labels), ej: de iter_chunks()
 
-        return DatasetStats(
-            n_samples=n_samples,
-            n_features=n_features,
-            n_classes=n_classes,
-            class_distribution=class_distribution,
-            feature_ranges=feature_ranges,
-        )
+        Returns:
+            DatasetStats equivalentes a compute_stats sobre el dataset completo
+
+        Raises:
+            DataValidationError: Si no hay datos o las features no coinciden
+        """
+        accumulator = StatsAccumulator(random_state=self.random_state)
+        for X, y in chunks:
+            accumulator.update(X, y)
+        return accumulator.result()
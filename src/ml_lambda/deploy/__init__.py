@@ -1,6 +1,19 @@
 """Módulo de empaquetado y despliegue."""
 
-from .packager import PackageBuilder, PackageInfo
+from .packager import LayeredPackage, PackageBuilder, PackageInfo
+from .backends import Boto3Backend, DeploymentBackend, LocalBackend
+from .canary import CanaryConfig, CanaryDecision
 from .deployer import AWSDeployer, DeploymentResult
 
-__all__ = ["PackageBuilder", "PackageInfo", "AWSDeployer", "DeploymentResult"]
+__all__ = [
+    "PackageBuilder",
+    "PackageInfo",
+    "LayeredPackage",
+    "DeploymentBackend",
+    "Boto3Backend",
+    "LocalBackend",
+    "CanaryConfig",
+    "CanaryDecision",
+    "AWSDeployer",
+    "DeploymentResult",
+]
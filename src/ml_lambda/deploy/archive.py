@@ -0,0 +1,244 @@
+"""Escritura de archivos ZIP con compresión en paralelo."""
+
+import fnmatch
+import os
+import stat
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional
+
+from ..utils.hashing import DEFAULT_BUFFER_SIZE, HashingWriter
+
+# Métodos de compresión del formato ZIP
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Límites del formato sin extensiones ZIP64
+_MAX_ENTRIES = 0xFFFF
+_MAX_OFFSET = 0xFFFFFFFF
+
+# Fecha de todas las entradas si SOURCE_DATE_EPOCH no está definido: la
+# mínima del formato MS-DOS, la misma que usan pip y wheel
+DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Versión 2.0 (deflate) y sistema de origen Unix, como zipfile
+_VERSION = 20
+_UNIX_SYSTEM = 3
+_UTF8_FLAG = 0x800
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+
+
+@dataclass
+class _CompressedEntry:
+    """Entrada ya comprimida, lista para escribirse en el archivo."""
+
+    arcname: str
+    data: bytes
+    crc: int
+    size: int
+    method: int
+    dos_time: int
+    dos_date: int
+    external_attr: int
+
+
+def write_zip(
+    entries: Iterable[tuple[str, Path]],
+    output_path: Path,
+    max_workers: Optional[int] = None,
+    store_patterns: Iterable[str] = (),
+    compresslevel: int = zlib.Z_DEFAULT_COMPRESSION,
+) -> str:
+    """Escribe un ZIP reproducible comprimiendo los archivos en un pool de hilos.
+
+    zlib libera el GIL mientras comprime, así que los hilos escalan con los
+    cores. Las entradas se escriben en el orden recibido con una ventana
+    acotada de archivos en vuelo, y fecha y permisos se normalizan (fecha
+    fija o SOURCE_DATE_EPOCH; 0644, o 0755 si el archivo es ejecutable): las
+    mismas entradas con el mismo contenido producen un ZIP idéntico byte a
+    byte, sin depender de mtimes, umask ni del número de hilos.
+
+    Args:
+        entries: Pares (nombre dentro del ZIP, archivo de origen)
+        output_path: Ruta del ZIP a crear
+        max_workers: Hilos de compresión (por defecto, uno por CPU)
+        store_patterns: Patrones de nombre que se guardan sin comprimir
+        compresslevel: Nivel de compresión de zlib
+
+    Returns:
+        SHA256 del ZIP, calculado mientras se escribe
+
+    Raises:
+        ValueError: Si el archivo requiere extensiones ZIP64
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    store_patterns = tuple(store_patterns)
+    window = max_workers * 4
+    dos_time, dos_date = _dos_datetime(_normalized_date_time())
+
+    central_directory = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, Path(output_path).open(
+        "wb", buffering=DEFAULT_BUFFER_SIZE
+    ) as output:
+        archive = HashingWriter(output)
+        in_flight: deque[Future] = deque()
+        for arcname, source in entries:
+            store = any(fnmatch.fnmatch(Path(arcname).name, p) for p in store_patterns)
+            in_flight.append(
+                executor.submit(
+                    _compress_entry, arcname, Path(source), store, compresslevel, dos_time, dos_date
+                )
+            )
+            if len(in_flight) >= window:
+                central_directory.append(_write_entry(archive, in_flight.popleft().result()))
+        while in_flight:
+            central_directory.append(_write_entry(archive, in_flight.popleft().result()))
+
+        _write_central_directory(archive, central_directory)
+
+    return archive.hexdigest()
+
+
+def _compress_entry(
+    arcname: str,
+    source: Path,
+    store: bool,
+    compresslevel: int,
+    dos_time: int,
+    dos_date: int,
+) -> _CompressedEntry:
+    """Lee y comprime un archivo (se ejecuta en un hilo del pool)."""
+    executable = source.stat().st_mode & 0o111
+    raw = source.read_bytes()
+
+    data, method = raw, ZIP_STORED
+    if not store and raw:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(raw) + compressor.flush()
+        # Datos ya comprimidos (ej: modelos joblib comprimidos) no ganan nada
+        if len(deflated) < len(raw):
+            data, method = deflated, ZIP_DEFLATED
+
+    return _CompressedEntry(
+        arcname=arcname,
+        data=data,
+        crc=zlib.crc32(raw),
+        size=len(raw),
+        method=method,
+        dos_time=dos_time,
+        dos_date=dos_date,
+        external_attr=(stat.S_IFREG | (0o755 if executable else 0o644)) << 16,
+    )
+
+
+def _normalized_date_time() -> tuple[int, int, int, int, int, int]:
+    """Fecha de las entradas: SOURCE_DATE_EPOCH (UTC) o DEFAULT_DATE_TIME."""
+    source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if source_date_epoch is None:
+        return DEFAULT_DATE_TIME
+    date_time = tuple(time.gmtime(int(source_date_epoch))[:6])
+    return max(date_time, DEFAULT_DATE_TIME)
+
+
+def _dos_datetime(date_time: tuple[int, int, int, int, int, int]) -> tuple[int, int]:
+    """Convierte fecha y hora al formato MS-DOS de las cabeceras ZIP."""
+    year, month, day, hour, minute, second = date_time
+    dos_time = (hour << 11) | (minute << 5) | (second // 2)
+    dos_date = ((year - 1980) << 9) | (month << 5) | day
+    return dos_time, dos_date
+
+
+def _encode_name(arcname: str) -> tuple[bytes, int]:
+    """Codifica el nombre de la entrada y retorna el flag correspondiente."""
+    try:
+        return arcname.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return arcname.encode("utf-8"), _UTF8_FLAG
+
+
+def _write_entry(archive: BinaryIO, entry: _CompressedEntry) -> tuple[_CompressedEntry, int]:
+    """Escribe cabecera local y datos; retorna la entrada y su offset."""
+    offset = archive.tell()
+    if offset + len(entry.data) > _MAX_OFFSET:
+        raise ValueError("El paquete supera 4 GiB y requeriría ZIP64")
+
+    name, flags = _encode_name(entry.arcname)
+    archive.write(
+        _LOCAL_HEADER.pack(
+            b"PK\x03\x04",
+            _VERSION,
+            0,
+            flags,
+            entry.method,
+            entry.dos_time,
+            entry.dos_date,
+            entry.crc,
+            len(entry.data),
+            entry.size,
+            len(name),
+            0,
+        )
+    )
+    archive.write(name)
+    archive.write(entry.data)
+    return entry, offset
+
+
+def _write_central_directory(
+    archive: BinaryIO, central_directory: list[tuple[_CompressedEntry, int]]
+) -> None:
+    """Escribe el directorio central y el registro de fin de archivo."""
+    if len(central_directory) > _MAX_ENTRIES:
+        raise ValueError(
+            f"El paquete tiene {len(central_directory)} archivos y requeriría ZIP64"
+        )
+
+    start = archive.tell()
+    for entry, offset in central_directory:
+        name, flags = _encode_name(entry.arcname)
+        archive.write(
+            _CENTRAL_HEADER.pack(
+                b"PK\x01\x02",
+                _VERSION,
+                _UNIX_SYSTEM,
+                _VERSION,
+                0,
+                flags,
+                entry.method,
+                entry.dos_time,
+                entry.dos_date,
+                entry.crc,
+                len(entry.data),
+                entry.size,
+                len(name),
+                0,
+                0,
+                0,
+                0,
+                entry.external_attr,
+                offset,
+            )
+        )
+        archive.write(name)
+    end = archive.tell()
+
+    archive.write(
+        _END_RECORD.pack(
+            b"PK\x05\x06",
+            0,
+            0,
+            len(central_directory),
+            len(central_directory),
+            end - start,
+            start,
+            0,
+        )
+    )
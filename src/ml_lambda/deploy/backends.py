@@ -0,0 +1,602 @@
+"""Backends de despliegue: AWS real (boto3) y un sustituto local."""
+
+import base64
+import hashlib
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from ..utils.exceptions import AWSCredentialsError, DeploymentError
+from .canary import VersionMetrics
+
+# Metadato de S3 con el SHA256 del objeto subido
+SHA256_METADATA_KEY = "sha256"
+
+# Códigos de error de AWS que indican credenciales inválidas o expiradas
+_CREDENTIAL_ERROR_CODES = frozenset(
+    {"InvalidClientTokenId", "ExpiredToken", "ExpiredTokenException", "SignatureDoesNotMatch"}
+)
+
+
+class DeploymentBackend(ABC):
+    """Operaciones de AWS que necesita AWSDeployer.
+
+    Cada método es una llamada independiente, segura para usarse desde
+    varios hilos a la vez (subida de partes en paralelo, Lambda y API
+    Gateway actualizados al mismo tiempo). Los errores se reportan como
+    DeploymentError, o AWSCredentialsError si faltan credenciales.
+    """
+
+    @abstractmethod
+    def get_account_id(self) -> str:
+        """ID de la cuenta de las credenciales actuales."""
+
+    @abstractmethod
+    def object_sha256(self, bucket: str, key: str) -> Optional[str]:
+        """SHA256 registrado de un objeto, o None si no existe."""
+
+    @abstractmethod
+    def put_object(self, bucket: str, key: str, data: bytes, sha256_hash: str) -> None:
+        """Sube un objeto en una sola petición."""
+
+    @abstractmethod
+    def create_multipart_upload(self, bucket: str, key: str, sha256_hash: str) -> str:
+        """Inicia una subida multipart y retorna su ID."""
+
+    @abstractmethod
+    def upload_part(
+        self, bucket: str, key: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        """Sube una parte y retorna su ETag."""
+
+    @abstractmethod
+    def complete_multipart_upload(
+        self, bucket: str, key: str, upload_id: str, parts: list[tuple[int, str]]
+    ) -> None:
+        """Completa la subida con los pares (número de parte, ETag)."""
+
+    @abstractmethod
+    def abort_multipart_upload(self, bucket: str, key: str, upload_id: str) -> None:
+        """Cancela una subida multipart y descarta sus partes."""
+
+    @abstractmethod
+    def get_function(
+        self, function_name: str, qualifier: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        """Configuración (FunctionArn, CodeSha256, Version) de $LATEST o del
+        qualifier (número de versión, "$LATEST" o alias), o None si no existe."""
+
+    @abstractmethod
+    def update_function_code(self, function_name: str, bucket: str, key: str) -> dict[str, Any]:
+        """Actualiza el código desde S3, publica una versión y espera a que
+        la actualización termine. Retorna FunctionArn y Version."""
+
+    @abstractmethod
+    def set_alias(
+        self,
+        function_name: str,
+        alias: str,
+        version: str,
+        routing: Optional[dict[str, float]] = None,
+    ) -> None:
+        """Apunta el alias a la versión, creándolo si no existe.
+
+        routing asigna a otras versiones una fracción (0-1) del tráfico del
+        alias; sin routing todo el tráfico va a version.
+        """
+
+    @abstractmethod
+    def get_alias_version(self, function_name: str, alias: str) -> Optional[str]:
+        """Versión principal del alias, o None si no existe."""
+
+    @abstractmethod
+    def get_version_metrics(
+        self, function_name: str, alias: str, version: str, start: datetime, end: datetime
+    ) -> VersionMetrics:
+        """Invocaciones, errores y p99 de una versión servida por el alias."""
+
+    @abstractmethod
+    def find_api(self, api_name: str) -> Optional[dict[str, Any]]:
+        """API HTTP con ese nombre (ApiId, ApiEndpoint) o None."""
+
+    @abstractmethod
+    def create_api(self, api_name: str, target_arn: str) -> dict[str, Any]:
+        """Crea una API HTTP cuya ruta por defecto invoca target_arn."""
+
+    @abstractmethod
+    def set_api_target(self, api_id: str, target_arn: str) -> None:
+        """Apunta las integraciones Lambda de la API a target_arn."""
+
+    @abstractmethod
+    def allow_api_invoke(self, function_arn: str, api_id: str) -> None:
+        """Permite a la API invocar el ARN, que puede incluir un alias
+        (idempotente)."""
+
+
+class Boto3Backend(DeploymentBackend):
+    """Backend sobre boto3; los clientes se crean en el primer uso."""
+
+    def __init__(self, region: str):
+        self.region = region
+        self._clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _client(self, service: str) -> Any:
+        # Los clientes de boto3 son thread-safe, pero su creación no
+        with self._lock:
+            if service not in self._clients:
+                import boto3
+
+                self._clients[service] = boto3.client(service, region_name=self.region)
+            return self._clients[service]
+
+    def _call(
+        self, service: str, operation: str, missing_ok: bool = False, **kwargs: Any
+    ) -> Optional[dict[str, Any]]:
+        """Ejecuta una operación traduciendo los errores de botocore.
+
+        Con missing_ok, un recurso inexistente (HTTP 404) retorna None.
+        """
+        from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+        try:
+            return getattr(self._client(service), operation)(**kwargs)
+        except NoCredentialsError as error:
+            raise AWSCredentialsError(str(error)) from error
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code", "")
+            status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            if missing_ok and status == 404:
+                return None
+            if code in _CREDENTIAL_ERROR_CODES:
+                raise AWSCredentialsError(str(error)) from error
+            if code == "ResourceConflictException" and operation == "add_permission":
+                return {}
+            raise DeploymentError(f"{service}.{operation} failed: {error}") from error
+        except BotoCoreError as error:
+            raise DeploymentError(f"{service}.{operation} failed: {error}") from error
+
+    def get_account_id(self) -> str:
+        return self._call("sts", "get_caller_identity")["Account"]
+
+    def object_sha256(self, bucket: str, key: str) -> Optional[str]:
+        response = self._call("s3", "head_object", missing_ok=True, Bucket=bucket, Key=key)
+        if response is None:
+            return None
+        return response.get("Metadata", {}).get(SHA256_METADATA_KEY)
+
+    def put_object(self, bucket: str, key: str, data: bytes, sha256_hash: str) -> None:
+        self._call(
+            "s3",
+            "put_object",
+            Bucket=bucket,
+            Key=key,
+            Body=data,
+            Metadata={SHA256_METADATA_KEY: sha256_hash},
+        )
+
+    def create_multipart_upload(self, bucket: str, key: str, sha256_hash: str) -> str:
+        response = self._call(
+            "s3",
+            "create_multipart_upload",
+            Bucket=bucket,
+            Key=key,
+            Metadata={SHA256_METADATA_KEY: sha256_hash},
+        )
+        return response["UploadId"]
+
+    def upload_part(
+        self, bucket: str, key: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        response = self._call(
+            "s3",
+            "upload_part",
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return response["ETag"]
+
+    def complete_multipart_upload(
+        self, bucket: str, key: str, upload_id: str, parts: list[tuple[int, str]]
+    ) -> None:
+        self._call(
+            "s3",
+            "complete_multipart_upload",
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [{"PartNumber": number, "ETag": etag} for number, etag in parts]
+            },
+        )
+
+    def abort_multipart_upload(self, bucket: str, key: str, upload_id: str) -> None:
+        self._call("s3", "abort_multipart_upload", Bucket=bucket, Key=key, UploadId=upload_id)
+
+    def get_function(
+        self, function_name: str, qualifier: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        qualified = {"Qualifier": qualifier} if qualifier is not None else {}
+        return self._call(
+            "lambda",
+            "get_function_configuration",
+            missing_ok=True,
+            FunctionName=function_name,
+            **qualified,
+        )
+
+    def update_function_code(self, function_name: str, bucket: str, key: str) -> dict[str, Any]:
+        response = self._call(
+            "lambda",
+            "update_function_code",
+            FunctionName=function_name,
+            S3Bucket=bucket,
+            S3Key=key,
+            Publish=True,
+        )
+        from botocore.exceptions import WaiterError
+
+        try:
+            waiter = self._client("lambda").get_waiter("function_updated_v2")
+            waiter.wait(FunctionName=function_name)
+        except WaiterError as error:
+            raise DeploymentError(f"Function update did not finish: {error}") from error
+        return response
+
+    def set_alias(
+        self,
+        function_name: str,
+        alias: str,
+        version: str,
+        routing: Optional[dict[str, float]] = None,
+    ) -> None:
+        existing = self._call(
+            "lambda", "get_alias", missing_ok=True, FunctionName=function_name, Name=alias
+        )
+        # Un RoutingConfig vacío elimina el tráfico adicional de un canary previo
+        self._call(
+            "lambda",
+            "create_alias" if existing is None else "update_alias",
+            FunctionName=function_name,
+            Name=alias,
+            FunctionVersion=version,
+            RoutingConfig={"AdditionalVersionWeights": routing or {}},
+        )
+
+    def get_alias_version(self, function_name: str, alias: str) -> Optional[str]:
+        response = self._call(
+            "lambda", "get_alias", missing_ok=True, FunctionName=function_name, Name=alias
+        )
+        return response["FunctionVersion"] if response is not None else None
+
+    def get_version_metrics(
+        self, function_name: str, alias: str, version: str, start: datetime, end: datetime
+    ) -> VersionMetrics:
+        # Con routing, Lambda publica las métricas del alias por ExecutedVersion
+        dimensions = [
+            {"Name": "FunctionName", "Value": function_name},
+            {"Name": "Resource", "Value": f"{function_name}:{alias}"},
+            {"Name": "ExecutedVersion", "Value": version},
+        ]
+        period = max(60, int((end - start).total_seconds()) // 60 * 60)
+
+        def datapoints(metric: str, **statistics: Any) -> list[dict[str, Any]]:
+            response = self._call(
+                "cloudwatch",
+                "get_metric_statistics",
+                Namespace="AWS/Lambda",
+                MetricName=metric,
+                Dimensions=dimensions,
+                StartTime=start,
+                EndTime=end,
+                Period=period,
+                **statistics,
+            )
+            return response["Datapoints"]
+
+        invocations = sum(p["Sum"] for p in datapoints("Invocations", Statistics=["Sum"]))
+        errors = sum(p["Sum"] for p in datapoints("Errors", Statistics=["Sum"]))
+        p99_points = [
+            p["ExtendedStatistics"]["p99"]
+            for p in datapoints("Duration", ExtendedStatistics=["p99"])
+        ]
+        # Con varios periodos se toma el peor p99
+        return VersionMetrics(
+            invocations=int(invocations),
+            errors=int(errors),
+            p99_ms=max(p99_points) if p99_points else None,
+        )
+
+    def find_api(self, api_name: str) -> Optional[dict[str, Any]]:
+        paginator = self._client("apigatewayv2").get_paginator("get_apis")
+        for page in paginator.paginate():
+            for api in page.get("Items", []):
+                if api["Name"] == api_name:
+                    return api
+        return None
+
+    def create_api(self, api_name: str, target_arn: str) -> dict[str, Any]:
+        # Quick create: integración AWS_PROXY, ruta $default y stage $default
+        return self._call(
+            "apigatewayv2",
+            "create_api",
+            Name=api_name,
+            ProtocolType="HTTP",
+            Target=target_arn,
+        )
+
+    def set_api_target(self, api_id: str, target_arn: str) -> None:
+        integrations = self._call("apigatewayv2", "get_integrations", ApiId=api_id)
+        for integration in integrations.get("Items", []):
+            if integration["IntegrationType"] != "AWS_PROXY":
+                continue
+            if integration.get("IntegrationUri") == target_arn:
+                continue
+            self._call(
+                "apigatewayv2",
+                "update_integration",
+                ApiId=api_id,
+                IntegrationId=integration["IntegrationId"],
+                IntegrationUri=target_arn,
+            )
+
+    def allow_api_invoke(self, function_arn: str, api_id: str) -> None:
+        # Un StatementId repetido (ResourceConflictException) significa que
+        # el permiso ya existe. Con el ARN de un alias, el permiso queda en
+        # la política del alias, que es la que Lambda comprueba al invocarlo
+        account_id = self.get_account_id()
+        self._call(
+            "lambda",
+            "add_permission",
+            FunctionName=function_arn,
+            StatementId=f"apigateway-{api_id}",
+            Action="lambda:InvokeFunction",
+            Principal="apigateway.amazonaws.com",
+            SourceArn=f"arn:aws:execute-api:{self.region}:{account_id}:{api_id}/*/*",
+        )
+
+
+class LocalBackend(DeploymentBackend):
+    """Sustituto de AWS en memoria para tests y ensayos sin cuenta.
+
+    Con root, los objetos se guardan como archivos en root/<bucket>/<key>
+    (su SHA256 se calcula del contenido); sin root, en memoria. Las
+    funciones deben registrarse con add_function, como las crea Terraform.
+    invoke resuelve qué versión ejecuta una invocación, como Lambda al
+    recibir una de API Gateway; seed fija el reparto del routing de alias.
+    """
+
+    ACCOUNT_ID = "000000000000"
+    REGION = "local"
+
+    def __init__(self, root: Optional[Path] = None, seed: Optional[int] = None):
+        self.root = Path(root) if root is not None else None
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.functions: dict[str, dict[str, Any]] = {}
+        self.aliases: dict[tuple[str, str], str] = {}
+        self.alias_routing: dict[tuple[str, str], dict[str, float]] = {}
+        self.invocations: list[tuple[str, str, float, float, bool]] = []
+        self.apis: dict[str, dict[str, Any]] = {}
+        self.permissions: set[tuple[str, str]] = set()
+        self._uploads: dict[str, tuple[str, str, str, dict[int, bytes]]] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def add_function(self, function_name: str) -> str:
+        """Registra una función sin código y retorna su ARN."""
+        arn = f"arn:aws:lambda:{self.REGION}:{self.ACCOUNT_ID}:function:{function_name}"
+        self.functions[function_name] = {
+            "FunctionName": function_name,
+            "FunctionArn": arn,
+            "CodeSha256": "",
+            "Version": "$LATEST",
+            "versions": [],
+        }
+        return arn
+
+    def _object_path(self, bucket: str, key: str) -> Path:
+        return self.root / bucket / key
+
+    def _read_object(self, bucket: str, key: str) -> Optional[bytes]:
+        if self.root is not None:
+            path = self._object_path(bucket, key)
+            return path.read_bytes() if path.is_file() else None
+        return self.objects.get((bucket, key))
+
+    def _store_object(self, bucket: str, key: str, data: bytes) -> None:
+        if self.root is not None:
+            path = self._object_path(bucket, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        else:
+            with self._lock:
+                self.objects[(bucket, key)] = data
+
+    def get_account_id(self) -> str:
+        return self.ACCOUNT_ID
+
+    def object_sha256(self, bucket: str, key: str) -> Optional[str]:
+        data = self._read_object(bucket, key)
+        return hashlib.sha256(data).hexdigest() if data is not None else None
+
+    def put_object(self, bucket: str, key: str, data: bytes, sha256_hash: str) -> None:
+        self._store_object(bucket, key, data)
+
+    def create_multipart_upload(self, bucket: str, key: str, sha256_hash: str) -> str:
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._uploads[upload_id] = (bucket, key, sha256_hash, {})
+        return upload_id
+
+    def upload_part(
+        self, bucket: str, key: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        with self._lock:
+            self._uploads[upload_id][3][part_number] = bytes(data)
+        return hashlib.md5(data).hexdigest()
+
+    def complete_multipart_upload(
+        self, bucket: str, key: str, upload_id: str, parts: list[tuple[int, str]]
+    ) -> None:
+        with self._lock:
+            _, _, _, uploaded = self._uploads.pop(upload_id)
+        for number, etag in parts:
+            if hashlib.md5(uploaded[number]).hexdigest() != etag:
+                raise DeploymentError(f"ETag mismatch for part {number}")
+        self._store_object(bucket, key, b"".join(uploaded[number] for number, _ in parts))
+
+    def abort_multipart_upload(self, bucket: str, key: str, upload_id: str) -> None:
+        with self._lock:
+            self._uploads.pop(upload_id, None)
+
+    @property
+    def pending_uploads(self) -> int:
+        """Subidas multipart iniciadas y no completadas ni canceladas."""
+        return len(self._uploads)
+
+    def get_function(
+        self, function_name: str, qualifier: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        function = self.functions.get(function_name)
+        if function is None:
+            return None
+        configuration = {key: value for key, value in function.items() if key != "versions"}
+        if qualifier is None:
+            return configuration
+        if qualifier == "$LATEST":
+            configuration["FunctionArn"] = f"{function['FunctionArn']}:$LATEST"
+            return configuration
+        version = self.aliases.get((function_name, qualifier), qualifier)
+        if not self._is_published(function, version):
+            return None
+        configuration.update(
+            FunctionArn=f"{function['FunctionArn']}:{qualifier}",
+            CodeSha256=function["versions"][int(version) - 1],
+            Version=version,
+        )
+        return configuration
+
+    @staticmethod
+    def _is_published(function: Optional[dict[str, Any]], version: str) -> bool:
+        if function is None or not version.isdigit():
+            return False
+        return 1 <= int(version) <= len(function["versions"])
+
+    def update_function_code(self, function_name: str, bucket: str, key: str) -> dict[str, Any]:
+        function = self.functions.get(function_name)
+        if function is None:
+            raise DeploymentError(f"Function not found: {function_name}")
+        data = self._read_object(bucket, key)
+        if data is None:
+            raise DeploymentError(f"Object not found: s3://{bucket}/{key}")
+
+        with self._lock:
+            function["CodeSha256"] = base64.b64encode(hashlib.sha256(data).digest()).decode()
+            function["versions"].append(function["CodeSha256"])
+            version = str(len(function["versions"]))
+        return {"FunctionArn": f"{function['FunctionArn']}:{version}", "Version": version}
+
+    def set_alias(
+        self,
+        function_name: str,
+        alias: str,
+        version: str,
+        routing: Optional[dict[str, float]] = None,
+    ) -> None:
+        function = self.functions.get(function_name)
+        for alias_version in [version, *(routing or {})]:
+            if not self._is_published(function, alias_version):
+                raise DeploymentError(f"Version not found: {function_name}:{alias_version}")
+        with self._lock:
+            self.aliases[(function_name, alias)] = version
+            self.alias_routing[(function_name, alias)] = dict(routing or {})
+
+    def get_alias_version(self, function_name: str, alias: str) -> Optional[str]:
+        return self.aliases.get((function_name, alias))
+
+    def invoke(self, target_arn: str) -> str:
+        """Versión que ejecuta una invocación de target_arn.
+
+        Sin qualifier o con $LATEST se ejecuta $LATEST; con un alias, su
+        versión o, según los pesos de su routing, una de las adicionales.
+        """
+        function_name, _, qualifier = target_arn.split(":function:", 1)[-1].partition(":")
+        if function_name not in self.functions:
+            raise DeploymentError(f"Function not found: {function_name}")
+        if qualifier in ("", "$LATEST") or qualifier.isdigit():
+            return qualifier or "$LATEST"
+        if (function_name, qualifier) not in self.aliases:
+            raise DeploymentError(f"Alias not found: {function_name}:{qualifier}")
+        with self._lock:
+            version = self.aliases[(function_name, qualifier)]
+            routing = self.alias_routing.get((function_name, qualifier), {})
+            draw = self._random.random()
+        for additional_version, weight in routing.items():
+            if draw < weight:
+                return additional_version
+            draw -= weight
+        return version
+
+    def record_invocation(
+        self,
+        function_name: str,
+        version: str,
+        duration_ms: float,
+        error: bool = False,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Registra una invocación de una versión (simula CloudWatch)."""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self.invocations.append((function_name, version, timestamp, duration_ms, error))
+
+    def get_version_metrics(
+        self, function_name: str, alias: str, version: str, start: datetime, end: datetime
+    ) -> VersionMetrics:
+        with self._lock:
+            durations, errors = [], 0
+            for name, invoked_version, timestamp, duration_ms, error in self.invocations:
+                if name == function_name and invoked_version == version:
+                    if start.timestamp() <= timestamp <= end.timestamp():
+                        durations.append(duration_ms)
+                        errors += error
+        return VersionMetrics(
+            invocations=len(durations),
+            errors=errors,
+            p99_ms=float(np.percentile(durations, 99)) if durations else None,
+        )
+
+    def find_api(self, api_name: str) -> Optional[dict[str, Any]]:
+        return self.apis.get(api_name)
+
+    def create_api(self, api_name: str, target_arn: str) -> dict[str, Any]:
+        api_id = uuid.uuid4().hex[:10]
+        api = {
+            "ApiId": api_id,
+            "Name": api_name,
+            "ApiEndpoint": f"https://{api_id}.execute-api.{self.REGION}.amazonaws.com",
+            "Target": target_arn,
+        }
+        with self._lock:
+            self.apis[api_name] = api
+        return api
+
+    def set_api_target(self, api_id: str, target_arn: str) -> None:
+        with self._lock:
+            for api in self.apis.values():
+                if api["ApiId"] == api_id:
+                    api["Target"] = target_arn
+
+    def allow_api_invoke(self, function_arn: str, api_id: str) -> None:
+        with self._lock:
+            self.permissions.add((function_arn, api_id))
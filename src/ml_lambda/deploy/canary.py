@@ -0,0 +1,89 @@
+"""Decisión de promoción o rollback de un despliegue canary."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class CanaryConfig:
+    """Configuración de un despliegue canary.
+
+    Attributes:
+        traffic_percent: Porcentaje del tráfico del alias enviado a la versión nueva
+        bake_seconds: Tiempo de observación antes de decidir (CloudWatch
+            publica las métricas de Lambda con uno o dos minutos de retraso)
+        max_p99_increase: Aumento relativo máximo del p99 respecto a la versión
+            estable (0.2 = hasta un 20% más lento)
+        max_error_rate_increase: Aumento absoluto máximo de la tasa de errores
+        min_invocations: Invocaciones mínimas de la versión nueva para decidir
+    """
+
+    traffic_percent: float = 10.0
+    bake_seconds: int = 600
+    max_p99_increase: float = 0.2
+    max_error_rate_increase: float = 0.01
+    min_invocations: int = 50
+
+    def __post_init__(self):
+        if not 0 < self.traffic_percent < 100:
+            raise ValueError("traffic_percent must be between 0 and 100 (exclusive)")
+
+
+@dataclass
+class VersionMetrics:
+    """Métricas de una versión durante la observación."""
+
+    invocations: int
+    errors: int
+    p99_ms: Optional[float]
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.invocations if self.invocations else 0.0
+
+
+@dataclass
+class CanaryDecision:
+    """Resultado de la evaluación del canary."""
+
+    promote: bool
+    reason: str
+    stable_version: str
+    candidate_version: str
+    stable: VersionMetrics
+    candidate: VersionMetrics
+
+
+def evaluate_canary(
+    stable: VersionMetrics, candidate: VersionMetrics, canary_config: CanaryConfig
+) -> tuple[bool, str]:
+    """Compara la versión nueva con la estable.
+
+    Sin tráfico suficiente en la versión nueva no hay evidencia para
+    promoverla, así que la decisión es rollback.
+
+    Returns:
+        (promover, motivo)
+    """
+    if candidate.invocations < canary_config.min_invocations:
+        return False, (
+            f"insufficient canary traffic: {candidate.invocations} invocations "
+            f"(minimum {canary_config.min_invocations})"
+        )
+
+    error_rate_limit = stable.error_rate + canary_config.max_error_rate_increase
+    if candidate.error_rate > error_rate_limit:
+        return False, (
+            f"error rate {candidate.error_rate:.2%} exceeds {error_rate_limit:.2%} "
+            f"(stable {stable.error_rate:.2%})"
+        )
+
+    if stable.p99_ms is not None and candidate.p99_ms is not None:
+        p99_limit = stable.p99_ms * (1 + canary_config.max_p99_increase)
+        if candidate.p99_ms > p99_limit:
+            return False, (
+                f"p99 {candidate.p99_ms:.1f} ms exceeds {p99_limit:.1f} ms "
+                f"(stable {stable.p99_ms:.1f} ms)"
+            )
+
+    return True, "canary within latency and error thresholds"
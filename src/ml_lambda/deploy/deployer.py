@@ -1,8 +1,25 @@
 """Despliegue a AWS Lambda y API Gateway."""
 
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Optional
+
+from ..config import config
+from ..utils.exceptions import AWSCredentialsError, DeploymentError
+from ..utils.hashing import compute_file_hash
+from .backends import Boto3Backend, DeploymentBackend
+from .canary import CanaryConfig, CanaryDecision, evaluate_canary
+from .packager import PackageInfo
+
+# Tamaño de cada parte de las subidas multipart (S3 exige al menos 5 MiB)
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+# Alias que apunta a la versión en producción (ver rollback)
+LIVE_ALIAS = "live"
 
 
 @dataclass
@@ -13,37 +30,289 @@ class DeploymentResult:
     api_endpoint: str
     version: str
     deployed_at: datetime
+    canary: Optional[CanaryDecision] = None
 
 
 class AWSDeployer:
-    """Despliega a AWS Lambda y API Gateway."""
+    """Despliega a AWS Lambda y API Gateway.
 
-    def __init__(self, environment: str = "dev"):
+    Las operaciones de AWS pasan por un DeploymentBackend: Boto3Backend por
+    defecto, o LocalBackend para tests y ensayos sin cuenta. Los paquetes se
+    suben a S3 con clave derivada de su SHA256, así que un paquete ya subido
+    no se vuelve a subir, y uno que la función ya ejecuta no se redespliega.
+    """
+
+    def __init__(
+        self,
+        environment: str = "dev",
+        backend: Optional[DeploymentBackend] = None,
+        bucket: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
         self.environment = environment
-        self._lambda_client = None
-        self._apigateway_client = None
+        self.backend = backend or Boto3Backend(config.aws_region)
+        self.bucket = bucket or config.deployment_bucket
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) * 2)
+        self.part_size = part_size
+        self._sleep = sleep
+
+    def is_current(self, package_info: PackageInfo, function_name: str) -> bool:
+        """Indica si la función ya ejecuta exactamente este paquete.
+
+        Como los paquetes son reproducibles, un CodeSha256 igual al del
+        paquete recién construido significa que el código no cambió y la
+        subida puede omitirse.
+
+        Args:
+            package_info: Paquete construido por PackageBuilder
+            function_name: Nombre de la función Lambda
+
+        Returns:
+            True si el código desplegado tiene el mismo hash
+        """
+        function = self.backend.get_function(function_name)
+        return function is not None and function.get("CodeSha256") == package_info.code_sha256
 
     def validate_credentials(self) -> bool:
-        """Valida credenciales AWS."""
-        # TODO: Implementar en tarea 19.1
-        raise NotImplementedError
+        """Valida credenciales AWS.
+
+        Raises:
+            AWSCredentialsError: Si no hay credenciales o no son válidas
+        """
+        try:
+            self.backend.get_account_id()
+        except DeploymentError as error:
+            raise AWSCredentialsError(f"Could not validate AWS credentials: {error}") from error
+        return True
+
+    def upload_package(self, package_path: Path, sha256_hash: Optional[str] = None) -> str:
+        """Sube el paquete a S3 si no está ya subido. Retorna la clave.
+
+        Los paquetes mayores que part_size se suben con multipart, con las
+        partes en paralelo; si alguna falla, la subida se cancela.
+
+        Args:
+            package_path: ZIP de despliegue
+            sha256_hash: SHA256 ya calculado (ej: PackageInfo.sha256_hash)
+        """
+        package_path = Path(package_path)
+        sha256_hash = sha256_hash or compute_file_hash(package_path)
+        key = f"{self.environment}/lambda-deployment-{sha256_hash}.zip"
+        if self.backend.object_sha256(self.bucket, key) == sha256_hash:
+            return key
+
+        size = package_path.stat().st_size
+        if size <= self.part_size:
+            self.backend.put_object(self.bucket, key, package_path.read_bytes(), sha256_hash)
+            return key
+
+        upload_id = self.backend.create_multipart_upload(self.bucket, key, sha256_hash)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._upload_part, package_path, key, upload_id, part_number, offset
+                    )
+                    for part_number, offset in enumerate(range(0, size, self.part_size), 1)
+                ]
+                parts = [future.result() for future in futures]
+            self.backend.complete_multipart_upload(self.bucket, key, upload_id, parts)
+        except BaseException:
+            self.backend.abort_multipart_upload(self.bucket, key, upload_id)
+            raise
+        return key
+
+    def _upload_part(
+        self, package_path: Path, key: str, upload_id: str, part_number: int, offset: int
+    ) -> tuple[int, str]:
+        """Lee y sube una parte (se ejecuta en un hilo del pool)."""
+        with package_path.open("rb") as package:
+            package.seek(offset)
+            data = package.read(self.part_size)
+        etag = self.backend.upload_part(self.bucket, key, upload_id, part_number, data)
+        return part_number, etag
 
     def deploy_lambda(self, package_path: Path, function_name: str) -> str:
         """Despliega o actualiza función Lambda. Retorna ARN."""
-        # TODO: Implementar en tarea 19.2
-        raise NotImplementedError
+        function_arn, version = self._publish(Path(package_path), function_name)
+        self.backend.set_alias(function_name, LIVE_ALIAS, version)
+        return function_arn
+
+    def _deploy_code(
+        self, package_path: Path, function_name: str, canary: Optional[CanaryConfig] = None
+    ) -> tuple[str, str, Optional[CanaryDecision]]:
+        """Publica el paquete y mueve el alias, directamente o tras un canary.
+
+        Returns:
+            (ARN de la versión servida por el alias, versión, decisión del canary)
+        """
+        function_arn, version = self._publish(package_path, function_name)
+        stable_version = self.backend.get_alias_version(function_name, LIVE_ALIAS)
+        if canary is None or stable_version in (None, version):
+            self.backend.set_alias(function_name, LIVE_ALIAS, version)
+            return function_arn, version, None
+
+        decision = self.run_canary(function_name, stable_version, version, canary)
+        if decision.promote:
+            return function_arn, version, decision
+        stable_arn = f"{function_arn.rsplit(':', 1)[0]}:{stable_version}"
+        return stable_arn, stable_version, decision
+
+    def run_canary(
+        self,
+        function_name: str,
+        stable_version: str,
+        candidate_version: str,
+        canary: CanaryConfig,
+    ) -> CanaryDecision:
+        """Envía parte del tráfico a la versión nueva y la promueve o la retira.
+
+        El alias live sigue apuntando a la versión estable, con
+        traffic_percent de su tráfico desviado a la nueva. Tras bake_seconds
+        se comparan las métricas de ambas versiones en ese intervalo; al
+        terminar, el alias queda sin routing apuntando a la versión elegida.
+        """
+        self.backend.set_alias(
+            function_name,
+            LIVE_ALIAS,
+            stable_version,
+            routing={candidate_version: canary.traffic_percent / 100},
+        )
+        try:
+            start = datetime.now(timezone.utc)
+            self._sleep(canary.bake_seconds)
+            end = datetime.now(timezone.utc)
+            stable, candidate = (
+                self.backend.get_version_metrics(function_name, LIVE_ALIAS, v, start, end)
+                for v in (stable_version, candidate_version)
+            )
+            promote, reason = evaluate_canary(stable, candidate, canary)
+        except BaseException:
+            self.backend.set_alias(function_name, LIVE_ALIAS, stable_version)
+            raise
+
+        self.backend.set_alias(
+            function_name, LIVE_ALIAS, candidate_version if promote else stable_version
+        )
+        return CanaryDecision(
+            promote=promote,
+            reason=reason,
+            stable_version=stable_version,
+            candidate_version=candidate_version,
+            stable=stable,
+            candidate=candidate,
+        )
+
+    def _publish(self, package_path: Path, function_name: str) -> tuple[str, str]:
+        """Sube el paquete y publica una versión.
+
+        La función debe existir (la crea Terraform con su rol e
+        infraestructura). Si la versión del alias live ya ejecuta este mismo
+        paquete no se publica una versión nueva.
+
+        Returns:
+            (ARN de la versión, versión)
+        """
+        function = self.backend.get_function(function_name)
+        if function is None:
+            raise DeploymentError(f"Lambda function not found: {function_name}")
+
+        size_bytes = package_path.stat().st_size
+        package_info = PackageInfo(
+            path=package_path,
+            size_bytes=size_bytes,
+            size_mb=size_bytes / (1024 * 1024),
+            sha256_hash=compute_file_hash(package_path),
+            included_files=[],
+        )
+        live_version = self.backend.get_alias_version(function_name, LIVE_ALIAS)
+        if live_version is not None:
+            live = self.backend.get_function(function_name, qualifier=live_version)
+            if live is not None and live["CodeSha256"] == package_info.code_sha256:
+                return live["FunctionArn"], live_version
+
+        key = self.upload_package(package_path, package_info.sha256_hash)
+        response = self.backend.update_function_code(function_name, self.bucket, key)
+        return response["FunctionArn"], response["Version"]
+
+    def setup_api_gateway(self, target_arn: str, api_name: str) -> str:
+        """Configura API Gateway para invocar target_arn. Retorna URL del endpoint.
+
+        Una API que ya existe se reapunta a target_arn (las creadas antes de
+        usar el alias live invocaban $LATEST).
+        """
+        api = self.backend.find_api(api_name)
+        if api is None:
+            api = self.backend.create_api(api_name, target_arn)
+        else:
+            self.backend.set_api_target(api["ApiId"], target_arn)
+        self.backend.allow_api_invoke(target_arn, api["ApiId"])
+        return api["ApiEndpoint"]
+
+    def deploy(
+        self,
+        package_path: Path,
+        function_name: str,
+        api_name: Optional[str] = None,
+        canary: Optional[CanaryConfig] = None,
+    ) -> DeploymentResult:
+        """Despliegue completo: Lambda + API Gateway.
+
+        La API invoca el alias live, así que sirve la versión a la que apunta
+        el alias (y su routing durante un canary) y rollback cambia lo que
+        responde. Como el ARN del alias no cambia, la API se configura en
+        paralelo con el código; solo en el primer despliegue, cuando el alias
+        aún no existe, se configura después.
+
+        Args:
+            package_path: ZIP de despliegue
+            function_name: Nombre de la función Lambda
+            api_name: Nombre de la API HTTP (por defecto, el de Terraform:
+                <función>-api-<entorno>)
+            canary: Si se indica y el alias live ya apunta a una versión, la
+                nueva pasa por run_canary antes de recibir todo el tráfico;
+                si se retira, result.version es la versión estable
+        """
+        self.validate_credentials()
+        function = self.backend.get_function(function_name)
+        if function is None:
+            raise DeploymentError(f"Lambda function not found: {function_name}")
+        api_name = api_name or self._default_api_name(function_name)
+
+        alias_arn = f"{function['FunctionArn']}:{LIVE_ALIAS}"
+
+        if self.backend.get_alias_version(function_name, LIVE_ALIAS) is None:
+            # El permiso de invocación de un alias exige que el alias exista
+            function_arn, version, decision = self._deploy_code(
+                Path(package_path), function_name, canary
+            )
+            api_endpoint = self.setup_api_gateway(alias_arn, api_name)
+        else:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                code = executor.submit(
+                    self._deploy_code, Path(package_path), function_name, canary
+                )
+                api = executor.submit(self.setup_api_gateway, alias_arn, api_name)
+                function_arn, version, decision = code.result()
+                api_endpoint = api.result()
 
-    def setup_api_gateway(self, function_arn: str, api_name: str) -> str:
-        """Configura API Gateway. Retorna URL del endpoint."""
-        # TODO: Implementar en tarea 19.3
-        raise NotImplementedError
+        return DeploymentResult(
+            function_arn=function_arn,
+            api_endpoint=api_endpoint,
+            version=version,
+            deployed_at=datetime.now(timezone.utc),
+            canary=decision,
+        )
 
-    def deploy(self, package_path: Path, function_name: str) -> DeploymentResult:
-        """Despliegue completo: Lambda + API Gateway."""
-        # TODO: Implementar en tarea 19.4
-        raise NotImplementedError
+    def _default_api_name(self, function_name: str) -> str:
+        suffix = f"-{self.environment}"
+        if function_name.endswith(suffix):
+            return f"{function_name[: -len(suffix)]}-api{suffix}"
+        return f"{function_name}-api"
 
     def rollback(self, function_name: str, version: str) -> None:
-        """Rollback a versión anterior."""
-        # TODO: Implementar en tarea 19.4
-        raise NotImplementedError
+        """Rollback a versión anterior (mueve el alias live, que es lo que
+        invoca la API)."""
+        self.backend.set_alias(function_name, LIVE_ALIAS, version)
@@ -1,18 +1,32 @@
 """Construcción de paquetes de despliegue para Lambda."""
 
+import base64
 import fnmatch
 import hashlib
+import importlib.util
 import json
+import os
+import platform
 import shutil
 import subprocess
 import sys
+import sysconfig
 import tempfile
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
-from ..config import config
+from ..config import ARTIFACTS_DIR_ENV, config
 from ..utils.exceptions import PackageTooLargeError
+from ..utils.hashing import compute_file_hash
+from ..utils.logging import StructuredLogger
+from .archive import write_zip
+from .report import build_report, write_report
+from .slimming import SlimmingConfig, slim_dependencies, trace_imports, unused_modules
+
+
+logger = StructuredLogger("packager")
 
 
 def get_production_requirements() -> str:
@@ -56,9 +70,72 @@ class PackageInfo:
     sha256_hash: str
     included_files: list[str]
 
+    @property
+    def code_sha256(self) -> str:
+        """SHA256 en base64, el formato de CodeSha256 en la API de Lambda."""
+        return base64.b64encode(bytes.fromhex(self.sha256_hash)).decode("ascii")
+
+
+# Ruta de las dependencias dentro de una capa (Lambda la monta en /opt/python)
+LAYER_PYTHON_PREFIX = "python/"
+
+# Directorio del modelo cuando se despliega como capa
+LAYER_ARTIFACTS_DIR = "/opt/artifacts"
+
+# Versión del formato de manifest.json
+MANIFEST_FORMAT_VERSION = 1
+
+
+@dataclass
+class LayeredPackage:
+    """Artefactos de un build por capas."""
+
+    dependencies: PackageInfo
+    code: PackageInfo
+    model: PackageInfo
+    manifest_path: Path
+    dependency_cache_key: str
+
+    def to_manifest(self) -> dict:
+        """Manifest que relaciona los artefactos de un despliegue."""
+        return {
+            "format_version": MANIFEST_FORMAT_VERSION,
+            "dependency_cache_key": self.dependency_cache_key,
+            "environment": {ARTIFACTS_DIR_ENV: LAYER_ARTIFACTS_DIR},
+            "artifacts": {
+                name: {
+                    "file": info.path.name,
+                    "sha256": info.sha256_hash,
+                    "code_sha256": info.code_sha256,
+                    "size_bytes": info.size_bytes,
+                }
+                for name, info in (
+                    ("dependencies", self.dependencies),
+                    ("code", self.code),
+                    ("model", self.model),
+                )
+            },
+        }
+
 
 class PackageBuilder:
-    """Construye paquete de despliegue para Lambda."""
+    """Construye paquete de despliegue para Lambda.
+
+    Con cache_dir, las dependencias instaladas se guardan en un directorio
+    por clave (hash de poetry.lock, plataforma e intérprete) y se reutilizan
+    entre builds: solo el código fuente y el modelo se copian de nuevo.
+
+    Tras instalar, las dependencias pasan por una etapa de reducción
+    (tests, stubs, metadatos de pip, símbolos de debug) configurable con
+    slimming; la poda opcional de módulos no importados se decide en cada
+    build trazando el path de inferencia.
+
+    Con compile_bytecode, dependencias y código se compilan con el mismo
+    intérprete que instala las dependencias a .pyc deterministas
+    (unchecked-hash), que Lambda usa sin recompilar en cada cold start. Un
+    .pyc solo sirve a la versión de Python que lo generó, así que si el
+    intérprete no coincide con runtime (el de la función) no se compila.
+    """
 
     MAX_SIZE_MB = 50
 
@@ -71,31 +148,187 @@ class PackageBuilder:
         "*.egg-info/",
     ]
 
+    # Archivos que ya vienen comprimidos y se guardan tal cual en el ZIP. Las
+    # entradas que deflate no reduce se guardan sin comprimir automáticamente.
+    STORE_PATTERNS = [
+        "*.gz",
+        "*.bz2",
+        "*.xz",
+        "*.zip",
+        "*.whl",
+    ]
+
+    # Ruta con la que los .pyc registran sus fuentes (LAMBDA_TASK_ROOT)
+    BYTECODE_PREFIX = "/var/task"
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        lock_path: Path = Path("poetry.lock"),
+        max_workers: Optional[int] = None,
+        slimming: Optional[SlimmingConfig] = None,
+        compile_bytecode: bool = True,
+        report_path: Optional[Path] = None,
+        report_imports: bool = True,
+        runtime: str = config.lambda_runtime,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.lock_path = Path(lock_path)
+        self.max_workers = max_workers
+        self.slimming = slimming if slimming is not None else SlimmingConfig()
+        self.compile_bytecode = compile_bytecode
+        self.report_path = Path(report_path) if report_path is not None else None
+        self.report_imports = report_imports
+        self.runtime = runtime
+
     def build(self, source_dir: Path, model_path: Path, output_path: Path) -> PackageInfo:
         """Construye el paquete ZIP."""
         source_dir = Path(source_dir)
         model_path = Path(model_path)
         output_path = Path(output_path)
-
-        if not source_dir.is_dir():
-            raise FileNotFoundError(f"Source directory not found: {source_dir}")
-        if not model_path.is_file():
-            raise FileNotFoundError(f"Model file not found: {model_path}")
+        self._validate_inputs(source_dir, model_path)
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with tempfile.TemporaryDirectory(prefix="ml-lambda-package-") as temp_dir:
-            staging_dir = Path(temp_dir)
-            self._install_dependencies(staging_dir)
+            dependencies_dir = self._prepare_dependencies(Path(temp_dir) / "dependencies")
+            staging_dir = Path(temp_dir) / "staging"
+            staging_dir.mkdir()
             self._copy_tree(source_dir, staging_dir)
 
             # The Lambda handler loads the model from artifacts/model.joblib.
             model_destination = staging_dir / "artifacts" / config.model_filename
             model_destination.parent.mkdir(parents=True, exist_ok=True)
             shutil.copy2(model_path, model_destination)
+            if self.compile_bytecode:
+                self._compile_bytecode(staging_dir)
+
+            pruned_files: set[str] = set()
+            if self.slimming.prune_unused:
+                loaded = trace_imports(
+                    dependencies_dir, staging_dir, self.slimming.sample_features
+                )
+                pruned_files = unused_modules(
+                    dependencies_dir, loaded, self.slimming.keep_patterns
+                )
+
+            included_files, sha256_hash = self._create_zip(
+                [dependencies_dir, staging_dir], output_path, excluded_files=pruned_files
+            )
+
+        if self.report_path is not None:
+            # Antes de validar el tamaño: el reporte explica qué recortar
+            report = build_report(
+                output_path,
+                import_features=self.slimming.sample_features if self.report_imports else None,
+            )
+            write_report(report, self.report_path)
+
+        return self._package_info(output_path, included_files, sha256_hash)
 
-            included_files = self._create_zip(staging_dir, output_path)
+    def build_layers(self, source_dir: Path, model_path: Path, output_dir: Path) -> LayeredPackage:
+        """Construye dependencias, código y modelo como artefactos separados.
 
+        - Capa de dependencias (prefijo python/, montada en /opt/python):
+          su nombre incluye dependency_cache_key, así que solo se construye
+          cuando cambia poetry.lock y en otro caso se reutiliza.
+        - Código de la función: solo el código fuente.
+        - Capa del modelo (/opt/artifacts), cargada por el handler gracias a
+          la variable de entorno del manifest.
+
+        Código y modelo se nombran por su hash: un reentrenamiento solo
+        produce un artefacto de modelo nuevo, y volver a una versión anterior
+        es volver a referenciar artefactos ya construidos.
+
+        Args:
+            source_dir: Directorio con el código fuente
+            model_path: Modelo serializado
+            output_dir: Directorio de los artefactos y de manifest.json
+
+        Returns:
+            LayeredPackage con los tres artefactos y la ruta del manifest
+
+        Raises:
+            ValueError: Si la configuración pide podar módulos no importados,
+                que haría depender la capa de dependencias del código
+        """
+        source_dir = Path(source_dir)
+        model_path = Path(model_path)
+        output_dir = Path(output_dir)
+        self._validate_inputs(source_dir, model_path)
+        if self.slimming.prune_unused:
+            raise ValueError("prune_unused is not supported for layered builds")
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        cache_key = self.dependency_cache_key()
+
+        with tempfile.TemporaryDirectory(prefix="ml-lambda-layers-") as temp_dir:
+            dependencies_path = output_dir / f"dependencies-{cache_key[:16]}.zip"
+            if dependencies_path.is_file():
+                with zipfile.ZipFile(dependencies_path) as layer:
+                    included_files = layer.namelist()
+                dependencies = self._package_info(
+                    dependencies_path, included_files, compute_file_hash(dependencies_path)
+                )
+            else:
+                dependencies_dir = self._prepare_dependencies(Path(temp_dir) / "dependencies")
+                dependencies = self._write_artifact(
+                    [dependencies_dir], dependencies_path, prefix=LAYER_PYTHON_PREFIX
+                )
+
+            code_dir = Path(temp_dir) / "code"
+            code_dir.mkdir()
+            self._copy_tree(source_dir, code_dir)
+            if self.compile_bytecode:
+                self._compile_bytecode(code_dir)
+            code = self._write_content_addressed([code_dir], output_dir, "code")
+
+            model_dir = Path(temp_dir) / "model"
+            (model_dir / "artifacts").mkdir(parents=True)
+            shutil.copy2(model_path, model_dir / "artifacts" / config.model_filename)
+            model = self._write_content_addressed([model_dir], output_dir, "model")
+
+        layered = LayeredPackage(
+            dependencies=dependencies,
+            code=code,
+            model=model,
+            manifest_path=output_dir / "manifest.json",
+            dependency_cache_key=cache_key,
+        )
+        layered.manifest_path.write_text(
+            json.dumps(layered.to_manifest(), indent=2, sort_keys=True) + "\n"
+        )
+        return layered
+
+    def _validate_inputs(self, source_dir: Path, model_path: Path) -> None:
+        """Verifica que existen el código fuente y el modelo."""
+        if not source_dir.is_dir():
+            raise FileNotFoundError(f"Source directory not found: {source_dir}")
+        if not model_path.is_file():
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+
+    def _write_artifact(
+        self, root_dirs: list[Path], output_path: Path, prefix: str = ""
+    ) -> PackageInfo:
+        """Crea un ZIP y retorna su PackageInfo validando el tamaño."""
+        included_files, sha256_hash = self._create_zip(root_dirs, output_path, prefix=prefix)
+        return self._package_info(output_path, included_files, sha256_hash)
+
+    def _write_content_addressed(
+        self, root_dirs: list[Path], output_dir: Path, name: str
+    ) -> PackageInfo:
+        """Crea <name>-<hash>.zip en output_dir (reemplazo atómico)."""
+        partial_path = output_dir / f".{name}.zip.partial"
+        info = self._write_artifact(root_dirs, partial_path)
+        output_path = output_dir / f"{name}-{info.sha256_hash[:16]}.zip"
+        os.replace(partial_path, output_path)
+        info.path = output_path
+        return info
+
+    def _package_info(
+        self, output_path: Path, included_files: list[str], sha256_hash: str
+    ) -> PackageInfo:
+        """PackageInfo de un ZIP creado; lo elimina si excede MAX_SIZE_MB."""
         size_bytes = output_path.stat().st_size
         size_mb = size_bytes / (1024 * 1024)
         if size_mb > self.MAX_SIZE_MB:
@@ -108,10 +341,72 @@ class PackageBuilder:
             path=output_path,
             size_bytes=size_bytes,
             size_mb=size_mb,
-            sha256_hash=self._compute_hash(output_path),
+            sha256_hash=sha256_hash,
             included_files=included_files,
         )
 
+    def dependency_cache_key(self) -> str:
+        """Clave de la capa de dependencias cacheada.
+
+        Combina el contenido de poetry.lock (o, si no existe, los requirements
+        exportados) con la plataforma y la versión del intérprete que instala
+        las dependencias, ya que los wheels binarios dependen de ambos.
+        """
+        if self.lock_path.is_file():
+            dependencies_digest = compute_file_hash(self.lock_path)
+        else:
+            dependencies_digest = hashlib.sha256(
+                self._production_requirements().encode()
+            ).hexdigest()
+
+        payload = json.dumps(
+            {
+                "dependencies": dependencies_digest,
+                "platform": sysconfig.get_platform(),
+                "python": [platform.python_implementation(), *sys.version_info[:2]],
+                "slimming": self.slimming.cache_fields(),
+                "bytecode": self.compile_bytecode and self._bytecode_matches_runtime(),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _prepare_dependencies(self, fallback_dir: Path) -> Path:
+        """Retorna un directorio con las dependencias instaladas.
+
+        Sin caché se instalan en fallback_dir. Con caché se reutiliza la
+        entrada de la clave actual o se crea instalando en un directorio
+        temporal que se renombra al terminar, de modo que una instalación
+        interrumpida nunca queda registrada como entrada válida.
+        """
+        if self.cache_dir is None:
+            fallback_dir.mkdir(parents=True, exist_ok=True)
+            self._install_dependencies(fallback_dir)
+            slim_dependencies(fallback_dir, self.slimming)
+            if self.compile_bytecode:
+                self._compile_bytecode(fallback_dir)
+            return fallback_dir
+
+        entry_dir = self.cache_dir / self.dependency_cache_key()
+        if entry_dir.is_dir():
+            return entry_dir
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        partial_dir = Path(tempfile.mkdtemp(prefix=".partial-", dir=self.cache_dir))
+        try:
+            self._install_dependencies(partial_dir)
+            slim_dependencies(partial_dir, self.slimming)
+            if self.compile_bytecode:
+                self._compile_bytecode(partial_dir)
+            os.replace(partial_dir, entry_dir)
+        except OSError:
+            # Otro build concurrente creó la misma entrada
+            if not entry_dir.is_dir():
+                raise
+        finally:
+            shutil.rmtree(partial_dir, ignore_errors=True)
+        return entry_dir
+
     def _install_dependencies(self, target_dir: Path) -> None:
         """Instala dependencias de producción."""
         target_dir.mkdir(parents=True, exist_ok=True)
@@ -137,18 +432,55 @@ class PackageBuilder:
                 check=True,
             )
 
+    def _compile_bytecode(self, root_dir: Path) -> None:
+        """Compila los .py de root_dir a .pyc con invalidación unchecked-hash.
+
+        Los .pyc basados en hash no dependen de mtimes, así que el resultado
+        es reproducible, y unchecked evita que el runtime lea la fuente para
+        validarlos. Un archivo que no compila (ej: plantillas con sintaxis
+        inválida) se queda sin .pyc y se compila al importarse, como antes.
+        """
+        if not self._bytecode_matches_runtime():
+            logger.warning(
+                "bytecode_compilation_skipped",
+                build_python=platform.python_version(),
+                runtime=self.runtime,
+            )
+            return
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "compileall",
+                "-q",
+                "-j",
+                "0",
+                "--invalidation-mode",
+                "unchecked-hash",
+                "-d",
+                self.BYTECODE_PREFIX,
+                str(root_dir),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            logger.warning(
+                "bytecode_compilation_failed",
+                returncode=result.returncode,
+                # compileall informa de los errores de sintaxis por stdout
+                stdout=result.stdout.strip(),
+                stderr=result.stderr.strip(),
+            )
+
+    def _bytecode_matches_runtime(self) -> bool:
+        """Si el intérprete del build es la versión de Python de runtime."""
+        return self.runtime == f"python{sys.version_info.major}.{sys.version_info.minor}"
+
     def _production_requirements(self) -> str:
         """Obtiene las dependencias de producción en formato requirements."""
         return get_production_requirements()
 
-    def _compute_hash(self, path: Path) -> str:
-        """Calcula SHA256 del archivo."""
-        sha256_hash = hashlib.sha256()
-        with path.open("rb") as package_file:
-            for chunk in iter(lambda: package_file.read(8192), b""):
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
-
     def _copy_tree(self, source_dir: Path, target_dir: Path) -> None:
         """Copia el código fuente respetando las exclusiones del paquete."""
         for source_path in source_dir.rglob("*"):
@@ -163,19 +495,61 @@ class PackageBuilder:
                 target_path.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copy2(source_path, target_path)
 
-    def _create_zip(self, staging_dir: Path, output_path: Path) -> list[str]:
-        """Crea el ZIP y retorna sus archivos en orden determinista."""
-        included_files = sorted(
-            path.relative_to(staging_dir).as_posix()
-            for path in staging_dir.rglob("*")
-            if path.is_file() and not self._is_excluded(path.relative_to(staging_dir))
+    def _create_zip(
+        self,
+        root_dirs: list[Path],
+        output_path: Path,
+        excluded_files: set[str] = frozenset(),
+        prefix: str = "",
+    ) -> tuple[list[str], str]:
+        """Crea el ZIP combinando varios directorios raíz.
+
+        Si una ruta existe en más de una raíz prevalece la última, de modo que
+        el código fuente y el modelo sustituyen a cualquier archivo homónimo
+        de la capa de dependencias. Las rutas de excluded_files se omiten.
+
+        Los .pyc generados por _compile_bytecode se incluyen pese a
+        EXCLUDE_PATTERNS solo si su fuente también forma parte del paquete.
+        prefix se antepone a cada ruta dentro del ZIP (ej: python/ en capas).
+
+        Returns:
+            Tuple de (archivos incluidos en orden determinista, SHA256 del ZIP)
+        """
+        sources: dict[str, Path] = {}
+        for root_dir in root_dirs:
+            for path in root_dir.rglob("*"):
+                relative_path = path.relative_to(root_dir)
+                if not path.is_file():
+                    continue
+                generated_bytecode = self._bytecode_source(relative_path) is not None
+                if self._is_excluded(relative_path) and not generated_bytecode:
+                    continue
+                sources[relative_path.as_posix()] = path
+        for relative_path in excluded_files:
+            sources.pop(relative_path, None)
+        for relative_path in list(sources):
+            source = self._bytecode_source(Path(relative_path))
+            if source is not None and source not in sources:
+                del sources[relative_path]
+        included_files = sorted(prefix + relative_path for relative_path in sources)
+
+        sha256_hash = write_zip(
+            [(prefix + relative_path, sources[relative_path]) for relative_path in sorted(sources)],
+            output_path,
+            max_workers=self.max_workers,
+            store_patterns=self.STORE_PATTERNS,
         )
-
-        with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as package:
-            for relative_path in included_files:
-                package.write(staging_dir / relative_path, arcname=relative_path)
-
-        return included_files
+        return included_files, sha256_hash
+
+    def _bytecode_source(self, relative_path: Path) -> Optional[str]:
+        """Fuente de un .pyc de __pycache__ para este intérprete, o None."""
+        if relative_path.parent.name != "__pycache__" or relative_path.suffix != ".pyc":
+            return None
+        try:
+            return Path(importlib.util.source_from_cache(relative_path.as_posix())).as_posix()
+        except ValueError:
+            # Bytecode de otra versión de Python o con nombre no estándar
+            return None
 
     def _is_excluded(self, relative_path: Path) -> bool:
         """Indica si una ruta debe quedar fuera del paquete."""
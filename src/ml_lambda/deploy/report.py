@@ -0,0 +1,216 @@
+"""Reporte de tamaño y coste de importación del paquete Lambda."""
+
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+# Versión del formato del reporte (para comparar reportes entre builds en CI)
+REPORT_FORMAT_VERSION = 1
+
+# Grupo de los módulos importados que no vienen en el paquete
+STDLIB_BUCKET = "<stdlib>"
+
+# Importa el entry point y procesa una predicción de ejemplo, como en un cold
+# start; con -X importtime cada import se registra en stderr
+_IMPORT_SCRIPT = """
+import json, sys
+features = json.loads(sys.argv[1])
+sys.path.insert(0, ".")
+from ml_lambda.lambda_function import lambda_handler
+response = lambda_handler({"body": json.dumps({"features": features})}, None)
+if response.get("statusCode") != 200:
+    sys.exit("sample prediction failed: " + str(response.get("body")))
+"""
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def build_report(
+    package_path: Path,
+    directory_depth: int = 2,
+    import_features: Optional[list[float]] = None,
+) -> dict[str, Any]:
+    """Analiza un paquete ZIP ya construido.
+
+    Args:
+        package_path: ZIP de despliegue
+        directory_depth: Niveles de directorio del desglose por directorio
+        import_features: Features de la predicción de ejemplo; None omite
+            la medición de tiempos de importación
+
+    Returns:
+        Reporte serializable a JSON con tamaños por distribución y
+        directorio (comprimido y sin comprimir) y tiempos de importación
+    """
+    package_path = Path(package_path)
+    with zipfile.ZipFile(package_path) as package:
+        infos = [info for info in package.infolist() if not info.is_dir()]
+
+    distribution_of = _distribution_map(package_path, infos)
+    packaged_modules = {_top_level_module(info.filename.split("/", 1)[0]) for info in infos}
+
+    def distribution(root_name: str) -> str:
+        top_level = _top_level_module(root_name)
+        return distribution_of.get(_normalize(top_level), top_level)
+
+    distributions: dict[str, dict[str, int]] = defaultdict(_empty_sizes)
+    directories: dict[str, dict[str, int]] = defaultdict(_empty_sizes)
+    for info in infos:
+        parts = info.filename.split("/")
+        for bucket in (
+            distributions[distribution(parts[0])],
+            directories["/".join(parts[: min(directory_depth, len(parts) - 1)]) or "."],
+        ):
+            bucket["files"] += 1
+            bucket["compressed_bytes"] += info.compress_size
+            bucket["uncompressed_bytes"] += info.file_size
+
+    report: dict[str, Any] = {
+        "format_version": REPORT_FORMAT_VERSION,
+        "package": package_path.name,
+        "totals": {
+            "files": len(infos),
+            "compressed_bytes": sum(info.compress_size for info in infos),
+            "uncompressed_bytes": sum(info.file_size for info in infos),
+            "package_bytes": package_path.stat().st_size,
+        },
+        "distributions": _sorted_by_size(distributions),
+        "directories": _sorted_by_size(directories),
+        "import_times": None,
+        "import_error": None,
+    }
+
+    if import_features is not None:
+        try:
+            module_times = measure_import_times(package_path, import_features)
+        except RuntimeError as error:
+            report["import_error"] = str(error)
+        else:
+            per_distribution: dict[str, int] = defaultdict(int)
+            for module, self_us in module_times.items():
+                top_level = module.split(".", 1)[0]
+                if top_level in packaged_modules:
+                    per_distribution[distribution(top_level)] += self_us
+                else:
+                    per_distribution[STDLIB_BUCKET] += self_us
+            report["import_times"] = {
+                "total_us": sum(module_times.values()),
+                "distributions": dict(
+                    sorted(per_distribution.items(), key=lambda item: (-item[1], item[0]))
+                ),
+            }
+
+    return report
+
+
+def write_report(report: dict[str, Any], path: Path) -> None:
+    """Escribe el reporte como JSON con orden estable."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def measure_import_times(package_path: Path, features: list[float]) -> dict[str, int]:
+    """Tiempo de importación propio (self, en µs) de cada módulo del cold start.
+
+    Extrae el paquete en un directorio temporal y ejecuta el entry point en
+    un intérprete aislado con -X importtime, de modo que solo ve el
+    contenido del ZIP (incluido su bytecode precompilado).
+
+    Raises:
+        RuntimeError: Si la importación o la predicción de ejemplo fallan
+    """
+    with tempfile.TemporaryDirectory(prefix="ml-lambda-report-") as temp_dir:
+        with zipfile.ZipFile(package_path) as package:
+            package.extractall(temp_dir)
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-I",
+                "-S",
+                "-B",
+                "-X",
+                "importtime",
+                "-c",
+                _IMPORT_SCRIPT,
+                json.dumps(features),
+            ],
+            cwd=temp_dir,
+            capture_output=True,
+            text=True,
+        )
+
+    times: dict[str, int] = defaultdict(int)
+    other_lines = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            times[match.group(4)] += int(match.group(1))
+        elif not line.startswith("import time:"):
+            other_lines.append(line)
+    if result.returncode != 0:
+        error = "\n".join(other_lines).strip()
+        raise RuntimeError(f"Import trace failed: {error}")
+    return dict(times)
+
+
+def _empty_sizes() -> dict[str, int]:
+    return {"files": 0, "compressed_bytes": 0, "uncompressed_bytes": 0}
+
+
+def _sorted_by_size(buckets: dict[str, dict[str, int]]) -> dict[str, dict[str, int]]:
+    """Ordena por tamaño sin comprimir descendente (y nombre, para estabilidad)."""
+    return dict(
+        sorted(buckets.items(), key=lambda item: (-item[1]["uncompressed_bytes"], item[0]))
+    )
+
+
+def _top_level_module(name: str) -> str:
+    """Módulo top-level al que pertenece una entrada raíz del ZIP.
+
+    Agrupa librerías vendorizadas (scipy.libs), metadatos (*.dist-info) y
+    módulos de un solo archivo (threadpoolctl.py) con su paquete.
+    """
+    if name.endswith(".libs"):
+        return name[: -len(".libs")]
+    if name.endswith(".dist-info"):
+        return name[: -len(".dist-info")].split("-", 1)[0]
+    if name.endswith(".py"):
+        return name[: -len(".py")]
+    return name
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[-_.]+", "_", name).lower()
+
+
+def _distribution_map(package_path: Path, infos: list[zipfile.ZipInfo]) -> dict[str, str]:
+    """Mapea módulos top-level (normalizados) a su distribución.
+
+    Usa el nombre de cada *.dist-info del ZIP, el campo Name de su METADATA
+    y, si existe, su top_level.txt (ej: sklearn -> scikit-learn).
+    """
+    distribution_of: dict[str, str] = {}
+    with zipfile.ZipFile(package_path) as package:
+        names = {info.filename for info in infos}
+        for dist_info in sorted({n.split("/", 1)[0] for n in names if ".dist-info/" in n}):
+            prefix = dist_info[: -len(".dist-info")].split("-", 1)[0]
+            distribution = prefix
+            if f"{dist_info}/METADATA" in names:
+                metadata = package.read(f"{dist_info}/METADATA").decode("utf-8", "replace")
+                for line in metadata.splitlines():
+                    if line.startswith("Name:"):
+                        distribution = line.split(":", 1)[1].strip()
+                        break
+            modules = [prefix]
+            if f"{dist_info}/top_level.txt" in names:
+                modules += package.read(f"{dist_info}/top_level.txt").decode().split()
+            for module in modules:
+                distribution_of[_normalize(module)] = distribution
+    return distribution_of
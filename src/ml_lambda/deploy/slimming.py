@@ -0,0 +1,267 @@
+"""Reducción del tamaño de las dependencias del paquete Lambda."""
+
+import fnmatch
+import json
+import shutil
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from importlib.machinery import EXTENSION_SUFFIXES
+from pathlib import Path
+
+# Directorios de tests que las librerías distribuyen dentro del paquete
+TEST_DIRECTORIES = ("tests", "test")
+
+# Archivos que solo se usan al compilar o para tipado, nunca en runtime
+DEFAULT_REMOVE_PATTERNS = (
+    "*.pyi",
+    "py.typed",
+    "*.pxd",
+    "*.pyx",
+    "*.pxi",
+    "*.c",
+    "*.cpp",
+    "*.h",
+    "*.md",
+    "*.rst",
+)
+
+# Versión de lo que slim_dependencies deja en la capa; se incrementa cuando
+# cambia su resultado con la misma configuración (2: top_level.txt generado
+# desde RECORD) para invalidar las capas cacheadas
+SLIMMING_LAYOUT_VERSION = 2
+
+# Metadatos de instalación de pip; METADATA y las licencias se conservan (y
+# top_level.txt, que se genera desde RECORD si la distribución no lo trae)
+DIST_INFO_CLUTTER = ("RECORD", "INSTALLER", "REQUESTED", "direct_url.json", "WHEEL")
+
+# Script que importa el entry point y realiza una predicción de ejemplo en
+# un intérprete aislado (-I -S -B: sin site-packages ni bytecode escrito)
+_TRACE_SCRIPT = """
+import json, sys
+dependencies_dir, staging_dir, features = sys.argv[1], sys.argv[2], json.loads(sys.argv[3])
+sys.path[:0] = [staging_dir, dependencies_dir]
+from ml_lambda.lambda_function import lambda_handler
+response = lambda_handler({"body": json.dumps({"features": features})}, None)
+if response.get("statusCode") != 200:
+    sys.exit("sample prediction failed: " + str(response.get("body")))
+files = [getattr(module, "__file__", None) for module in list(sys.modules.values())]
+print(json.dumps(sorted(f for f in files if f)))
+"""
+
+
+@dataclass
+class SlimmingConfig:
+    """Configuración de la reducción de dependencias."""
+
+    remove_tests: bool = True
+    remove_patterns: list[str] = field(default_factory=lambda: list(DEFAULT_REMOVE_PATTERNS))
+    clean_dist_info: bool = True
+    strip_binaries: bool = True
+    # Poda por traza de imports: depende del código y del modelo, por lo que
+    # se aplica al crear el ZIP y no modifica la capa de dependencias cacheada
+    prune_unused: bool = False
+    keep_patterns: list[str] = field(default_factory=list)
+    sample_features: list[float] = field(default_factory=lambda: [5.1, 3.5, 1.4, 0.2])
+
+    def cache_fields(self) -> dict:
+        """Campos que determinan el contenido de la capa cacheada."""
+        return {
+            "layout_version": SLIMMING_LAYOUT_VERSION,
+            "remove_tests": self.remove_tests,
+            "remove_patterns": sorted(self.remove_patterns),
+            "clean_dist_info": self.clean_dist_info,
+            "strip_binaries": self.strip_binaries,
+        }
+
+
+@dataclass
+class SlimmingResult:
+    """Resultado de la reducción de dependencias."""
+
+    removed_files: int
+    bytes_removed: int
+    stripped_binaries: int
+
+
+def slim_dependencies(target_dir: Path, slimming: SlimmingConfig) -> SlimmingResult:
+    """Elimina de las dependencias instaladas lo que no se usa en runtime.
+
+    Args:
+        target_dir: Directorio con las dependencias instaladas
+        slimming: Pasos a aplicar
+
+    Returns:
+        SlimmingResult con archivos y bytes eliminados
+    """
+    target_dir = Path(target_dir)
+    if slimming.clean_dist_info:
+        for dist_info in target_dir.glob("*.dist-info"):
+            _ensure_top_level(dist_info)
+
+    doomed: list[Path] = []
+    for path in target_dir.rglob("*"):
+        relative_parts = path.relative_to(target_dir).parts
+        if any(part.endswith(".dist-info") for part in relative_parts[:-1]):
+            if (
+                slimming.clean_dist_info
+                and path.is_file()
+                and len(relative_parts) == 2
+                and path.name in DIST_INFO_CLUTTER
+            ):
+                doomed.append(path)
+            continue
+        if path.is_dir():
+            # Solo tests dentro de un paquete, nunca un paquete top-level
+            if slimming.remove_tests and path.name in TEST_DIRECTORIES and len(relative_parts) > 1:
+                doomed.append(path)
+        elif any(fnmatch.fnmatch(path.name, pattern) for pattern in slimming.remove_patterns):
+            doomed.append(path)
+
+    removed_files = 0
+    bytes_removed = 0
+    for path in doomed:
+        if not path.exists():
+            continue  # Dentro de un directorio ya eliminado
+        if path.is_dir():
+            files = [p for p in path.rglob("*") if p.is_file()]
+            removed_files += len(files)
+            bytes_removed += sum(p.stat().st_size for p in files)
+            shutil.rmtree(path)
+        else:
+            removed_files += 1
+            bytes_removed += path.stat().st_size
+            path.unlink()
+
+    stripped_binaries = 0
+    if slimming.strip_binaries:
+        stripped_binaries, stripped_bytes = _strip_shared_objects(target_dir)
+        bytes_removed += stripped_bytes
+
+    return SlimmingResult(
+        removed_files=removed_files,
+        bytes_removed=bytes_removed,
+        stripped_binaries=stripped_binaries,
+    )
+
+
+def _ensure_top_level(dist_info: Path) -> None:
+    """Genera top_level.txt desde RECORD para conservar módulo -> distribución."""
+    record = dist_info / "RECORD"
+    top_level = dist_info / "top_level.txt"
+    if top_level.exists() or not record.is_file():
+        return
+
+    modules = set()
+    for line in record.read_text().splitlines():
+        root = line.split(",", 1)[0].split("/", 1)[0]
+        if not root or root.startswith("..") or root.endswith((".dist-info", ".data", ".libs")):
+            continue
+        modules.add(root[: -len(".py")] if root.endswith(".py") else root)
+    top_level.write_text("".join(f"{module}\n" for module in sorted(modules)))
+
+
+def _strip_shared_objects(target_dir: Path) -> tuple[int, int]:
+    """Elimina símbolos de debug de las extensiones compiladas (si hay strip).
+
+    Las librerías que auditwheel copia en <paquete>.libs/ quedan fuera:
+    patchelf las reescribe de forma que strip las deja sin poder cargarse.
+    """
+    strip = shutil.which("strip")
+    if strip is None:
+        return 0, 0
+
+    stripped = 0
+    bytes_saved = 0
+    for path in sorted(target_dir.rglob("*.so*")):
+        if not path.is_file() or path.is_symlink():
+            continue
+        if any(part.endswith(".libs") for part in path.relative_to(target_dir).parts):
+            continue
+        size_before = path.stat().st_size
+        result = subprocess.run([strip, "--strip-debug", str(path)], capture_output=True)
+        if result.returncode == 0:
+            stripped += 1
+            bytes_saved += size_before - path.stat().st_size
+    return stripped, bytes_saved
+
+
+def trace_imports(
+    dependencies_dir: Path, staging_dir: Path, sample_features: list[float]
+) -> set[str]:
+    """Archivos de dependencias cargados por el path de inferencia.
+
+    Importa ml_lambda.lambda_function y procesa una predicción de ejemplo en
+    un intérprete aislado que solo ve staging_dir (código y modelo) y
+    dependencies_dir.
+
+    Returns:
+        Rutas relativas a dependencies_dir (formato POSIX) de los módulos cargados
+
+    Raises:
+        RuntimeError: Si la importación o la predicción de ejemplo fallan
+    """
+    dependencies_dir = Path(dependencies_dir).resolve()
+    staging_dir = Path(staging_dir).resolve()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-I",
+            "-S",
+            "-B",
+            "-c",
+            _TRACE_SCRIPT,
+            str(dependencies_dir),
+            str(staging_dir),
+            json.dumps(sample_features),
+        ],
+        cwd=staging_dir,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import trace failed: {result.stderr.strip()}")
+
+    loaded = set()
+    for module_file in json.loads(result.stdout.strip().splitlines()[-1]):
+        path = Path(module_file).resolve()
+        if path.is_relative_to(dependencies_dir):
+            loaded.add(path.relative_to(dependencies_dir).as_posix())
+    return loaded
+
+
+def unused_modules(
+    dependencies_dir: Path, loaded: set[str], keep_patterns: list[str]
+) -> set[str]:
+    """Módulos de dependencias que el path de inferencia nunca importa.
+
+    Solo se consideran archivos .py y extensiones de Python: datos,
+    librerías compartidas cargadas con dlopen y los __init__.py que definen
+    la estructura de paquetes se conservan siempre.
+
+    Args:
+        dependencies_dir: Directorio con las dependencias instaladas
+        loaded: Resultado de trace_imports
+        keep_patterns: Patrones (fnmatch sobre la ruta relativa) a conservar
+
+    Returns:
+        Rutas relativas (formato POSIX) que pueden omitirse del paquete
+    """
+    dependencies_dir = Path(dependencies_dir)
+    module_suffixes = tuple(suffix for suffix in EXTENSION_SUFFIXES if suffix != ".so") + (
+        ".py",
+    )
+
+    unused = set()
+    for path in dependencies_dir.rglob("*"):
+        if not path.is_file() or path.name == "__init__.py":
+            continue
+        if not path.name.endswith(module_suffixes):
+            continue
+        relative_path = path.relative_to(dependencies_dir).as_posix()
+        if relative_path in loaded:
+            continue
+        if any(fnmatch.fnmatch(relative_path, pattern) for pattern in keep_patterns):
+            continue
+        unused.add(relative_path)
+    return unused
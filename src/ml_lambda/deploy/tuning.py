@@ -0,0 +1,289 @@
+"""Selección de la memoria de Lambda a partir de benchmarks locales.
+
+Lambda asigna CPU en proporción a la memoria: 1769 MB equivalen a una vCPU
+completa y 128 MB a menos de una décima parte. Aquí lambda_handler se
+ejecuta en un intérprete aparte con la cuota de CPU de cada tier de memoria
+y se estima latencia y coste por solicitud de cada uno.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, TypeVar
+
+import numpy as np
+
+from ..config import ARTIFACTS_DIR_ENV
+
+# Memoria a partir de la cual Lambda asigna una vCPU completa
+FULL_VCPU_MEMORY_MB = 1769
+
+# Tiers evaluados por defecto
+DEFAULT_MEMORY_TIERS = (128, 256, 512, 1024, 1769, 3008)
+
+# Precios de Lambda x86 en us-east-1 (USD)
+PRICE_PER_GB_SECOND = 0.0000166667
+PRICE_PER_REQUEST = 0.0000002
+
+# Periodo CFS de las cuotas de CPU (µs)
+_CFS_PERIOD_US = 100_000
+
+# Duración escalar o array de duraciones (el coste tiene la misma forma)
+Duration = TypeVar("Duration", float, np.ndarray)
+
+# Mide el cold start (import + primera solicitud) y la latencia de cada
+# solicitud en caliente; los resultados van a un archivo porque el handler
+# escribe sus logs en stdout
+_BENCHMARK_SCRIPT = """
+import json, sys, time
+features = json.loads(sys.argv[1])
+invocations, warmup, output = int(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+start = time.perf_counter()
+from ml_lambda.lambda_function import lambda_handler
+event = {"body": json.dumps({"features": features})}
+response = lambda_handler(event, None)
+cold_start_ms = (time.perf_counter() - start) * 1000
+if response.get("statusCode") != 200:
+    sys.exit("sample prediction failed: " + str(response.get("body")))
+for _ in range(warmup):
+    lambda_handler(event, None)
+latencies_ms = []
+for _ in range(invocations):
+    start = time.perf_counter()
+    lambda_handler(event, None)
+    latencies_ms.append((time.perf_counter() - start) * 1000)
+with open(output, "w") as results:
+    json.dump({"cold_start_ms": cold_start_ms, "latencies_ms": latencies_ms}, results)
+"""
+
+
+@dataclass
+class TierResult:
+    """Latencia y coste estimados para un tier de memoria."""
+
+    memory_mb: int
+    cpu_share: float
+    method: str
+    cold_start_ms: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+    cost_per_million: float
+
+
+def cpu_share(memory_mb: int) -> float:
+    """Fracción de vCPU que Lambda asigna a una memoria dada."""
+    return memory_mb / FULL_VCPU_MEMORY_MB
+
+
+def request_cost(
+    memory_mb: int,
+    duration_ms: Duration,
+    price_per_gb_second: float = PRICE_PER_GB_SECOND,
+    price_per_request: float = PRICE_PER_REQUEST,
+) -> Duration:
+    """Coste de una solicitud (o de un array de duraciones).
+
+    Lambda factura la duración redondeada al milisegundo superior.
+    """
+    billed_seconds = np.ceil(duration_ms) / 1000
+    return memory_mb / 1024 * billed_seconds * price_per_gb_second + price_per_request
+
+
+class PowerTuner:
+    """Ejecuta el benchmark de lambda_handler en varios tiers de memoria.
+
+    Si el proceso puede crear cgroups de CPU (v2 o v1), cada tier se mide
+    con una cuota CFS igual a su fracción de vCPU (method="cgroup"). Si no,
+    se mide una vez fijado a una sola CPU y la latencia de cada tier se
+    escala por 1/fracción (method="scaled"): el handler es de un solo hilo,
+    así que por encima de una vCPU no se acelera. También se usa "scaled"
+    si el benchmark no puede unirse al cgroup (el fallo de preexec_fn llega
+    como SubprocessError), p. ej. con un cgroup v2 sin delegación completa.
+    """
+
+    def __init__(
+        self,
+        artifacts_dir: Path,
+        tiers: tuple[int, ...] = DEFAULT_MEMORY_TIERS,
+        invocations: int = 200,
+        warmup: int = 20,
+        features: Optional[list[float]] = None,
+        use_cgroup: bool = True,
+        price_per_gb_second: float = PRICE_PER_GB_SECOND,
+        price_per_request: float = PRICE_PER_REQUEST,
+    ):
+        self.artifacts_dir = Path(artifacts_dir)
+        self.tiers = tuple(sorted(tiers))
+        self.invocations = invocations
+        self.warmup = warmup
+        self.features = features or [5.1, 3.5, 1.4, 0.2]
+        self.use_cgroup = use_cgroup
+        self.price_per_gb_second = price_per_gb_second
+        self.price_per_request = price_per_request
+
+    def run(self) -> list[TierResult]:
+        """Mide todos los tiers y retorna sus resultados ordenados por memoria."""
+        cgroup_root = _cgroup_cpu_root() if self.use_cgroup else None
+        if cgroup_root is not None:
+            try:
+                return self._run_cgroup(cgroup_root)
+            except (subprocess.SubprocessError, OSError):
+                pass
+
+        baseline = self._benchmark(preexec_fn=_pin_to_one_cpu)
+        return [
+            self._result(memory_mb, "scaled", baseline, 1 / min(cpu_share(memory_mb), 1.0))
+            for memory_mb in self.tiers
+        ]
+
+    def _run_cgroup(self, cgroup_root: Path) -> list[TierResult]:
+        """Mide cada tier con su cuota de CPU."""
+        results = []
+        for memory_mb in self.tiers:
+            with _CpuQuota(cgroup_root, cpu_share(memory_mb)) as quota:
+                measurement = self._benchmark(preexec_fn=quota.join)
+            results.append(self._result(memory_mb, "cgroup", measurement, 1.0))
+        return results
+
+    def _benchmark(self, preexec_fn) -> dict:
+        """Ejecuta el benchmark en un intérprete aparte."""
+        import ml_lambda
+
+        env = dict(os.environ)
+        env[ARTIFACTS_DIR_ENV] = str(self.artifacts_dir.resolve())
+        package_root = str(Path(ml_lambda.__file__).resolve().parent.parent)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+
+        with tempfile.TemporaryDirectory(prefix="ml-lambda-tuning-") as temp_dir:
+            output = Path(temp_dir) / "results.json"
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    _BENCHMARK_SCRIPT,
+                    json.dumps(self.features),
+                    str(self.invocations),
+                    str(self.warmup),
+                    str(output),
+                ],
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                preexec_fn=preexec_fn,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"Benchmark failed: {result.stderr.strip()}")
+            return json.loads(output.read_text())
+
+    def _result(
+        self, memory_mb: int, method: str, measurement: dict, slowdown: float
+    ) -> TierResult:
+        latencies = np.asarray(measurement["latencies_ms"]) * slowdown
+        costs = request_cost(
+            memory_mb, latencies, self.price_per_gb_second, self.price_per_request
+        )
+        return TierResult(
+            memory_mb=memory_mb,
+            cpu_share=round(cpu_share(memory_mb), 3),
+            method=method,
+            cold_start_ms=measurement["cold_start_ms"] * slowdown,
+            mean_ms=float(latencies.mean()),
+            p50_ms=float(np.percentile(latencies, 50)),
+            p99_ms=float(np.percentile(latencies, 99)),
+            cost_per_million=float(costs.mean()) * 1_000_000,
+        )
+
+
+def recommend(results: list[TierResult], max_p99_ms: Optional[float] = None) -> TierResult:
+    """Tier más barato que cumple el objetivo de p99 (el más rápido si ninguno).
+
+    Los empates de coste se resuelven por menor p99.
+    """
+    candidates = [r for r in results if max_p99_ms is None or r.p99_ms <= max_p99_ms]
+    if not candidates:
+        return min(results, key=lambda r: r.p99_ms)
+    return min(candidates, key=lambda r: (round(r.cost_per_million, 6), r.p99_ms))
+
+
+def format_table(results: list[TierResult], recommended: Optional[TierResult] = None) -> str:
+    """Tabla de texto con una fila por tier."""
+    header = (
+        f"{'memory_mb':>9}  {'vcpu':>5}  {'cold_ms':>8}  {'p50_ms':>8}  "
+        f"{'p99_ms':>8}  {'usd_per_1M':>10}  method"
+    )
+    lines = [header]
+    for r in results:
+        marker = "  <- recommended" if recommended is not None and r is recommended else ""
+        lines.append(
+            f"{r.memory_mb:>9}  {r.cpu_share:>5.2f}  {r.cold_start_ms:>8.1f}  {r.p50_ms:>8.2f}  "
+            f"{r.p99_ms:>8.2f}  {r.cost_per_million:>10.4f}  {r.method}{marker}"
+        )
+    return "\n".join(lines)
+
+
+def apply_memory_setting(
+    memory_mb: int, config_path: Path, terraform_path: Optional[Path] = None
+) -> None:
+    """Actualiza lambda_memory en config.py y memory_size en Terraform."""
+    replacements = [(Path(config_path), r"(lambda_memory: int = )\d+")]
+    if terraform_path is not None:
+        replacements.append((Path(terraform_path), r"(memory_size\s*=\s*)\d+"))
+
+    for path, pattern in replacements:
+        content = path.read_bytes().decode("utf-8")
+        updated, count = re.subn(pattern, rf"\g<1>{memory_mb}", content, count=1)
+        if count == 0:
+            raise ValueError(f"Memory setting not found in {path}")
+        path.write_bytes(updated.encode("utf-8"))
+
+
+def _pin_to_one_cpu() -> None:
+    """Fija el proceso hijo a una sola CPU (una vCPU de Lambda)."""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+
+
+def _cgroup_cpu_root() -> Optional[Path]:
+    """Directorio donde este proceso puede crear cgroups con cuota de CPU."""
+    unified = Path("/sys/fs/cgroup")
+    subtree_control = unified / "cgroup.subtree_control"
+    if subtree_control.is_file():
+        # v2: los hijos solo tienen cpu.max si el controlador está delegado
+        if "cpu" in subtree_control.read_text().split() and os.access(unified, os.W_OK):
+            return unified
+        return None
+    legacy = unified / "cpu"
+    if (legacy / "cpu.cfs_quota_us").is_file() and os.access(legacy, os.W_OK):
+        return legacy
+    return None
+
+
+class _CpuQuota:
+    """cgroup temporal con una cuota CFS de una fracción de CPU."""
+
+    def __init__(self, root: Path, share: float):
+        self.path = root / f"ml-lambda-tuning-{os.getpid()}-{int(share * 1000)}"
+        self.quota_us = max(1000, int(_CFS_PERIOD_US * share))
+
+    def __enter__(self) -> "_CpuQuota":
+        self.path.mkdir()
+        if (self.path / "cpu.max").exists():
+            (self.path / "cpu.max").write_text(f"{self.quota_us} {_CFS_PERIOD_US}")
+        else:
+            (self.path / "cpu.cfs_period_us").write_text(str(_CFS_PERIOD_US))
+            (self.path / "cpu.cfs_quota_us").write_text(str(self.quota_us))
+        return self
+
+    def join(self) -> None:
+        """Mueve el proceso actual al cgroup (preexec_fn del benchmark)."""
+        (self.path / "cgroup.procs").write_text(str(os.getpid()))
+
+    def __exit__(self, *exc_info) -> None:
+        self.path.rmdir()
@@ -3,5 +3,21 @@
 from .handler import LambdaHandler
 from .validator import InputValidator
 from .predictor import Predictor
+from .model_source import LocalModelSource, ModelSource, ModelWatcher, S3ModelSource
+from .registry import LoadedModel, ModelRegistry
+from .shadow import ShadowEvaluator
+from .server import InferenceServer
 
-__all__ = ["LambdaHandler", "InputValidator", "Predictor"]
+__all__ = [
+    "LambdaHandler",
+    "InputValidator",
+    "Predictor",
+    "ModelSource",
+    "LocalModelSource",
+    "S3ModelSource",
+    "ModelWatcher",
+    "ModelRegistry",
+    "LoadedModel",
+    "ShadowEvaluator",
+    "InferenceServer",
+]
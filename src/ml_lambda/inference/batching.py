@@ -0,0 +1,108 @@
+"""Agrupación de predicciones concurrentes en un servidor asyncio."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .predictor import PredictionResult, Predictor
+
+# Solicitud pendiente: Predictor, features y future que recibe el resultado
+_Pending = tuple[Predictor, list[float], asyncio.Future]
+
+
+class MicroBatcher:
+    """Agrupa las predicciones que llegan dentro de una ventana corta.
+
+    La primera solicitud de un lote abre una ventana de max_wait_ms; al
+    cerrarse, o al llegar a max_batch_size solicitudes, el lote se predice
+    con una llamada vectorizada por Predictor (predict_batch) y cada
+    solicitud recibe su resultado. La espera añadida a una solicitud está
+    acotada por la ventana.
+
+    Los lotes se predicen en un único hilo aparte, así que el event loop
+    sigue aceptando solicitudes mientras tanto y las que llegan durante un
+    lote forman el siguiente.
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.requests = 0
+        self._pending: list[_Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batcher")
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+    async def predict(self, predictor: Predictor, features: list[float]) -> PredictionResult:
+        """Predicción de una fila, agrupada con las solicitudes concurrentes."""
+        return (await self.predict_batched(predictor, features))[0]
+
+    async def predict_batched(
+        self, predictor: Predictor, features: list[float]
+    ) -> tuple[PredictionResult, int]:
+        """Como predict, retornando además el tamaño del lote en que se predijo."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((predictor, features, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def close(self) -> None:
+        """Libera el hilo de predicción."""
+        self._executor.shutdown(wait=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.requests += len(batch)
+        done = asyncio.get_running_loop().run_in_executor(self._executor, _predict_groups, batch)
+        done.add_done_callback(lambda outcome: _resolve(batch, outcome))
+
+
+def _predict_groups(batch: list[_Pending]) -> list:
+    """Resultado (o excepción) de cada solicitud, una llamada por Predictor.
+
+    Tras una recarga en caliente un mismo lote puede mezclar el Predictor
+    anterior y el nuevo; cada solicitud se predice con el suyo.
+    """
+    groups: dict[int, list[int]] = {}
+    for index, (predictor, _, _) in enumerate(batch):
+        groups.setdefault(id(predictor), []).append(index)
+
+    outcomes: list = [None] * len(batch)
+    for indices in groups.values():
+        predictor = batch[indices[0]][0]
+        try:
+            results = predictor.predict_batch([batch[i][1] for i in indices])
+        except Exception as error:
+            results = [error] * len(indices)
+        for index, result in zip(indices, results):
+            outcomes[index] = result
+    return outcomes
+
+
+def _resolve(batch: list[_Pending], outcome: asyncio.Future) -> None:
+    """Entrega a cada future su resultado (ignora los ya cancelados)."""
+    error = asyncio.CancelledError() if outcome.cancelled() else outcome.exception()
+    outcomes = [error] * len(batch) if error is not None else outcome.result()
+    for (_, _, future), result in zip(batch, outcomes):
+        if future.done():
+            continue
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result((result, len(batch)))
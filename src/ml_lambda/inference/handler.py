@@ -1,99 +1,362 @@
 """Handler principal de AWS Lambda."""
 
+import asyncio
 import json
+import threading
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from ..config import config
-from ..model.serializer import ModelSerializer
 from ..inference.validator import InputValidator
-from ..inference.predictor import Predictor
+from ..inference.model_source import (
+    LocalModelSource,
+    ModelSource,
+    ModelWatcher,
+    model_source_from_uri,
+)
+from ..inference.batching import MicroBatcher
+from ..inference.predictor import PredictionResult, Predictor
+from ..inference.registry import LoadedModel, ModelRegistry, load_model
+from ..inference.shadow import ShadowEvaluator
+from ..utils.exceptions import ModelNotFoundError
+from ..utils.histogram import StageLatencyRecorder
 from ..utils.logging import StructuredLogger
 
+# Cabecera con la que un cliente pide el desglose por etapas de su solicitud
+STAGE_TIMINGS_HEADER = "x-stage-timings"
+
+
+class _Invocation:
+    """Estado de una solicitud mientras se procesa."""
+
+    def __init__(self, context: Any, timings: Optional[dict[str, float]]):
+        self.context = context
+        self.request_id = context.aws_request_id if context and hasattr(context, 'aws_request_id') else "local"
+        self.timings = timings if timings is not None else {}
+        self.start_time = time.perf_counter()
+        self.stage_start = self.start_time
+        self.model_id: Optional[str] = None
+        self.features: list[float] = []
+        self.predictor: Optional[Predictor] = None
+        self.model_version: Optional[str] = None
+        self.cold_start = False
+        self.cache_hit: Optional[bool] = None
+        self.out_of_range: Optional[int] = None
+        self.batch_size: Optional[int] = None
+
+    def record_stage(self, stage: str) -> None:
+        """Anota la duración de una etapa; la siguiente empieza ahora."""
+        now = time.perf_counter()
+        self.timings[stage] = (now - self.stage_start) * 1000
+        self.stage_start = now
+
 
 class LambdaHandler:
-    """Handler para AWS Lambda."""
+    """Handler para AWS Lambda.
+
+    Con check_interval > 0 (o ML_LAMBDA_MODEL_CHECK_INTERVAL), el origen del
+    modelo se comprueba como mucho cada check_interval segundos y una versión
+    nueva se carga en segundo plano y reemplaza al Predictor sin cold start.
+
+    Las solicitudes con model_id (y opcionalmente model_version) se sirven
+    con el ModelRegistry (o el de ML_LAMBDA_MODELS_DIR) en lugar del modelo
+    por defecto.
+
+    Con un ShadowEvaluator (o ML_LAMBDA_SHADOW_MODEL_PATH), las solicitudes
+    del modelo por defecto se puntúan también con el modelo de sombra en
+    segundo plano, después de construir la respuesta.
 
-    def __init__(self):
-        self._model = None
-        self._metadata = None
-        self._predictor = None
+    La duración de cada etapa (load, parse, validate, predict, serialize) se
+    acumula en histogramas que se registran como stage_latency cada
+    ML_LAMBDA_STAGE_METRICS_INTERVAL segundos. Con la cabecera
+    X-Stage-Timings: 1 la respuesta incluye el desglose de esa solicitud en
+    Server-Timing.
+
+    handle puede llamarse desde varios hilos a la vez (el servidor HTTP lo
+    ejecuta fuera de su event loop): la carga inicial del modelo y el
+    registro EMF de cada invocación se serializan con locks.
+    """
+
+    def __init__(
+        self,
+        model_source: Optional[ModelSource] = None,
+        check_interval: Optional[float] = None,
+        registry: Optional[ModelRegistry] = None,
+        shadow: Optional[ShadowEvaluator] = None,
+    ):
+        self._loaded: Optional[LoadedModel] = None
+        self._model_source = model_source
+        self._check_interval = check_interval
+        self._watcher: Optional[ModelWatcher] = None
+        self._registry = registry
+        self._shadow = shadow
+        self._stage_latency = StageLatencyRecorder(config.stage_metrics_interval)
         self._validator = InputValidator()
-        self._logger = StructuredLogger("lambda_handler")
+        self._load_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._logger = StructuredLogger(
+            "lambda_handler", metrics_namespace=config.metrics_namespace
+        )
+
+    @property
+    def _model(self) -> Any:
+        return self._loaded.model if self._loaded is not None else None
+
+    @property
+    def _metadata(self) -> Any:
+        return self._loaded.metadata if self._loaded is not None else None
+
+    @property
+    def _predictor(self) -> Optional[Predictor]:
+        return self._loaded.predictor if self._loaded is not None else None
+
+    def warm_up(self) -> None:
+        """Carga el modelo por defecto antes de la primera solicitud."""
+        self._load_model_once()
 
     def _load_model_once(self) -> None:
         """Carga el modelo una sola vez (cold start)."""
-        if self._model is None:
-            self._logger.info("Loading model (cold start)")
-            serializer = ModelSerializer()
-            result = serializer.load(config.model_path)
-            self._model = result.model
-            self._metadata = result.metadata
-            self._predictor = Predictor(self._model, self._metadata.class_names)
-            self._logger.info("Model loaded successfully")
-
-    def handle(self, event: dict[str, Any], context: Any) -> dict[str, Any]:
+        if self._loaded is None:
+            with self._load_lock:
+                if self._loaded is None:
+                    self._load_initial_model()
+        elif self._watcher is not None:
+            self._watcher.maybe_refresh()
+
+    def _load_initial_model(self) -> None:
+        """Carga el modelo por defecto y arranca su watcher."""
+        self._logger.info("Loading model (cold start)")
+        # El origen por defecto se resuelve aquí y no en __init__: la
+        # instancia global se crea al importar el módulo
+        source = self._model_source
+        if source is None:
+            source = (
+                model_source_from_uri(config.model_uri, config.aws_region)
+                if config.model_uri
+                else LocalModelSource(config.model_path)
+            )
+        check_interval = self._check_interval
+        if check_interval is None:
+            check_interval = config.model_check_interval
+        watcher = ModelWatcher(
+            source,
+            loader=self._load_model,
+            on_swap=self._swap_model,
+            check_interval=check_interval,
+            logger=self._logger,
+        )
+        self._swap_model(watcher.load_initial(), watcher.current_etag)
+        self._watcher = watcher
+        if self._shadow is None and config.shadow_model_path is not None:
+            shadow = load_model(config.shadow_model_path)
+            self._shadow = ShadowEvaluator(shadow.predictor, logger=self._logger)
+        self._logger.info("Model loaded successfully")
+
+    def _load_model(self, path: Path) -> LoadedModel:
+        """Deserializa el modelo por defecto."""
+        return load_model(path)
+
+    def _swap_model(self, loaded: LoadedModel, etag: Optional[str]) -> None:
+        """Publica un modelo cargado con una única asignación.
+
+        Cada solicitud lee self._loaded una sola vez y toma de esa lectura el
+        Predictor y la versión, así que nunca puntúa con un modelo y reporta
+        la versión de otro.
+        """
+        self._loaded = loaded
+
+    def _get_registry(self) -> ModelRegistry:
+        """Registro de modelos, creado en el primer uso desde la configuración."""
+        if self._registry is None:
+            if config.models_dir is None:
+                raise ModelNotFoundError("Model selection is not enabled")
+            self._registry = ModelRegistry(
+                config.models_dir,
+                memory_budget_bytes=config.model_cache_mb * 1024 * 1024,
+                logger=self._logger,
+            )
+        return self._registry
+
+    def handle(
+        self,
+        event: dict[str, Any],
+        context: Any,
+        timings: Optional[dict[str, float]] = None,
+    ) -> dict[str, Any]:
         """Procesa solicitud de inferencia.
         
         Args:
             event: Evento de API Gateway
             context: Contexto de Lambda
+            timings: Si se indica, recibe la duración en ms de cada etapa
+                completada (parse, load, validate, predict, serialize)
             
         Returns:
             Respuesta HTTP con predicción o error
         """
-        request_id = context.aws_request_id if context and hasattr(context, 'aws_request_id') else "local"
-        start_time = time.perf_counter()
-        
+        invocation = _Invocation(context, timings)
         try:
-            # Cargar modelo en cold start
+            response = self._prepare(invocation, event)
+            if response is None:
+                result = invocation.predictor.predict(invocation.features)
+                response = self._complete(invocation, result)
+        except Exception as e:
+            response = self._error(invocation, e)
+        return self._finish(invocation, event, response)
+
+    async def handle_async(
+        self,
+        event: dict[str, Any],
+        context: Any,
+        batcher: MicroBatcher,
+        timings: Optional[dict[str, float]] = None,
+    ) -> dict[str, Any]:
+        """Como handle, pero la predicción se agrupa con las de otras
+        solicitudes concurrentes en el MicroBatcher (servidor de larga vida).
+
+        _prepare puede cargar modelos (disco, deserialización), así que se
+        ejecuta en un hilo para no bloquear el event loop.
+        """
+        invocation = _Invocation(context, timings)
+        try:
+            response = await asyncio.to_thread(self._prepare, invocation, event)
+            if response is None:
+                result, invocation.batch_size = await batcher.predict_batched(
+                    invocation.predictor, invocation.features
+                )
+                response = self._complete(invocation, result)
+        except Exception as e:
+            response = self._error(invocation, e)
+        return self._finish(invocation, event, response)
+
+    def _prepare(self, invocation: "_Invocation", event: dict[str, Any]) -> Optional[dict]:
+        """Parsea y valida la solicitud y elige el Predictor.
+        
+        Returns:
+            Respuesta de error si la solicitud no llega a predecirse, o None
+        """
+        # Parsear body
+        body = self._parse_body(event)
+        invocation.model_id = body.get("model_id") if isinstance(body, dict) else None
+        invocation.record_stage("parse")
+        
+        # Cargar modelo por defecto en cold start
+        if invocation.model_id is None:
+            invocation.cold_start = self._loaded is None
             self._load_model_once()
-            
-            # Parsear body
-            body = self._parse_body(event)
-            
-            # Validar entrada
-            if "features" not in body:
-                return self._error_response(400, ["Missing 'features' field in request body"])
-            
-            features = self._validator.validate_features(body["features"])
-            
-            # Realizar predicción
-            result = self._predictor.predict(features)
-            
-            # Calcular latencia
-            latency_ms = (time.perf_counter() - start_time) * 1000
-            
-            # Log estructurado
-            self._logger.info(
-                "inference_complete",
-                request_id=request_id,
-                prediction=result.prediction,
-                latency_ms=round(latency_ms, 2)
+        invocation.record_stage("load")
+        
+        # Validar entrada
+        if "features" not in body:
+            return self._error_response(400, ["Missing 'features' field in request body"])
+        
+        invocation.features, invocation.out_of_range = (
+            self._validator.validate_features_with_ranges(body["features"])
+        )
+        invocation.record_stage("validate")
+        
+        # Elegir modelo
+        if invocation.model_id is None:
+            loaded = self._loaded
+            invocation.predictor = loaded.predictor
+            invocation.model_version = loaded.metadata.version
+        else:
+            registry = self._get_registry()
+            loaded, invocation.cache_hit = registry.lookup(
+                invocation.model_id, body.get("model_version")
             )
-            
-            return self._success_response({
-                "prediction": result.prediction,
-                "class_name": result.class_name,
-                "probabilities": result.probabilities,
-                "latency_ms": round(latency_ms, 2)
-            })
-            
-        except Exception as e:
-            self._logger.error(
-                "inference_error",
-                error=str(e),
-                error_type=type(e).__name__,
-                request_id=request_id
+            invocation.predictor = loaded.predictor
+            invocation.model_version = loaded.metadata.version
+        return None
+
+    def _complete(self, invocation: "_Invocation", result: PredictionResult) -> dict[str, Any]:
+        """Construye la respuesta de una predicción realizada."""
+        invocation.record_stage("predict")
+        
+        # Calcular latencia
+        latency_ms = (time.perf_counter() - invocation.start_time) * 1000
+        
+        # Log estructurado
+        self._logger.info(
+            "inference_complete",
+            request_id=invocation.request_id,
+            prediction=result.prediction,
+            latency_ms=round(latency_ms, 2)
+        )
+        
+        response = self._success_response({
+            "prediction": result.prediction,
+            "class_name": result.class_name,
+            "probabilities": result.probabilities,
+            "latency_ms": round(latency_ms, 2)
+        })
+        invocation.record_stage("serialize")
+        
+        # Evaluación en sombra fuera del camino de la respuesta
+        if self._shadow is not None and invocation.model_id is None:
+            self._shadow.submit(invocation.features, result, invocation.context)
+        
+        return response
+
+    def _finish(
+        self, invocation: "_Invocation", event: dict[str, Any], response: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Acumula las etapas de la solicitud y, si se pidió, las devuelve."""
+        self._stage_latency.record(invocation.timings)
+        if self._logger.metrics_namespace:
+            self._emit_metrics(invocation, response["statusCode"])
+        if _wants_stage_timings(event):
+            response["headers"]["Server-Timing"] = ", ".join(
+                f"{stage};dur={duration_ms:.3f}"
+                for stage, duration_ms in invocation.timings.items()
             )
-            
-            # Determinar código de error
-            from ..utils.exceptions import InputValidationError
-            if isinstance(e, InputValidationError):
-                return self._error_response(400, [str(e)])
-            else:
-                return self._error_response(500, ["Internal server error"])
+        return response
+
+    def _emit_metrics(self, invocation: "_Invocation", status_code: int) -> None:
+        """Escribe las métricas de la invocación en un único registro EMF.
+
+        Las dimensiones solo toman valores de modelos ya resueltos: un
+        model_id arbitrario de la solicitud no crea series nuevas.
+        """
+        latency_ms = (time.perf_counter() - invocation.start_time) * 1000
+        resolved = invocation.model_version is not None
+        # El buffer de métricas del logger es compartido entre invocaciones
+        with self._metrics_lock:
+            self._logger.put_metric("Latency", round(latency_ms, 3), "Milliseconds")
+            self._logger.put_metric("ColdStart", int(invocation.cold_start), "Count")
+            if invocation.cache_hit is not None:
+                self._logger.put_metric("ModelCacheHit", int(invocation.cache_hit), "Count")
+                self._logger.put_metric("ModelCacheMiss", int(not invocation.cache_hit), "Count")
+            if invocation.out_of_range is not None:
+                self._logger.put_metric("OutOfRangeFeatures", invocation.out_of_range, "Count")
+            if invocation.batch_size is not None:
+                self._logger.put_metric("BatchSize", invocation.batch_size, "Count")
+            self._logger.set_dimensions(
+                ModelId=(invocation.model_id or "default") if resolved else "unknown",
+                ModelVersion=invocation.model_version if resolved else "unknown",
+            )
+            self._logger.flush_metrics(
+                request_id=invocation.request_id, status_code=status_code
+            )
+
+    def _error(self, invocation: "_Invocation", e: Exception) -> dict[str, Any]:
+        """Registra el error y construye la respuesta correspondiente."""
+        self._logger.error(
+            "inference_error",
+            error=str(e),
+            error_type=type(e).__name__,
+            request_id=invocation.request_id
+        )
+        
+        # Determinar código de error
+        from ..utils.exceptions import InputValidationError
+        if isinstance(e, InputValidationError):
+            return self._error_response(400, [str(e)])
+        elif isinstance(e, ModelNotFoundError) and invocation.model_id is not None:
+            return self._error_response(404, [str(e)])
+        else:
+            return self._error_response(500, ["Internal server error"])
 
     def _parse_body(self, event: dict) -> dict:
         """Parsea el body del evento.
@@ -163,6 +426,17 @@ class LambdaHandler:
         }
 
 
+def _wants_stage_timings(event: dict[str, Any]) -> bool:
+    """True si la solicitud trae X-Stage-Timings con un valor afirmativo."""
+    headers = event.get("headers") if isinstance(event, dict) else None
+    if not isinstance(headers, dict):
+        return False
+    for name, value in headers.items():
+        if name.lower() == STAGE_TIMINGS_HEADER:
+            return str(value).lower() in ("1", "true", "yes")
+    return False
+
+
 # Instancia global para reutilizar entre invocaciones
 _handler = LambdaHandler()
 
@@ -0,0 +1,200 @@
+"""Origen del modelo y recarga en caliente dentro de un contenedor."""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from ..utils.hashing import DEFAULT_BUFFER_SIZE
+from ..utils.logging import StructuredLogger
+
+T = TypeVar("T")
+
+# Directorio de descarga de modelos remotos (/tmp es lo único escribible en Lambda)
+DOWNLOAD_DIR = Path(tempfile.gettempdir()) / "ml-lambda-models"
+
+
+class ModelSource(ABC):
+    """Puntero a la versión actual de un modelo."""
+
+    @abstractmethod
+    def etag(self) -> Optional[str]:
+        """Identificador barato de la versión actual, o None si no existe."""
+
+    @abstractmethod
+    def fetch(self, etag: Optional[str]) -> Path:
+        """Ruta local del modelo con ese etag (descargándolo si hace falta)."""
+
+
+class LocalModelSource(ModelSource):
+    """Modelo en el sistema de archivos; el etag es mtime y tamaño.
+
+    Para publicar una versión nueva sin que se lea a medio escribir, debe
+    escribirse en un archivo temporal y renombrarse sobre path.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def etag(self) -> Optional[str]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def fetch(self, etag: Optional[str]) -> Path:
+        return self.path
+
+
+class S3ModelSource(ModelSource):
+    """Modelo en S3; el etag es el ETag del objeto.
+
+    La descarga exige el mismo ETag (IfMatch), así que un objeto reemplazado
+    entre la consulta y la descarga hace fallar la recarga en vez de cargar
+    una versión distinta de la anunciada.
+    """
+
+    def __init__(self, bucket: str, key: str, region: Optional[str] = None):
+        self.bucket = bucket
+        self.key = key
+        self.region = region
+        self._client: Any = None
+
+    @classmethod
+    def from_uri(cls, uri: str, region: Optional[str] = None) -> "S3ModelSource":
+        """Crea el origen a partir de una URI s3://bucket/key."""
+        bucket, _, key = uri[len("s3://") :].partition("/")
+        if not bucket or not key:
+            raise ValueError(f"Invalid S3 URI: {uri}")
+        return cls(bucket, key, region)
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("s3", region_name=self.region)
+        return self._client
+
+    def etag(self) -> Optional[str]:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self._get_client().head_object(Bucket=self.bucket, Key=self.key)
+        except ClientError as error:
+            if error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") == 404:
+                return None
+            raise
+        return response["ETag"].strip('"')
+
+    def fetch(self, etag: Optional[str]) -> Path:
+        DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        key_hash = hashlib.sha256(f"{self.bucket}/{self.key}".encode()).hexdigest()[:16]
+        destination = DOWNLOAD_DIR / f"{key_hash}-{etag or 'latest'}.joblib"
+        if destination.exists():
+            return destination
+
+        conditions = {"IfMatch": etag} if etag is not None else {}
+        response = self._get_client().get_object(Bucket=self.bucket, Key=self.key, **conditions)
+        fd, partial = tempfile.mkstemp(dir=DOWNLOAD_DIR, suffix=".partial")
+        try:
+            with os.fdopen(fd, "wb") as model_file:
+                for chunk in response["Body"].iter_chunks(DEFAULT_BUFFER_SIZE):
+                    model_file.write(chunk)
+            os.replace(partial, destination)
+        except BaseException:
+            Path(partial).unlink(missing_ok=True)
+            raise
+
+        # Solo se conserva la versión recién descargada (/tmp es limitado)
+        for previous in DOWNLOAD_DIR.glob(f"{key_hash}-*.joblib"):
+            if previous != destination:
+                previous.unlink(missing_ok=True)
+        return destination
+
+
+def model_source_from_uri(uri: str, region: Optional[str] = None) -> ModelSource:
+    """ModelSource para una ruta local o una URI s3://."""
+    if uri.startswith("s3://"):
+        return S3ModelSource.from_uri(uri, region)
+    return LocalModelSource(Path(uri))
+
+
+class ModelWatcher(Generic[T]):
+    """Comprueba periódicamente el origen y recarga el modelo en segundo plano.
+
+    maybe_refresh() es barato y se llama en cada solicitud: como mucho cada
+    check_interval segundos lanza un hilo que consulta el etag y, si cambió,
+    descarga y carga la versión nueva y la entrega a on_swap. Mientras tanto
+    las solicitudes siguen usando el modelo anterior. Si la recarga falla se
+    registra el error y se reintenta en la siguiente comprobación.
+
+    Lambda congela el contenedor entre invocaciones, así que el hilo solo
+    avanza mientras hay solicitudes en curso.
+    """
+
+    def __init__(
+        self,
+        source: ModelSource,
+        loader: Callable[[Path], T],
+        on_swap: Callable[[T, str], None],
+        check_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+        logger: Optional[StructuredLogger] = None,
+    ):
+        self.source = source
+        self.check_interval = check_interval
+        self.current_etag: Optional[str] = None
+        self._loader = loader
+        self._on_swap = on_swap
+        self._clock = clock
+        self._logger = logger or StructuredLogger("model_watcher")
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._next_check = 0.0
+
+    def load_initial(self) -> T:
+        """Carga el modelo actual de forma síncrona (cold start)."""
+        etag = self.source.etag()
+        loaded = self._loader(self.source.fetch(etag))
+        self.current_etag = etag
+        self._next_check = self._clock() + self.check_interval
+        return loaded
+
+    def maybe_refresh(self) -> None:
+        """Lanza una comprobación en segundo plano si toca."""
+        if self.check_interval <= 0 or self._clock() < self._next_check:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._next_check = self._clock() + self.check_interval
+            self._thread = threading.Thread(
+                target=self._refresh, name="model-watcher", daemon=True
+            )
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Espera a que termine la comprobación en curso, si la hay."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _refresh(self) -> None:
+        try:
+            etag = self.source.etag()
+            if etag is None or etag == self.current_etag:
+                return
+            loaded = self._loader(self.source.fetch(etag))
+        except Exception as error:
+            self._logger.error(
+                "model_refresh_failed", error=str(error), error_type=type(error).__name__
+            )
+            return
+        self._on_swap(loaded, etag)
+        self.current_etag = etag
+        self._logger.info("model_swapped", etag=etag)
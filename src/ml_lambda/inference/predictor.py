@@ -3,6 +3,8 @@
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
+
 
 @dataclass
 class PredictionResult:
@@ -43,3 +45,24 @@ class Predictor:
             class_name=class_name,
             probabilities=probabilities
         )
+
+    def score_batch(self, rows: list[list[float]]) -> tuple[np.ndarray, np.ndarray]:
+        """Predicciones y probabilidades de varias filas en una sola llamada.
+
+        Returns:
+            (predicciones de forma (n,), probabilidades de forma (n, n_clases))
+        """
+        X = np.asarray(rows, dtype=float)
+        return self._model.predict(X).astype(int), self._model.predict_proba(X)
+
+    def predict_batch(self, rows: list[list[float]]) -> list[PredictionResult]:
+        """Como predict, para varias filas con una sola llamada al modelo."""
+        predictions, probabilities = self.score_batch(rows)
+        return [
+            PredictionResult(
+                prediction=int(prediction),
+                class_name=self._class_names[prediction],
+                probabilities=row_probabilities.tolist(),
+            )
+            for prediction, row_probabilities in zip(predictions, probabilities)
+        ]
@@ -0,0 +1,219 @@
+"""Registro de modelos con caché LRU limitada por memoria."""
+
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ..config import config
+from ..model.fusion import fuse_scaler
+from ..model.serializer import ModelMetadata, ModelSerializer
+from ..utils.exceptions import InputValidationError, ModelNotFoundError
+from ..utils.logging import StructuredLogger
+from .predictor import Predictor
+
+# Identificadores de modelo y versión: un componente de ruta seguro
+_IDENTIFIER = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+
+# Archivo con la versión por defecto de un modelo
+LATEST_FILENAME = "LATEST"
+
+# Segundos durante los que se reutiliza una resolución (id, versión) -> ruta
+RESOLVE_TTL_SECONDS = 5.0
+
+
+@dataclass
+class LoadedModel:
+    """Modelo deserializado listo para predecir."""
+
+    model: Any
+    metadata: ModelMetadata
+    predictor: Predictor
+    size_bytes: int
+
+
+def estimate_memory_bytes(obj: Any) -> int:
+    """Estima la memoria que ocupa un objeto (ej: un modelo de sklearn).
+
+    Serializa con pickle protocolo 5 enviando los buffers de numpy fuera de
+    banda: los arrays, que dominan el tamaño de un modelo, se cuentan por su
+    nbytes sin copiarse, y el resto por el tamaño de su serialización.
+    """
+    buffer_bytes = 0
+
+    def count_buffer(buffer: pickle.PickleBuffer) -> None:
+        nonlocal buffer_bytes
+        buffer_bytes += buffer.raw().nbytes
+
+    return len(pickle.dumps(obj, protocol=5, buffer_callback=count_buffer)) + buffer_bytes
+
+
+def load_model(path: Path) -> LoadedModel:
+    """Deserializa un modelo con ModelSerializer y construye su Predictor."""
+    result = ModelSerializer().load(path)
+    model = result.model
+    if result.scaler is not None:
+        # Integrar el scaler en el modelo: sin transformación por request
+        model = fuse_scaler(result.model, result.scaler)
+    return LoadedModel(
+        model=model,
+        metadata=result.metadata,
+        predictor=Predictor(model, result.metadata.class_names),
+        size_bytes=estimate_memory_bytes(model),
+    )
+
+
+class ModelRegistry:
+    """Resuelve modelos por id y versión y mantiene los cargados en una LRU.
+
+    Estructura de models_dir:
+
+        <model_id>/<version>/model.joblib
+        <model_id>/LATEST       (versión usada si la solicitud no indica una)
+
+    Los modelos cargados se conservan mientras su memoria estimada total no
+    supere memory_budget_bytes; al cargar uno nuevo se descartan los usados
+    hace más tiempo. Un modelo mayor que el presupuesto se carga igualmente,
+    pero solo se conserva mientras sea el único.
+
+    Las cargas se hacen fuera del lock: mientras se deserializa un modelo,
+    las solicitudes de los ya cargados siguen sirviéndose, y las del mismo
+    modelo esperan a esa carga en lugar de repetirla. La resolución de
+    LATEST y de la ruta se reutiliza durante resolve_ttl segundos, así que
+    las solicitudes en caliente no tocan el sistema de archivos; un cambio
+    de LATEST se aplica como mucho resolve_ttl segundos después.
+    """
+
+    def __init__(
+        self,
+        models_dir: Path,
+        memory_budget_bytes: int,
+        loader: Callable[[Path], LoadedModel] = load_model,
+        logger: Optional[StructuredLogger] = None,
+        resolve_ttl: float = RESOLVE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.models_dir = Path(models_dir)
+        self.memory_budget_bytes = memory_budget_bytes
+        self.resolve_ttl = resolve_ttl
+        self._loader = loader
+        self._logger = logger or StructuredLogger("model_registry")
+        self._clock = clock
+        self._cache: OrderedDict[tuple[str, str], LoadedModel] = OrderedDict()
+        self._loading: dict[tuple[str, str], Future] = {}
+        self._resolved: dict[tuple[str, Optional[str]], tuple[str, Path, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def loaded_bytes(self) -> int:
+        """Memoria estimada de los modelos cargados."""
+        return sum(loaded.size_bytes for loaded in self._cache.values())
+
+    @property
+    def loaded_models(self) -> list[tuple[str, str]]:
+        """(model_id, versión) cargados, del menos al más usado recientemente."""
+        return list(self._cache)
+
+    def resolve(self, model_id: str, version: Optional[str] = None) -> tuple[str, Path]:
+        """Versión concreta y ruta del modelo.
+
+        Raises:
+            InputValidationError: Si el id o la versión no son válidos
+            ModelNotFoundError: Si el modelo o la versión no existen
+        """
+        for value in (model_id, version):
+            if value is not None and not (isinstance(value, str) and _IDENTIFIER.match(value)):
+                raise InputValidationError(f"Invalid model identifier: {value!r}")
+
+        now = self._clock()
+        cached = self._resolved.get((model_id, version))
+        if cached is not None and now < cached[2]:
+            return cached[0], cached[1]
+
+        requested_version = version
+        model_dir = self.models_dir / model_id
+        if version is None:
+            latest = model_dir / LATEST_FILENAME
+            if not latest.is_file():
+                raise ModelNotFoundError(f"Model not found: {model_id}")
+            version = latest.read_text().strip()
+            if not _IDENTIFIER.match(version):
+                raise ModelNotFoundError(f"Invalid LATEST version for model {model_id}")
+
+        path = model_dir / version / config.model_filename
+        if not path.is_file():
+            raise ModelNotFoundError(f"Model not found: {model_id}:{version}")
+        if self.resolve_ttl > 0:
+            self._resolved[(model_id, requested_version)] = (
+                version,
+                path,
+                now + self.resolve_ttl,
+            )
+        return version, path
+
+    def get(self, model_id: str, version: Optional[str] = None) -> LoadedModel:
+        """Modelo cargado, deserializándolo si no está en la caché.
+
+        Solicitudes simultáneas del mismo modelo lo cargan una sola vez.
+        """
+        return self.lookup(model_id, version)[0]
+
+    def lookup(
+        self, model_id: str, version: Optional[str] = None
+    ) -> tuple[LoadedModel, bool]:
+        """Como get, indicando además si el modelo ya estaba en la caché."""
+        version, path = self.resolve(model_id, version)
+        key = (model_id, version)
+        with self._lock:
+            loaded = self._cache.get(key)
+            if loaded is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return loaded, True
+            pending = self._loading.get(key)
+            if pending is None:
+                self.misses += 1
+                future: Future = Future()
+                self._loading[key] = future
+
+        if pending is not None:
+            # Otra solicitud ya está cargando este modelo
+            return pending.result(), False
+
+        try:
+            loaded = self._loader(path)
+        except BaseException as error:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(error)
+            raise
+        with self._lock:
+            del self._loading[key]
+            self._cache[key] = loaded
+            self._evict()
+        future.set_result(loaded)
+        return loaded, False
+
+    def _evict(self) -> None:
+        """Descarta modelos LRU hasta respetar el presupuesto.
+
+        El modelo recién cargado está al final de la LRU y nunca se descarta.
+        """
+        while self.loaded_bytes > self.memory_budget_bytes and len(self._cache) > 1:
+            key, evicted = self._cache.popitem(last=False)
+            self.evictions += 1
+            self._logger.info(
+                "model_evicted",
+                model_id=key[0],
+                version=key[1],
+                size_bytes=evicted.size_bytes,
+                loaded_bytes=self.loaded_bytes,
+            )
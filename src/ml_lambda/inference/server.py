@@ -0,0 +1,351 @@
+"""Servidor HTTP que emula API Gateway delante de LambdaHandler.
+
+Traduce cada solicitud HTTP a un evento proxy de API Gateway (formato de
+payload 1.0, el de la integración AWS_PROXY de infrastructure/main.tf) y la
+respuesta del handler a HTTP. Sirve para probar lambda_handler en local y
+como destino de despliegue fuera de Lambda: varios procesos worker
+comparten el socket y cada uno atiende conexiones keep-alive concurrentes
+con asyncio.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import signal
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from ..config import config
+from ..utils.logging import StructuredLogger
+from .batching import MicroBatcher
+from .handler import LambdaHandler
+
+# Rutas de la API (infrastructure/main.tf) servidas por el handler
+PREDICT_ROUTE = ("POST", "/predict")
+
+# Ruta de salud respondida por el propio servidor (balanceadores on-prem)
+HEALTH_ROUTE = ("GET", "/health")
+
+# Cabeceras de la configuración CORS de la API
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "POST, GET, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+# Límites de la solicitud (API Gateway admite payloads de hasta 10 MB)
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_HEADERS = 100
+
+# Segundos que una conexión keep-alive puede estar inactiva
+KEEP_ALIVE_TIMEOUT = 5.0
+
+
+class HTTPError(Exception):
+    """Solicitud HTTP que el servidor rechaza sin llegar al handler."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class HTTPRequest:
+    """Solicitud HTTP/1.x ya leída del socket."""
+
+    method: str
+    target: str
+    version: str
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    @property
+    def path(self) -> str:
+        return urlsplit(self.target).path
+
+    @property
+    def query(self) -> dict[str, str]:
+        return dict(parse_qsl(urlsplit(self.target).query, keep_blank_values=True))
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+async def _read_line(
+    reader: asyncio.StreamReader, status: HTTPStatus, message: str
+) -> bytes:
+    """Lee una línea; una más larga que el límite del reader es HTTPError."""
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        # readline convierte LimitOverrunError en ValueError
+        raise HTTPError(status, message)
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[HTTPRequest]:
+    """Lee una solicitud; retorna None si el cliente cerró la conexión.
+
+    Raises:
+        HTTPError: Si la solicitud está mal formada o no se admite
+    """
+    request_line = await _read_line(reader, HTTPStatus.BAD_REQUEST, "Request line too long")
+    if not request_line:
+        return None
+    parts = request_line.decode("latin-1").split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    method, target, version = parts
+
+    headers: dict[str, str] = {}
+    while True:
+        line = await _read_line(
+            reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Header line too long"
+        )
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+        name, separator, value = line.decode("latin-1").partition(":")
+        if not separator:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed header")
+        headers[name.strip().lower()] = value.strip()
+
+    if "transfer-encoding" in headers:
+        raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Transfer-Encoding is not supported")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length < 0 or length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return HTTPRequest(method.upper(), target, version, headers, body)
+
+
+def to_api_gateway_event(
+    request: HTTPRequest, request_id: str, source_ip: str = "127.0.0.1"
+) -> dict[str, Any]:
+    """Evento proxy de API Gateway (payload 1.0) para una solicitud HTTP."""
+    body = request.body.decode("utf-8", errors="replace") if request.body else None
+    return {
+        "resource": request.path,
+        "path": request.path,
+        "httpMethod": request.method,
+        "headers": dict(request.headers),
+        "queryStringParameters": request.query or None,
+        "pathParameters": None,
+        "requestContext": {
+            "requestId": request_id,
+            "httpMethod": request.method,
+            "path": request.path,
+            "resourcePath": request.path,
+            "stage": "$default",
+            "requestTimeEpoch": int(time.time() * 1000),
+            "identity": {"sourceIp": source_ip},
+        },
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+class LambdaContext:
+    """Contexto de invocación equivalente al de Lambda."""
+
+    def __init__(self, request_id: str, timeout_seconds: float):
+        self.aws_request_id = request_id
+        self.function_name = "ml-lambda-local"
+        self.memory_limit_in_mb = config.lambda_memory
+        self._deadline = time.monotonic() + timeout_seconds
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+class InferenceServer:
+    """Atiende conexiones HTTP y las despacha a un LambdaHandler.
+
+    Cada solicitud se registra como http_request con su latencia total y la
+    de cada etapa del handler (parse_ms, load_ms, validate_ms, predict_ms,
+    serialize_ms).
+
+    Con un MicroBatcher, las predicciones de solicitudes concurrentes se
+    agrupan (handle_async); sin él, cada solicitud predice por separado en
+    un hilo del executor por defecto del loop. En ambos casos la carga de
+    modelos y la inferencia se hacen fuera del event loop, que sigue
+    aceptando y leyendo otras conexiones mientras tanto.
+    """
+
+    def __init__(
+        self,
+        handler: Optional[LambdaHandler] = None,
+        timeout_seconds: float = config.lambda_timeout,
+        logger: Optional[StructuredLogger] = None,
+        batcher: Optional[MicroBatcher] = None,
+    ):
+        self.handler = handler or LambdaHandler()
+        self.batcher = batcher
+        self.timeout_seconds = timeout_seconds
+        self._logger = logger or StructuredLogger("inference_server")
+        self._connections: set[asyncio.Task] = set()
+
+    async def serve(self, sock: socket.socket, stop: Optional[asyncio.Event] = None) -> None:
+        """Atiende el socket (ya en escucha) hasta que se active stop.
+
+        Al detenerse deja de aceptar conexiones y cierra las keep-alive
+        abiertas.
+        """
+        stop = stop or asyncio.Event()
+        server = await asyncio.start_server(self.handle_connection, sock=sock)
+        async with server:
+            await stop.wait()
+        connections = list(self._connections)
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Atiende las solicitudes de una conexión hasta que se cierre."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        peer = writer.get_extra_info("peername")
+        source_ip = peer[0] if peer else "127.0.0.1"
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except HTTPError as error:
+                    self._write(writer, error.status, {}, {"message": str(error)}, False)
+                    break
+                if request is None:
+                    break
+                status, headers, body = await self.dispatch(request, source_ip)
+                self._write(writer, status, headers, body, request.keep_alive)
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def dispatch(self, request: HTTPRequest, source_ip: str = "127.0.0.1") -> tuple:
+        """Respuesta (status, cabeceras, body) a una solicitud."""
+        route = (request.method, request.path)
+        if request.method == "OPTIONS":
+            return HTTPStatus.NO_CONTENT, dict(CORS_HEADERS), b""
+        if route == HEALTH_ROUTE:
+            return HTTPStatus.OK, {"Content-Type": "application/json"}, {"status": "ok"}
+        if route != PREDICT_ROUTE:
+            status = (
+                HTTPStatus.METHOD_NOT_ALLOWED
+                if request.path == PREDICT_ROUTE[1]
+                else HTTPStatus.NOT_FOUND
+            )
+            return status, {"Content-Type": "application/json"}, {"message": status.phrase}
+
+        request_id = str(uuid.uuid4())
+        event = to_api_gateway_event(request, request_id, source_ip)
+        context = LambdaContext(request_id, self.timeout_seconds)
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        if self.batcher is None:
+            response = await asyncio.to_thread(self.handler.handle, event, context, timings)
+        else:
+            response = await self.handler.handle_async(event, context, self.batcher, timings)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        self._logger.info(
+            "http_request",
+            request_id=request_id,
+            method=request.method,
+            path=request.path,
+            status=response["statusCode"],
+            latency_ms=round(latency_ms, 3),
+            **{f"{stage}_ms": round(ms, 3) for stage, ms in timings.items()},
+        )
+        return (
+            HTTPStatus(response["statusCode"]),
+            response.get("headers", {}),
+            response.get("body", "").encode("utf-8"),
+        )
+
+    @staticmethod
+    def _write(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        headers: dict[str, str],
+        body: Any,
+        keep_alive: bool,
+    ) -> None:
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Socket en escucha compartible entre procesos worker."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    sock.setblocking(False)
+    return sock
+
+
+def _run_worker(server: InferenceServer, sock: socket.socket) -> None:
+    """Bucle de un worker; SIGTERM y SIGINT lo detienen ordenadamente."""
+
+    async def main() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop.set)
+        await server.serve(sock, stop)
+
+    asyncio.run(main())
+
+
+def run(server: InferenceServer, sock: socket.socket, workers: int = 1) -> None:
+    """Atiende el socket con uno o varios procesos worker.
+
+    El modelo se carga antes de crear los workers, así que comparten sus
+    páginas de memoria (copy-on-write) y ninguno paga el cold start.
+    """
+    server.handler.warm_up()
+    if workers <= 1:
+        _run_worker(server, sock)
+        return
+
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_run_worker, args=(server, sock), name=f"inference-worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def stop_workers(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+    for process in processes:
+        process.join()
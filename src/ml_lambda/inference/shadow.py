@@ -0,0 +1,142 @@
+"""Evaluación en sombra de un modelo candidato con el tráfico real."""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from ..utils.logging import StructuredLogger
+from .predictor import PredictionResult, Predictor
+
+
+@dataclass
+class ShadowStats:
+    """Comparación acumulada entre el modelo principal y el de sombra."""
+
+    samples: int = 0
+    agreements: int = 0
+    prob_delta_sum: float = 0.0
+    max_prob_delta: float = 0.0
+
+    @property
+    def agreement_rate(self) -> float:
+        return self.agreements / self.samples if self.samples else 0.0
+
+    @property
+    def mean_prob_delta(self) -> float:
+        """Media de la diferencia absoluta máxima de probabilidad por solicitud."""
+        return self.prob_delta_sum / self.samples if self.samples else 0.0
+
+    def add(
+        self,
+        primary_predictions: np.ndarray,
+        shadow_predictions: np.ndarray,
+        primary_probabilities: np.ndarray,
+        shadow_probabilities: np.ndarray,
+    ) -> None:
+        deltas = np.abs(primary_probabilities - shadow_probabilities).max(axis=1)
+        self.samples += len(deltas)
+        self.agreements += int((primary_predictions == shadow_predictions).sum())
+        self.prob_delta_sum += float(deltas.sum())
+        self.max_prob_delta = max(self.max_prob_delta, float(deltas.max()))
+
+
+class ShadowEvaluator:
+    """Puntúa con un Predictor de sombra las solicitudes ya respondidas.
+
+    submit() solo encola las features y el resultado principal; cuando hay
+    batch_size pendientes, un hilo en segundo plano los puntúa con una sola
+    llamada al modelo de sombra. Cada log_every muestras se registra
+    shadow_evaluation con la tasa de acuerdo y las diferencias de
+    probabilidad de esa ventana, nunca una línea por solicitud.
+
+    Lambda congela el contenedor al terminar la invocación, así que un lote
+    solo se lanza si quedan al menos min_remaining_ms del tiempo de la
+    invocación; si no, espera a la siguiente. Con max_pending muestras
+    pendientes las nuevas se descartan (dropped).
+    """
+
+    def __init__(
+        self,
+        predictor: Predictor,
+        batch_size: int = 32,
+        log_every: int = 500,
+        max_pending: int = 1024,
+        min_remaining_ms: int = 500,
+        logger: Optional[StructuredLogger] = None,
+    ):
+        self.predictor = predictor
+        self.batch_size = batch_size
+        self.log_every = log_every
+        self.max_pending = max_pending
+        self.min_remaining_ms = min_remaining_ms
+        self.stats = ShadowStats()
+        self.dropped = 0
+        self.failures = 0
+        self._window = ShadowStats()
+        self._pending: list[tuple[list[float], PredictionResult]] = []
+        self._logger = logger or StructuredLogger("shadow_evaluator")
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, features: list[float], result: PredictionResult, context: Any = None) -> None:
+        """Encola una solicitud respondida por el modelo principal."""
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending.append((features, result))
+            if len(self._pending) < self.batch_size or not self._has_budget(context):
+                return
+            if self._thread is not None and self._thread.is_alive():
+                return
+            batch, self._pending = self._pending, []
+            self._thread = threading.Thread(
+                target=self._score, args=(batch,), name="shadow-evaluator", daemon=True
+            )
+            self._thread.start()
+
+    def flush(self) -> None:
+        """Puntúa de forma síncrona las muestras pendientes."""
+        self.wait()
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._score(batch)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Espera a que termine el lote en curso, si lo hay."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _has_budget(self, context: Any) -> bool:
+        if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+            return True
+        return context.get_remaining_time_in_millis() >= self.min_remaining_ms
+
+    def _score(self, batch: list[tuple[list[float], PredictionResult]]) -> None:
+        try:
+            predictions, probabilities = self.predictor.score_batch([row for row, _ in batch])
+            primary_predictions = np.array([result.prediction for _, result in batch])
+            primary_probabilities = np.array([result.probabilities for _, result in batch])
+            self.stats.add(primary_predictions, predictions, primary_probabilities, probabilities)
+            self._window.add(primary_predictions, predictions, primary_probabilities, probabilities)
+        except Exception as error:
+            self.failures += 1
+            self._logger.error(
+                "shadow_evaluation_failed", error=str(error), error_type=type(error).__name__
+            )
+            return
+
+        if self._window.samples >= self.log_every:
+            window, self._window = self._window, ShadowStats()
+            self._logger.info(
+                "shadow_evaluation",
+                samples=window.samples,
+                agreement_rate=round(window.agreement_rate, 4),
+                mean_prob_delta=round(window.mean_prob_delta, 4),
+                max_prob_delta=round(window.max_prob_delta, 4),
+                dropped=self.dropped,
+            )
@@ -32,6 +32,16 @@ class InputValidator:
         Returns:
             Lista de 4 floats validados
 
+        Raises:
+            InputValidationError: Si la entrada es inválida
+        """
+        return InputValidator.validate_features_with_ranges(features)[0]
+
+    @staticmethod
+    def validate_features_with_ranges(features: Any) -> tuple[list[float], int]:
+        """Como validate_features, pero retorna también cuántas features
+        quedan fuera de los rangos típicos de Iris.
+
         Raises:
             InputValidationError: Si la entrada es inválida
         """
@@ -65,22 +75,27 @@ class InputValidator:
             validated.append(numeric_value)
 
         # Validar rangos (warnings, no errores)
-        InputValidator._check_ranges(validated)
+        out_of_range = InputValidator._check_ranges(validated)
 
-        return validated
+        return validated, out_of_range
 
     @staticmethod
-    def _check_ranges(features: list[float]) -> None:
+    def _check_ranges(features: list[float]) -> int:
         """Verifica si features están en rangos típicos de Iris.
 
         Args:
             features: Lista de 4 features validados
+
+        Returns:
+            Número de features fuera de rango
         """
         feature_names = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
 
+        out_of_range = 0
         for i, (name, value) in enumerate(zip(feature_names, features)):
             min_val, max_val = IRIS_RANGES[name]
             if not (min_val <= value <= max_val):
+                out_of_range += 1
                 logger.warning(
                     f"Feature '{name}' fuera de rango típico",
                     extra={
@@ -90,6 +105,7 @@ class InputValidator:
                         "expected_range": [min_val, max_val],
                     },
                 )
+        return out_of_range
 
     @staticmethod
     def validate_body_size(body: str) -> None:
@@ -1,5 +1,6 @@
 """Módulo de serialización de modelos."""
 
 from .serializer import ModelSerializer, ModelMetadata, SerializedModel
+from .fusion import ScaledModel, fuse_scaler
 
-__all__ = ["ModelSerializer", "ModelMetadata", "SerializedModel"]
+__all__ = ["ModelSerializer", "ModelMetadata", "SerializedModel", "ScaledModel", "fuse_scaler"]
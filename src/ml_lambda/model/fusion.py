@@ -0,0 +1,146 @@
+"""Fusión del preprocesamiento en el modelo para el path de inferencia."""
+
+import copy
+from typing import Any
+
+import numpy as np
+
+# Máximo de pasos de un ulp al ajustar umbrales fusionados
+_MAX_ULP_STEPS = 16
+
+# Dígitos significativos que bastan para identificar cualquier float32
+_FLOAT32_DIGITS = 9
+
+
+class ScaledModel:
+    """Aplica el scaler antes de delegar en el modelo.
+
+    Fallback para modelos cuyo tipo no admite fusión: mantiene la
+    transformación por request pero garantiza que el modelo recibe las
+    features en la escala con la que fue entrenado.
+    """
+
+    def __init__(self, model: Any, scaler: Any):
+        self.model = model
+        self.scaler = scaler
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Predice clases sobre features en unidades originales."""
+        return self.model.predict(self.scaler.transform(X))
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Predice probabilidades sobre features en unidades originales."""
+        return self.model.predict_proba(self.scaler.transform(X))
+
+    @property
+    def classes_(self) -> np.ndarray:
+        """Clases del modelo subyacente."""
+        return self.model.classes_
+
+
+def fuse_scaler(model: Any, scaler: Any) -> Any:
+    """Integra un StandardScaler ajustado en los parámetros del modelo.
+
+    El modelo resultante acepta features en unidades originales y produce
+    las mismas predicciones que model(scaler.transform(X)), sin transformar
+    cada request:
+
+    - Árboles y ensembles (RandomForest, DecisionTree): cada umbral t sobre
+      la feature f se reexpresa como t * scale_f + mean_f.
+    - Modelos lineales (LogisticRegression): w' = w / scale,
+      b' = b - w' · mean.
+
+    Para otros tipos de modelo se retorna un ScaledModel.
+
+    Args:
+        model: Modelo entrenado sobre features escaladas
+        scaler: StandardScaler ajustado con los datos de entrenamiento
+
+    Returns:
+        Copia del modelo que opera sobre features sin escalar
+    """
+    n_features = scaler.n_features_in_
+    mean = np.asarray(scaler.mean_) if scaler.with_mean else np.zeros(n_features)
+    scale = np.asarray(scaler.scale_) if scaler.with_std else np.ones(n_features)
+
+    if hasattr(model, "estimators_") and all(
+        hasattr(estimator, "tree_") for estimator in model.estimators_
+    ):
+        fused = copy.deepcopy(model)
+        for estimator in fused.estimators_:
+            _fuse_tree(estimator.tree_, mean, scale)
+        return fused
+
+    if hasattr(model, "tree_"):
+        fused = copy.deepcopy(model)
+        _fuse_tree(fused.tree_, mean, scale)
+        return fused
+
+    if hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        fused = copy.deepcopy(model)
+        fused.coef_ = model.coef_ / scale
+        fused.intercept_ = model.intercept_ - fused.coef_ @ mean
+        return fused
+
+    return ScaledModel(model, scaler)
+
+
+def _fuse_tree(tree: Any, mean: np.ndarray, scale: np.ndarray) -> None:
+    """Reexpresa en unidades originales los umbrales de un árbol (in-place)."""
+    split_nodes = tree.feature >= 0
+    features = tree.feature[split_nodes]
+    scaled_thresholds = tree.threshold[split_nodes]
+    node_mean = mean[features]
+    node_scale = scale[features]
+
+    def goes_left(raw: np.ndarray) -> np.ndarray:
+        # Reproduce el path original para el decimal más corto que redondea a
+        # cada float32 (ej: 1.6): escalar en float64 y comparar en float32.
+        scaled = (_shortest_decimal(raw) - node_mean) / node_scale
+        return scaled.astype(np.float32) <= scaled_thresholds
+
+    # Los árboles comparan features en float32, así que el umbral fusionado es
+    # el mayor float32 en unidades originales que sigue yendo a la izquierda.
+    thresholds = (scaled_thresholds * node_scale + node_mean).astype(np.float32)
+    for _ in range(_MAX_ULP_STEPS):
+        outside = ~goes_left(thresholds)
+        if not outside.any():
+            break
+        thresholds[outside] = np.nextafter(thresholds[outside], np.float32(-np.inf))
+    for _ in range(_MAX_ULP_STEPS):
+        following = np.nextafter(thresholds, np.float32(np.inf))
+        inside = goes_left(following)
+        if not inside.any():
+            break
+        thresholds[inside] = following[inside]
+
+    tree.threshold[split_nodes] = thresholds.astype(np.float64)
+
+
+def _shortest_decimal(values: np.ndarray) -> np.ndarray:
+    """Decimal con menos dígitos significativos que redondea a cada float32.
+
+    Es el valor que llega en un request JSON para ese float32. Se prueba con
+    1 a 9 dígitos significativos; con 9 cualquier float32 queda representado.
+    """
+    exact = values.astype(np.float64)
+    result = exact.copy()
+    pending = np.isfinite(exact) & (exact != 0)
+    magnitude = np.abs(exact, where=pending, out=np.ones_like(exact))
+    exponent = np.floor(np.log10(magnitude))
+    for digits in range(1, _FLOAT32_DIGITS + 1):
+        # Entero de dígitos escalado por una potencia de 10 exacta, para que
+        # la división o el producto den el float64 más cercano al decimal
+        decimals = digits - 1 - exponent
+        power = 10.0 ** np.abs(decimals)
+        candidate = np.where(
+            decimals >= 0,
+            np.round(exact * power) / power,
+            np.round(exact / power) * power,
+        )
+        found = pending & (candidate.astype(np.float32) == values)
+        result[found] = candidate[found]
+        pending &= ~found
+        if not pending.any():
+            break
+    return result
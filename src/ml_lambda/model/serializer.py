@@ -1,10 +1,9 @@
 """Serialización y deserialización de modelos ML."""
 
-import hashlib
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 import joblib
 
@@ -12,6 +11,7 @@ from ..utils.exceptions import (
     ModelCorruptedError,
     ModelNotFoundError,
 )
+from ..utils.hashing import DEFAULT_BUFFER_SIZE, HashingWriter, compute_file_hash
 
 
 @dataclass
@@ -58,10 +58,11 @@ class ModelMetadata:
 
 @dataclass
 class SerializedModel:
-    """Modelo serializado con metadatos."""
+    """Modelo serializado con metadatos y preprocesamiento."""
 
     model: Any
     metadata: ModelMetadata
+    scaler: Optional[Any] = None
 
 
 class ModelSerializer:
@@ -71,13 +72,21 @@ class ModelSerializer:
     incluyendo validación de integridad mediante hash SHA256.
     """
 
-    def save(self, model: Any, metadata: ModelMetadata, path: Path) -> str:
+    def save(
+        self,
+        model: Any,
+        metadata: ModelMetadata,
+        path: Path,
+        scaler: Optional[Any] = None,
+    ) -> str:
         """Guarda modelo con metadatos usando joblib.
 
         Args:
             model: Modelo entrenado a serializar
             metadata: Metadatos del modelo
             path: Ruta donde guardar el archivo
+            scaler: Scaler ajustado con el que se transformaron los datos de
+                entrenamiento (None si el modelo usa features sin escalar)
 
         Returns:
             Hash SHA256 del archivo guardado
@@ -90,12 +99,15 @@ class ModelSerializer:
             "model": model,
             "metadata": metadata.to_dict(),
         }
+        if scaler is not None:
+            serialized_data["scaler"] = scaler
 
-        # Guardar con joblib
-        joblib.dump(serialized_data, path)
+        # Guardar con joblib calculando el hash SHA256 mientras se escribe
+        with path.open("wb", buffering=DEFAULT_BUFFER_SIZE) as model_file:
+            writer = HashingWriter(model_file)
+            joblib.dump(serialized_data, writer)
 
-        # Calcular y retornar hash SHA256
-        return self._compute_hash(path)
+        return writer.hexdigest()
 
     def load(self, path: Path) -> SerializedModel:
         """Carga modelo con validación de integridad.
@@ -135,6 +147,7 @@ class ModelSerializer:
             return SerializedModel(
                 model=serialized_data["model"],
                 metadata=metadata,
+                scaler=serialized_data.get("scaler"),
             )
 
         except (ModelNotFoundError, ModelCorruptedError):
@@ -157,20 +170,5 @@ class ModelSerializer:
         if not path.exists():
             return False
 
-        actual_hash = self._compute_hash(path)
+        actual_hash = compute_file_hash(path)
         return actual_hash == expected_hash
-
-    def _compute_hash(self, path: Path) -> str:
-        """Calcula hash SHA256 del archivo.
-
-        Args:
-            path: Ruta al archivo
-
-        Returns:
-            Hash SHA256 como string hexadecimal
-        """
-        sha256_hash = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
@@ -2,6 +2,8 @@
 
 from .trainer import ModelTrainer, TrainingConfig, TrainingResult
 from .evaluator import ModelEvaluator, EvaluationMetrics
+from .distiller import ModelDistiller, DistillationConfig, DistillationResult
+from .sweep import SweepRunner, SweepResult, expand_grid
 
 __all__ = [
     "ModelTrainer",
@@ -9,4 +11,10 @@ __all__ = [
     "TrainingResult",
     "ModelEvaluator",
     "EvaluationMetrics",
+    "ModelDistiller",
+    "DistillationConfig",
+    "DistillationResult",
+    "SweepRunner",
+    "SweepResult",
+    "expand_grid",
 ]
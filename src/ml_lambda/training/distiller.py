@@ -0,0 +1,130 @@
+"""Destilación de modelos a estudiantes compactos."""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from .evaluator import EvaluationMetrics, ModelEvaluator
+
+STUDENT_TYPES = ("tree", "logistic")
+
+
+@dataclass
+class DistillationConfig:
+    """Configuración de destilación."""
+
+    student_type: str = "tree"
+    max_depth: Optional[int] = 4
+    n_augment: int = 10
+    noise_scale: float = 0.1
+    random_state: int = 42
+
+
+@dataclass
+class DistillationResult:
+    """Resultado de la destilación."""
+
+    student: Any
+    metrics: EvaluationMetrics
+    fidelity: float
+    n_distillation_samples: int
+    distillation_time_seconds: float
+
+    def to_training_config(self, config: DistillationConfig) -> dict[str, Any]:
+        """Describe la destilación para ModelMetadata.training_config."""
+        return {
+            "student_type": config.student_type,
+            "max_depth": config.max_depth,
+            "n_augment": config.n_augment,
+            "noise_scale": config.noise_scale,
+            "random_state": config.random_state,
+            "fidelity": self.fidelity,
+            "n_distillation_samples": self.n_distillation_samples,
+        }
+
+
+class ModelDistiller:
+    """Destila un modelo maestro (ej: RandomForest) en un estudiante compacto.
+
+    El estudiante se entrena sobre las probabilidades suaves del maestro en
+    muestras aumentadas con ruido gaussiano. Las etiquetas suaves se expresan
+    replicando cada muestra una vez por clase con peso igual a su
+    probabilidad, lo que equivale a minimizar la entropía cruzada (logística)
+    o la impureza Gini ponderada (árbol) frente a la distribución del maestro.
+    """
+
+    def __init__(self, config: DistillationConfig):
+        if config.student_type not in STUDENT_TYPES:
+            raise ValueError(
+                f"student_type debe ser uno de {STUDENT_TYPES}, recibido: {config.student_type}"
+            )
+        self.config = config
+
+    def distill(
+        self,
+        teacher: Any,
+        X_train: np.ndarray,
+        X_test: np.ndarray,
+        y_test: np.ndarray,
+    ) -> DistillationResult:
+        """Entrena y evalúa el modelo estudiante.
+
+        Args:
+            teacher: Modelo entrenado con predict_proba y classes_
+            X_train: Features de entrenamiento (base de la aumentación)
+            X_test: Features de test
+            y_test: Labels de test
+
+        Returns:
+            DistillationResult con el estudiante, sus métricas y su fidelidad
+        """
+        start_time = time.perf_counter()
+
+        X_augmented = self._augment(np.asarray(X_train, dtype=np.float64))
+        soft_labels = teacher.predict_proba(X_augmented)
+        classes = np.asarray(teacher.classes_)
+
+        n_samples, n_classes = soft_labels.shape
+        X_expanded = np.repeat(X_augmented, n_classes, axis=0)
+        y_expanded = np.tile(classes, n_samples)
+        weights = soft_labels.ravel()
+
+        # Descartar pares (muestra, clase) con probabilidad nula
+        keep = weights > 0
+        student = self._build_student()
+        student.fit(X_expanded[keep], y_expanded[keep], sample_weight=weights[keep])
+
+        distillation_time = time.perf_counter() - start_time
+
+        metrics = ModelEvaluator().evaluate(student, X_test, y_test)
+        fidelity = float(np.mean(student.predict(X_test) == teacher.predict(X_test)))
+
+        return DistillationResult(
+            student=student,
+            metrics=metrics,
+            fidelity=fidelity,
+            n_distillation_samples=n_samples,
+            distillation_time_seconds=distillation_time,
+        )
+
+    def _augment(self, X: np.ndarray) -> np.ndarray:
+        """Genera muestras aumentadas con ruido proporcional a la desviación."""
+        rng = np.random.default_rng(self.config.random_state)
+        scale = X.std(axis=0) * self.config.noise_scale
+        copies = [X]
+        for _ in range(self.config.n_augment):
+            copies.append(X + rng.normal(0.0, 1.0, size=X.shape) * scale)
+        return np.vstack(copies)
+
+    def _build_student(self) -> Any:
+        """Crea el modelo estudiante sin entrenar."""
+        if self.config.student_type == "tree":
+            return DecisionTreeClassifier(
+                max_depth=self.config.max_depth,
+                random_state=self.config.random_state,
+            )
+        return LogisticRegression(max_iter=1000, random_state=self.config.random_state)
@@ -2,17 +2,9 @@
 
 import warnings
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional
 
 import numpy as np
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
-)
 
 
 @dataclass
@@ -25,13 +17,24 @@ class EvaluationMetrics:
     f1_score: float
     confusion_matrix: np.ndarray
     classification_report: str
+    confidence_intervals: Optional[dict[str, tuple[float, float]]] = None
 
 
 class ModelEvaluator:
-    """Evalúa modelos de clasificación."""
+    """Evalúa modelos de clasificación.
+
+    Todas las métricas se derivan de una única matriz de confusión calculada
+    con np.bincount, de modo que y_test e y_pred se recorren una sola vez.
+    """
 
     def evaluate(
-        self, model: Any, X_test: np.ndarray, y_test: np.ndarray
+        self,
+        model: Any,
+        X_test: np.ndarray,
+        y_test: np.ndarray,
+        n_bootstrap: int = 0,
+        confidence_level: float = 0.95,
+        random_state: Optional[int] = None,
     ) -> EvaluationMetrics:
         """Evalúa el modelo en datos de test.
 
@@ -39,21 +42,107 @@ class ModelEvaluator:
             model: Modelo entrenado con método predict
             X_test: Features de test
             y_test: Labels de test
+            n_bootstrap: Remuestreos bootstrap para intervalos de confianza (0 = ninguno)
+            confidence_level: Nivel de confianza de los intervalos
+            random_state: Semilla del bootstrap
 
         Returns:
             EvaluationMetrics con todas las métricas
         """
         y_pred = model.predict(X_test)
+        labels, matrix = self.confusion_matrix(y_test, y_pred)
+        precision, recall, f1, support = _per_class_metrics(matrix)
+        accuracy, weighted_precision, weighted_recall, weighted_f1 = _summary_metrics(matrix)
+
+        confidence_intervals = None
+        if n_bootstrap > 0:
+            confidence_intervals = self.bootstrap_confidence_intervals(
+                matrix, n_bootstrap, confidence_level, random_state
+            )
 
         return EvaluationMetrics(
-            accuracy=float(accuracy_score(y_test, y_pred)),
-            precision=float(precision_score(y_test, y_pred, average="weighted")),
-            recall=float(recall_score(y_test, y_pred, average="weighted")),
-            f1_score=float(f1_score(y_test, y_pred, average="weighted")),
-            confusion_matrix=confusion_matrix(y_test, y_pred),
-            classification_report=classification_report(y_test, y_pred),
+            accuracy=float(accuracy),
+            precision=float(weighted_precision),
+            recall=float(weighted_recall),
+            f1_score=float(weighted_f1),
+            confusion_matrix=matrix,
+            classification_report=_format_report(
+                labels, precision, recall, f1, support, float(accuracy)
+            ),
+            confidence_intervals=confidence_intervals,
         )
 
+    @staticmethod
+    def confusion_matrix(
+        y_true: np.ndarray, y_pred: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calcula la matriz de confusión en una sola pasada.
+
+        Args:
+            y_true: Labels reales
+            y_pred: Labels predichos
+
+        Returns:
+            Tuple de (labels ordenados, matriz de confusión k x k)
+        """
+        y_true = np.asarray(y_true).ravel()
+        y_pred = np.asarray(y_pred).ravel()
+        if len(y_true) != len(y_pred):
+            raise ValueError(
+                f"y_true e y_pred deben tener la misma longitud: {len(y_true)} != {len(y_pred)}"
+            )
+
+        labels, encoded = np.unique(np.concatenate([y_true, y_pred]), return_inverse=True)
+        n_labels = len(labels)
+        n_samples = len(y_true)
+        flat_index = encoded[:n_samples] * n_labels + encoded[n_samples:]
+        matrix = np.bincount(flat_index, minlength=n_labels * n_labels)
+        return labels, matrix.reshape(n_labels, n_labels)
+
+    @staticmethod
+    def bootstrap_confidence_intervals(
+        matrix: np.ndarray,
+        n_bootstrap: int = 1000,
+        confidence_level: float = 0.95,
+        random_state: Optional[int] = None,
+    ) -> dict[str, tuple[float, float]]:
+        """Intervalos de confianza bootstrap remuestreando la matriz de confusión.
+
+        Cada remuestreo es una extracción multinomial de las celdas de la
+        matriz, equivalente a remuestrear pares (y_true, y_pred) sin volver a
+        predecir. Todas las réplicas se evalúan de forma vectorizada.
+
+        Args:
+            matrix: Matriz de confusión observada
+            n_bootstrap: Número de remuestreos
+            confidence_level: Nivel de confianza (ej: 0.95)
+            random_state: Semilla aleatoria
+
+        Returns:
+            Diccionario métrica -> (límite inferior, límite superior)
+
+        Raises:
+            ValueError: Si la matriz de confusión no tiene muestras
+        """
+        n_samples = int(matrix.sum())
+        if n_samples == 0:
+            raise ValueError("La matriz de confusión no tiene muestras que remuestrear")
+        n_labels = matrix.shape[0]
+        rng = np.random.default_rng(random_state)
+        samples = rng.multinomial(n_samples, matrix.ravel() / n_samples, size=n_bootstrap)
+        samples = samples.reshape(n_bootstrap, n_labels, n_labels)
+
+        replicates = _summary_metrics(samples)
+        alpha = (1.0 - confidence_level) / 2.0
+        names = ("accuracy", "precision", "recall", "f1_score")
+        return {
+            name: (
+                float(np.quantile(values, alpha)),
+                float(np.quantile(values, 1.0 - alpha)),
+            )
+            for name, values in zip(names, replicates)
+        }
+
     def check_accuracy_threshold(
         self, metrics: EvaluationMetrics, threshold: float = 0.9
     ) -> bool:
@@ -76,3 +165,84 @@ class ModelEvaluator:
             )
             return False
         return True
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Divide elemento a elemento devolviendo 0 donde el denominador es 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    result = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def _per_class_metrics(
+    matrix: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Precision, recall, f1 y support por clase (admite lotes de matrices)."""
+    true_positives = np.diagonal(matrix, axis1=-2, axis2=-1)
+    support = matrix.sum(axis=-1)
+    predicted = matrix.sum(axis=-2)
+
+    precision = _safe_divide(true_positives, predicted)
+    recall = _safe_divide(true_positives, support)
+    f1 = _safe_divide(2 * true_positives, support + predicted)
+    return precision, recall, f1, support
+
+
+def _summary_metrics(
+    matrix: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Accuracy y promedios ponderados por support (admite lotes de matrices)."""
+    precision, recall, f1, support = _per_class_metrics(matrix)
+    total = support.sum(axis=-1)
+    accuracy = _safe_divide(np.diagonal(matrix, axis1=-2, axis2=-1).sum(axis=-1), total)
+    return (
+        accuracy,
+        _safe_divide((precision * support).sum(axis=-1), total),
+        _safe_divide((recall * support).sum(axis=-1), total),
+        _safe_divide((f1 * support).sum(axis=-1), total),
+    )
+
+
+def _format_report(
+    labels: np.ndarray,
+    precision: np.ndarray,
+    recall: np.ndarray,
+    f1: np.ndarray,
+    support: np.ndarray,
+    accuracy: float,
+    digits: int = 2,
+) -> str:
+    """Formatea el reporte de clasificación con el layout de scikit-learn."""
+    total = int(support.sum())
+    rows = [
+        (str(label), p, r, f, int(s))
+        for label, p, r, f, s in zip(labels, precision, recall, f1, support)
+    ]
+    averages = [
+        ("macro avg", precision.mean(), recall.mean(), f1.mean(), total),
+        (
+            "weighted avg",
+            _safe_divide((precision * support).sum(), total),
+            _safe_divide((recall * support).sum(), total),
+            _safe_divide((f1 * support).sum(), total),
+            total,
+        ),
+    ]
+
+    headers = ["precision", "recall", "f1-score", "support"]
+    width = max(max(len(row[0]) for row in rows), len("weighted avg"), digits)
+    head_fmt = "{:>{width}s} " + " {:>9}" * len(headers)
+    row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}\n"
+
+    report = head_fmt.format("", *headers, width=width) + "\n\n"
+    for row in rows:
+        report += row_fmt.format(*row, width=width, digits=digits)
+    report += "\n"
+    report += ("{:>{width}s} " + " {:>9}" * 2 + " {:>9.{digits}f} {:>9}\n").format(
+        "accuracy", "", "", accuracy, total, width=width, digits=digits
+    )
+    for row in averages:
+        report += row_fmt.format(*row, width=width, digits=digits)
+    return report
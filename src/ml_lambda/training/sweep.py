@@ -0,0 +1,266 @@
+"""Barrido paralelo de configuraciones de entrenamiento."""
+
+import csv
+import hashlib
+import io
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import joblib
+import numpy as np
+
+from .evaluator import ModelEvaluator
+from .trainer import ModelTrainer, TrainingConfig
+
+# Arrays compartidos con los workers, en el orden de los argumentos de run()
+SHARED_ARRAY_NAMES = ("X_train", "y_train", "X_test", "y_test")
+
+# Arrays adjuntados por cada worker en su inicialización
+_worker_arrays: dict[str, np.ndarray] = {}
+_worker_segments: list[shared_memory.SharedMemory] = []
+
+
+@dataclass
+class SweepResult:
+    """Resultado de una configuración del barrido."""
+
+    config_key: str
+    config: dict[str, Any]
+    accuracy: float
+    cv_mean: float
+    cv_std: float
+    training_time_seconds: float
+    model_size_bytes: int
+    inference_latency_ms: float
+
+
+def config_key(config: TrainingConfig) -> str:
+    """Identificador estable de una configuración (para reanudar barridos)."""
+    payload = json.dumps(asdict(config), sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def expand_grid(
+    grid: dict[str, list[Any]], base: Optional[TrainingConfig] = None
+) -> list[TrainingConfig]:
+    """Expande un grid de hiperparámetros en configuraciones.
+
+    Args:
+        grid: Campo de TrainingConfig -> lista de valores
+        base: Configuración con los valores no incluidos en el grid
+
+    Returns:
+        Lista de TrainingConfig, una por combinación
+
+    Raises:
+        ValueError: Si el grid contiene campos que TrainingConfig no tiene
+    """
+    base = base or TrainingConfig()
+    valid_fields = {f.name for f in fields(TrainingConfig)}
+    unknown = set(grid) - valid_fields
+    if unknown:
+        raise ValueError(f"Campos desconocidos en el grid: {sorted(unknown)}")
+
+    names = list(grid)
+    base_values = asdict(base)
+    return [
+        TrainingConfig(**{**base_values, **dict(zip(names, values))})
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+class SweepRunner:
+    """Entrena varias configuraciones en un pool de procesos.
+
+    Los datos se copian una sola vez a memoria compartida y cada worker los
+    adjunta como arrays de solo lectura, en lugar de serializarlos por tarea.
+    Cada resultado se añade a results_path (JSON Lines) en cuanto termina,
+    así que un barrido interrumpido se reanuda saltando las configuraciones
+    ya registradas.
+    """
+
+    def __init__(
+        self,
+        results_path: Path,
+        max_workers: Optional[int] = None,
+        latency_samples: int = 100,
+    ):
+        self.results_path = Path(results_path)
+        self.max_workers = max_workers
+        self.latency_samples = latency_samples
+
+    def run(
+        self,
+        configs: Iterable[TrainingConfig],
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        X_test: np.ndarray,
+        y_test: np.ndarray,
+    ) -> list[SweepResult]:
+        """Ejecuta el barrido.
+
+        Args:
+            configs: Configuraciones a entrenar
+            X_train: Features de entrenamiento
+            y_train: Labels de entrenamiento
+            X_test: Features de test
+            y_test: Labels de test
+
+        Returns:
+            Resultados de todas las configuraciones, en el orden recibido
+        """
+        configs = list(configs)
+        completed = self.load_results()
+        pending = {}
+        for config in configs:
+            key = config_key(config)
+            if key not in completed:
+                pending[key] = config
+
+        if pending:
+            arrays = dict(zip(SHARED_ARRAY_NAMES, (X_train, y_train, X_test, y_test)))
+            segments, descriptors = _share_arrays(arrays)
+            try:
+                self._run_pending(pending, descriptors, completed)
+            finally:
+                for segment in segments:
+                    segment.close()
+                    segment.unlink()
+
+        return [completed[config_key(config)] for config in configs]
+
+    def _run_pending(
+        self,
+        pending: dict[str, TrainingConfig],
+        descriptors: dict[str, tuple[str, tuple[int, ...], str]],
+        completed: dict[str, SweepResult],
+    ) -> None:
+        """Distribuye las configuraciones pendientes y registra sus resultados."""
+        self.results_path.parent.mkdir(parents=True, exist_ok=True)
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_attach_arrays,
+            initargs=(descriptors,),
+        ) as executor, self.results_path.open("a+") as results_file:
+            # Una línea truncada por una interrupción no debe absorber el siguiente resultado
+            if results_file.tell() > 0:
+                results_file.seek(results_file.tell() - 1)
+                if results_file.read(1) != "\n":
+                    results_file.write("\n")
+            futures = [
+                executor.submit(_train_config, key, asdict(config), self.latency_samples)
+                for key, config in pending.items()
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results_file.write(json.dumps(asdict(result)) + "\n")
+                results_file.flush()
+                completed[result.config_key] = result
+
+    def load_results(self) -> dict[str, SweepResult]:
+        """Carga los resultados ya registrados en results_path."""
+        results: dict[str, SweepResult] = {}
+        if not self.results_path.exists():
+            return results
+        with self.results_path.open() as results_file:
+            for line in results_file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    result = SweepResult(**json.loads(line))
+                except (json.JSONDecodeError, TypeError):
+                    # Línea truncada por una interrupción: se reentrena
+                    continue
+                results[result.config_key] = result
+        return results
+
+    @staticmethod
+    def write_table(results: list[SweepResult], path: Path) -> None:
+        """Escribe la tabla de resultados en CSV, ordenada por accuracy.
+
+        Args:
+            results: Resultados del barrido
+            path: Ruta del CSV
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        config_fields = [f.name for f in fields(TrainingConfig)]
+        metric_fields = [f.name for f in fields(SweepResult) if f.name != "config"]
+        with path.open("w", newline="") as table:
+            writer = csv.DictWriter(table, fieldnames=metric_fields + config_fields)
+            writer.writeheader()
+            for result in sorted(results, key=lambda r: (-r.accuracy, -r.cv_mean)):
+                row = {name: getattr(result, name) for name in metric_fields}
+                row.update(result.config)
+                writer.writerow(row)
+
+
+def _share_arrays(
+    arrays: dict[str, np.ndarray],
+) -> tuple[list[shared_memory.SharedMemory], dict[str, tuple[str, tuple[int, ...], str]]]:
+    """Copia los arrays a segmentos de memoria compartida."""
+    segments = []
+    descriptors = {}
+    try:
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            segments.append(segment)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+            descriptors[name] = (segment.name, array.shape, array.dtype.str)
+    except Exception:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+        raise
+    return segments, descriptors
+
+
+def _attach_arrays(descriptors: dict[str, tuple[str, tuple[int, ...], str]]) -> None:
+    """Inicializador del worker: adjunta los arrays compartidos."""
+    for name, (segment_name, shape, dtype) in descriptors.items():
+        segment = shared_memory.SharedMemory(name=segment_name)
+        _worker_segments.append(segment)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+        array.flags.writeable = False
+        _worker_arrays[name] = array
+
+
+def _train_config(key: str, config_values: dict[str, Any], latency_samples: int) -> SweepResult:
+    """Entrena y mide una configuración dentro de un worker."""
+    X_train = _worker_arrays["X_train"]
+    y_train = _worker_arrays["y_train"]
+    X_test = _worker_arrays["X_test"]
+    y_test = _worker_arrays["y_test"]
+
+    training = ModelTrainer(TrainingConfig(**config_values)).train(X_train, y_train)
+    metrics = ModelEvaluator().evaluate(training.model, X_test, y_test)
+
+    buffer = io.BytesIO()
+    joblib.dump(training.model, buffer)
+
+    # Latencia de una predicción individual, como en el handler de Lambda
+    latencies = []
+    for i in range(latency_samples):
+        row = X_test[i % len(X_test)].reshape(1, -1)
+        start = time.perf_counter()
+        training.model.predict_proba(row)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return SweepResult(
+        config_key=key,
+        config=config_values,
+        accuracy=metrics.accuracy,
+        cv_mean=training.cv_mean,
+        cv_std=training.cv_std,
+        training_time_seconds=training.training_time_seconds,
+        model_size_bytes=buffer.getbuffer().nbytes,
+        inference_latency_ms=float(np.median(latencies)) if latencies else 0.0,
+    )
@@ -0,0 +1,64 @@
+"""Cálculo de hashes de artefactos sin releerlos del disco."""
+
+import hashlib
+from pathlib import Path
+from typing import BinaryIO
+
+# Tamaño de buffer para leer y escribir artefactos grandes
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+class HashingWriter:
+    """Stream de escritura que calcula el hash de los bytes escritos.
+
+    Envuelve un archivo abierto en modo binario: cada write actualiza el
+    hash antes de delegar, de modo que al cerrar el archivo el hash ya está
+    calculado. tell() cuenta los bytes escritos a través del writer, que
+    coincide con la posición del archivo si este se abrió vacío.
+    """
+
+    def __init__(self, stream: BinaryIO, algorithm: str = "sha256"):
+        self._stream = stream
+        self._hash = hashlib.new(algorithm)
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        """Escribe data y actualiza el hash."""
+        self._hash.update(data)
+        self._stream.write(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """Bytes escritos hasta el momento."""
+        return self._position
+
+    def flush(self) -> None:
+        """Vacía el buffer del stream subyacente."""
+        self._stream.flush()
+
+    def hexdigest(self) -> str:
+        """Hash de los bytes escritos como string hexadecimal."""
+        return self._hash.hexdigest()
+
+
+def compute_file_hash(
+    path: Path, algorithm: str = "sha256", buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> str:
+    """Calcula el hash de un archivo existente.
+
+    Args:
+        path: Ruta al archivo
+        algorithm: Algoritmo de hashlib
+        buffer_size: Tamaño de cada lectura
+
+    Returns:
+        Hash como string hexadecimal
+    """
+    file_hash = hashlib.new(algorithm)
+    with Path(path).open("rb", buffering=0) as source:
+        buffer = bytearray(buffer_size)
+        view = memoryview(buffer)
+        while read := source.readinto(buffer):
+            file_hash.update(view[:read])
+    return file_hash.hexdigest()
@@ -0,0 +1,139 @@
+"""Histogramas de latencia con precisión relativa acotada (estilo HDR)."""
+
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+from .logging import StructuredLogger
+
+
+class LatencyHistogram:
+    """Histograma de latencias en ms con memoria fija.
+
+    Como HdrHistogram, los valores (en µs) se agrupan en buckets log-lineales:
+    exactos hasta 2 * 10**significant_figures µs y, por encima, con un error
+    relativo menor que 10**-significant_figures. Registrar un valor es O(1) y
+    el histograma ocupa unos pocos miles de contadores sea cual sea el número
+    de valores.
+    """
+
+    def __init__(self, highest_ms: float = 60_000.0, significant_figures: int = 2):
+        if not 1 <= significant_figures <= 4:
+            raise ValueError("significant_figures must be between 1 and 4")
+        self.highest_us = int(highest_ms * 1000)
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10**significant_figures))
+        self._sub_bucket_count = 1 << self._sub_bucket_bits
+        self._half_count = self._sub_bucket_count // 2
+        self._counts = [0] * (self._index(self.highest_us) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def _index(self, value_us: int) -> int:
+        if value_us < self._sub_bucket_count:
+            return value_us
+        shift = value_us.bit_length() - self._sub_bucket_bits
+        return self._sub_bucket_count + (shift - 1) * self._half_count + (
+            (value_us >> shift) - self._half_count
+        )
+
+    def _upper_bound_us(self, index: int) -> int:
+        """Mayor valor (µs) que cae en el bucket index."""
+        if index < self._sub_bucket_count:
+            return index
+        shift, offset = divmod(index - self._sub_bucket_count, self._half_count)
+        shift += 1
+        return ((offset + self._half_count + 1) << shift) - 1
+
+    def record(self, value_ms: float) -> None:
+        """Registra una latencia (los valores mayores que highest_ms se acotan)."""
+        value_us = min(max(int(value_ms * 1000), 0), self.highest_us)
+        self._counts[self._index(value_us)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Latencia (ms) por debajo de la cual está ese porcentaje de valores."""
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(self.count * percentile / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(self._upper_bound_us(index) / 1000, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> dict[str, float]:
+        """Resumen para un registro estructurado."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean_ms, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p90_ms": round(self.percentile(90), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class StageLatencyRecorder:
+    """Histogramas por etapa acumulados entre invocaciones.
+
+    record() se llama al final de cada invocación con la duración de sus
+    etapas; si pasaron flush_interval segundos desde el último registro,
+    escribe un único stage_latency con el resumen de cada etapa y empieza
+    una ventana nueva. Lambda congela el contenedor entre invocaciones, así
+    que el registro se emite en la primera invocación tras el intervalo.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 60.0,
+        logger: Optional[StructuredLogger] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.flush_interval = flush_interval
+        self._logger = logger or StructuredLogger("stage_latency")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._invocations = 0
+        self._window_start = clock()
+
+    def record(self, timings: dict[str, float]) -> None:
+        """Añade las etapas de una invocación y vuelca la ventana si toca."""
+        with self._lock:
+            for stage, duration_ms in timings.items():
+                histogram = self._histograms.get(stage)
+                if histogram is None:
+                    histogram = self._histograms[stage] = LatencyHistogram()
+                histogram.record(duration_ms)
+            self._invocations += 1
+            if self.flush_interval > 0 and (
+                self._clock() - self._window_start >= self.flush_interval
+            ):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Escribe el resumen de la ventana actual aunque no haya vencido."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        now = self._clock()
+        if self._invocations:
+            self._logger.info(
+                "stage_latency",
+                window_seconds=round(now - self._window_start, 1),
+                invocations=self._invocations,
+                stages={stage: h.summary() for stage, h in self._histograms.items()},
+            )
+        self._histograms = {}
+        self._invocations = 0
+        self._window_start = now
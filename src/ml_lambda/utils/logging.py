@@ -2,15 +2,35 @@
 
 import json
 import logging
+import time
 from datetime import datetime, timezone
 from typing import Any
 
+# Namespace de CloudWatch por defecto para las métricas EMF
+DEFAULT_METRICS_NAMESPACE = "MLLambda"
+
+# Máximo de valores por métrica en un registro EMF
+EMF_MAX_VALUES_PER_METRIC = 100
+
 
 class StructuredLogger:
-    """Logger con salida JSON estructurada."""
+    """Logger con salida JSON estructurada.
+
+    También acumula métricas (put_metric) que flush_metrics escribe como un
+    registro en CloudWatch Embedded Metric Format: CloudWatch Logs extrae las
+    métricas del log, sin llamadas a la API de CloudWatch desde la función.
+    """
 
-    def __init__(self, name: str, level: str = "INFO"):
+    def __init__(
+        self,
+        name: str,
+        level: str = "INFO",
+        metrics_namespace: str = DEFAULT_METRICS_NAMESPACE,
+    ):
         self.name = name
+        self.metrics_namespace = metrics_namespace
+        self._metrics: dict[str, tuple[str, list[float]]] = {}
+        self._dimensions: dict[str, str] = {}
         self._logger = logging.getLogger(name)
         self._logger.setLevel(getattr(logging, level))
 
@@ -46,3 +66,58 @@ class StructuredLogger:
     def warning(self, message: str, **kwargs: Any) -> None:
         """Log nivel WARNING."""
         self._logger.warning(self._format_message("WARNING", message, **kwargs))
+
+    def put_metric(self, name: str, value: float, unit: str = "None") -> None:
+        """Acumula un valor de métrica hasta el siguiente flush_metrics.
+
+        Args:
+            name: Nombre de la métrica
+            value: Valor
+            unit: Unidad de CloudWatch (Milliseconds, Count, ...)
+        """
+        self._metrics.setdefault(name, (unit, []))[1].append(value)
+
+    def set_dimensions(self, **dimensions: str) -> None:
+        """Dimensiones de las métricas acumuladas (ej: ModelVersion)."""
+        self._dimensions = {key: str(value) for key, value in dimensions.items()}
+
+    def flush_metrics(self, **properties: Any) -> None:
+        """Escribe las métricas acumuladas como registro EMF y vacía el buffer.
+
+        Args:
+            **properties: Campos adicionales del registro (no son métricas)
+        """
+        if not self._metrics:
+            return
+        metrics, self._metrics = self._metrics, {}
+        dimensions, self._dimensions = self._dimensions, {}
+
+        # EMF admite como mucho 100 valores por métrica en cada registro
+        longest = max(len(values) for _, values in metrics.values())
+        for start in range(0, longest, EMF_MAX_VALUES_PER_METRIC):
+            chunk = {
+                name: (unit, values[start : start + EMF_MAX_VALUES_PER_METRIC])
+                for name, (unit, values) in metrics.items()
+                if len(values) > start
+            }
+            record = {
+                "_aws": {
+                    "Timestamp": int(time.time() * 1000),
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": self.metrics_namespace,
+                            "Dimensions": [list(dimensions)],
+                            "Metrics": [
+                                {"Name": name, "Unit": unit} for name, (unit, _) in chunk.items()
+                            ],
+                        }
+                    ],
+                },
+                **properties,
+                **dimensions,
+                **{
+                    name: values[0] if len(values) == 1 else values
+                    for name, (_, values) in chunk.items()
+                },
+            }
+            self._logger.info(json.dumps(record))
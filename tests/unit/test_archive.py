@@ -0,0 +1,90 @@
+"""Tests unitarios para la escritura de ZIP en paralelo."""
+
+import hashlib
+import os
+import zipfile
+
+import pytest
+
+from ml_lambda.deploy.archive import write_zip
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Archivos de origen compresibles, incompresibles y vacíos."""
+    root = tmp_path / "files"
+    root.mkdir()
+    (root / "module.py").write_text("value = 1\n" * 500)
+    (root / "random.bin").write_bytes(os.urandom(4096))
+    (root / "archive.gz").write_bytes(b"x" * 4096)
+    (root / "empty.txt").write_bytes(b"")
+    (root / "módulo.py").write_text("unicode = True\n")
+    (root / "module.py").chmod(0o755)
+    return root
+
+
+def _entries(root):
+    return [(path.name, path) for path in sorted(root.iterdir())]
+
+
+class TestWriteZip:
+    """Tests para write_zip."""
+
+    def test_archive_is_readable_and_preserves_order(self, files, tmp_path):
+        """Verifica que zipfile lee el archivo con contenido y orden exactos."""
+        output_path = tmp_path / "package.zip"
+        entries = _entries(files)
+
+        sha256_hash = write_zip(entries, output_path, max_workers=3)
+
+        assert sha256_hash == hashlib.sha256(output_path.read_bytes()).hexdigest()
+
+        with zipfile.ZipFile(output_path) as package:
+            assert package.testzip() is None
+            assert package.namelist() == [name for name, _ in entries]
+            for name, path in entries:
+                assert package.read(name) == path.read_bytes()
+            assert package.getinfo("module.py").external_attr >> 16 & 0o777 == 0o755
+
+    def test_store_patterns_and_incompressible_data_are_stored(self, files, tmp_path):
+        """Verifica qué entradas se guardan sin comprimir."""
+        output_path = tmp_path / "package.zip"
+
+        write_zip(_entries(files), output_path, store_patterns=["*.gz"])
+
+        with zipfile.ZipFile(output_path) as package:
+            methods = {info.filename: info.compress_type for info in package.infolist()}
+        assert methods["archive.gz"] == zipfile.ZIP_STORED
+        assert methods["random.bin"] == zipfile.ZIP_STORED
+        assert methods["module.py"] == zipfile.ZIP_DEFLATED
+
+    def test_timestamps_and_permissions_are_normalized(self, files, tmp_path, monkeypatch):
+        """Verifica que mtimes y umask no afectan al archivo generado."""
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+        write_zip(_entries(files), tmp_path / "first.zip")
+        for path in files.iterdir():
+            os.utime(path, (1_700_000_000, 1_700_000_000))
+        (files / "empty.txt").chmod(0o600)
+        write_zip(_entries(files), tmp_path / "second.zip")
+
+        assert (tmp_path / "first.zip").read_bytes() == (tmp_path / "second.zip").read_bytes()
+        with zipfile.ZipFile(tmp_path / "second.zip") as package:
+            info = package.getinfo("empty.txt")
+        assert info.date_time == (1980, 1, 1, 0, 0, 0)
+        assert info.external_attr >> 16 == 0o100644
+
+    def test_source_date_epoch_sets_entry_dates(self, files, tmp_path, monkeypatch):
+        """Verifica que SOURCE_DATE_EPOCH fija la fecha de las entradas."""
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+
+        write_zip(_entries(files), tmp_path / "package.zip")
+
+        with zipfile.ZipFile(tmp_path / "package.zip") as package:
+            assert package.getinfo("module.py").date_time == (2023, 11, 14, 22, 13, 20)
+
+    def test_output_does_not_depend_on_worker_count(self, files, tmp_path):
+        """Verifica que el resultado es idéntico con uno o varios hilos."""
+        write_zip(_entries(files), tmp_path / "serial.zip", max_workers=1)
+        write_zip(_entries(files), tmp_path / "parallel.zip", max_workers=4)
+
+        assert (tmp_path / "serial.zip").read_bytes() == (tmp_path / "parallel.zip").read_bytes()
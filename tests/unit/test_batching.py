@@ -0,0 +1,134 @@
+"""Tests unitarios para la agrupación de predicciones."""
+
+import asyncio
+import json
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from sklearn.dummy import DummyClassifier
+
+from ml_lambda.inference.batching import MicroBatcher
+from ml_lambda.inference.handler import LambdaHandler
+from ml_lambda.inference.predictor import Predictor
+from ml_lambda.inference.registry import LoadedModel
+
+CLASS_NAMES = ["setosa", "versicolor", "virginica"]
+
+
+@pytest.fixture
+def predictor(trained_model):
+    """Predictor con el RandomForest de los fixtures."""
+    return Predictor(trained_model, CLASS_NAMES)
+
+
+def _gather(batcher, predictor, rows):
+    async def run():
+        return await asyncio.gather(*(batcher.predict(predictor, row) for row in rows))
+
+    return asyncio.run(run())
+
+
+class TestPredictBatch:
+    """Tests para Predictor.predict_batch."""
+
+    def test_matches_single_predictions(self, predictor, iris_data):
+        """Verifica que el lote da los mismos resultados que fila a fila."""
+        rows = iris_data[0][::10].tolist()
+
+        assert predictor.predict_batch(rows) == [predictor.predict(row) for row in rows]
+
+
+class TestMicroBatcher:
+    """Tests para MicroBatcher."""
+
+    def test_concurrent_requests_share_batches(self, predictor, iris_data):
+        """Verifica que las solicitudes concurrentes se predicen por lotes."""
+        rows = iris_data[0][:70].tolist()
+        batcher = MicroBatcher(max_batch_size=32, max_wait_ms=5)
+
+        results = _gather(batcher, predictor, rows)
+
+        assert results == predictor.predict_batch(rows)
+        assert batcher.batches == 3
+        assert batcher.mean_batch_size == pytest.approx(70 / 3)
+
+        async def batch_sizes():
+            outcomes = await asyncio.gather(
+                *(batcher.predict_batched(predictor, row) for row in rows[:5])
+            )
+            return [size for _, size in outcomes]
+
+        assert asyncio.run(batch_sizes()) == [5] * 5
+
+    def test_lone_request_is_flushed_by_window(self, predictor):
+        """Verifica que una solicitud sola espera como mucho la ventana."""
+        batcher = MicroBatcher(max_batch_size=32, max_wait_ms=20)
+        start = time.perf_counter()
+
+        (result,) = _gather(batcher, predictor, [[5.1, 3.5, 1.4, 0.2]])
+
+        assert result.class_name == "setosa"
+        assert 0.02 <= time.perf_counter() - start < 0.5
+        assert batcher.batches == 1
+
+    def test_mixed_predictors_and_errors(self, predictor):
+        """Verifica que cada solicitud usa su Predictor y recibe su error."""
+        constant = DummyClassifier(strategy="constant", constant=2)
+        other = Predictor(constant.fit(np.zeros((3, 4)), [0, 1, 2]), CLASS_NAMES)
+        broken = Predictor(None, CLASS_NAMES)
+        batcher = MicroBatcher(max_batch_size=8, max_wait_ms=5)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.predict(predictor, [5.1, 3.5, 1.4, 0.2]),
+                batcher.predict(other, [5.1, 3.5, 1.4, 0.2]),
+                batcher.predict(broken, [5.1, 3.5, 1.4, 0.2]),
+                return_exceptions=True,
+            )
+
+        first, second, third = asyncio.run(run())
+
+        assert (first.prediction, second.prediction) == (0, 2)
+        assert isinstance(third, AttributeError)
+        assert batcher.batches == 1
+
+    def test_throughput_under_concurrency(self, predictor, iris_data):
+        """Compara 256 predicciones concurrentes agrupadas frente a una a una."""
+        rows = (iris_data[0].tolist() * 2)[:256]
+
+        start = time.perf_counter()
+        for row in rows:
+            predictor.predict(row)
+        single_seconds = time.perf_counter() - start
+
+        batcher = MicroBatcher(max_batch_size=64, max_wait_ms=2)
+        start = time.perf_counter()
+        _gather(batcher, predictor, rows)
+        batched_seconds = time.perf_counter() - start
+
+        assert batched_seconds * 5 < single_seconds
+
+
+class TestHandleAsync:
+    """Tests para LambdaHandler.handle_async."""
+
+    def test_concurrent_invocations_are_batched(self, predictor, trained_model):
+        """Verifica respuestas correctas y agrupadas, y los errores de validación."""
+        handler = LambdaHandler()
+        handler._loaded = LoadedModel(trained_model, Mock(version="v1.0.0"), predictor, 0)
+        batcher = MicroBatcher(max_batch_size=16, max_wait_ms=5)
+        events = [{"body": json.dumps({"features": [5.1, 3.5, 1.4, 0.2]})}] * 16
+        events.append({"body": json.dumps({"features": [1.0]})})
+
+        async def run():
+            return await asyncio.gather(
+                *(handler.handle_async(event, None, batcher) for event in events)
+            )
+
+        responses = asyncio.run(run())
+
+        assert [r["statusCode"] for r in responses] == [200] * 16 + [400]
+        assert json.loads(responses[0]["body"])["class_name"] == "setosa"
+        assert batcher.batches == 1
@@ -0,0 +1,53 @@
+"""Tests unitarios para la evaluación de despliegues canary."""
+
+import pytest
+
+from ml_lambda.deploy.canary import CanaryConfig, VersionMetrics, evaluate_canary
+
+
+class TestEvaluateCanary:
+    """Tests para evaluate_canary."""
+
+    def test_promotes_within_thresholds(self):
+        """Verifica que un canary similar a la versión estable se promueve."""
+        stable = VersionMetrics(invocations=900, errors=9, p99_ms=40.0)
+        candidate = VersionMetrics(invocations=100, errors=1, p99_ms=44.0)
+
+        promote, _ = evaluate_canary(stable, candidate, CanaryConfig())
+
+        assert promote
+
+    def test_rejects_latency_regression(self):
+        """Verifica que un p99 por encima del margen provoca rollback."""
+        stable = VersionMetrics(invocations=900, errors=0, p99_ms=40.0)
+        candidate = VersionMetrics(invocations=100, errors=0, p99_ms=49.0)
+
+        promote, reason = evaluate_canary(stable, candidate, CanaryConfig(max_p99_increase=0.2))
+
+        assert not promote
+        assert "p99" in reason
+
+    def test_rejects_error_rate_regression(self):
+        """Verifica que más errores que el margen provocan rollback."""
+        stable = VersionMetrics(invocations=900, errors=9, p99_ms=40.0)
+        candidate = VersionMetrics(invocations=100, errors=3, p99_ms=30.0)
+
+        promote, reason = evaluate_canary(stable, candidate, CanaryConfig())
+
+        assert not promote
+        assert "error rate" in reason
+
+    def test_insufficient_traffic_is_not_promoted(self):
+        """Verifica que sin tráfico suficiente no se promueve."""
+        stable = VersionMetrics(invocations=900, errors=0, p99_ms=40.0)
+        candidate = VersionMetrics(invocations=10, errors=0, p99_ms=20.0)
+
+        promote, reason = evaluate_canary(stable, candidate, CanaryConfig(min_invocations=50))
+
+        assert not promote
+        assert "insufficient" in reason
+
+    def test_traffic_percent_must_be_partial(self):
+        """Verifica que el porcentaje de tráfico se valida."""
+        with pytest.raises(ValueError):
+            CanaryConfig(traffic_percent=100)
@@ -14,6 +14,13 @@ def test_dockerfile_builds_a_lambda_image_with_the_project_handler():
     assert "tests/" not in dockerfile
 
 
+def test_dockerfile_ships_deterministic_precompiled_bytecode():
+    dockerfile = (ROOT / "docker" / "Dockerfile").read_text()
+
+    assert "python -m compileall" in dockerfile
+    assert "--invalidation-mode unchecked-hash" in dockerfile
+
+
 def test_dockerignore_excludes_development_files_but_keeps_the_model():
     dockerignore = (ROOT / ".dockerignore").read_text()
 
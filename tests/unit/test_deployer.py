@@ -0,0 +1,319 @@
+"""Tests unitarios para AWSDeployer."""
+
+import base64
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from ml_lambda.deploy.backends import LocalBackend
+from ml_lambda.deploy.canary import CanaryConfig
+from ml_lambda.deploy.deployer import LIVE_ALIAS, AWSDeployer
+from ml_lambda.deploy.packager import PackageInfo
+from ml_lambda.utils.exceptions import AWSCredentialsError, DeploymentError
+
+FUNCTION_NAME = "ml-iris-predictor-staging"
+
+
+def _package_info(content: bytes) -> PackageInfo:
+    return PackageInfo(
+        path=Path("package.zip"),
+        size_bytes=len(content),
+        size_mb=len(content) / (1024 * 1024),
+        sha256_hash=hashlib.sha256(content).hexdigest(),
+        included_files=[],
+    )
+
+
+@pytest.fixture
+def backend():
+    """Backend local con la función creada (como haría Terraform)."""
+    backend = LocalBackend()
+    backend.add_function(FUNCTION_NAME)
+    return backend
+
+
+@pytest.fixture
+def package_path(tmp_path):
+    """Paquete de 10 KB que se sube en varias partes."""
+    path = tmp_path / "package.zip"
+    path.write_bytes(os.urandom(10 * 1024))
+    return path
+
+
+class TestAWSDeployer:
+    """Tests para AWSDeployer."""
+
+    def test_code_sha256_uses_lambda_format(self):
+        """Verifica que el hash se expresa como CodeSha256 (base64)."""
+        package_info = _package_info(b"package")
+
+        assert package_info.code_sha256 == base64.b64encode(
+            hashlib.sha256(b"package").digest()
+        ).decode()
+
+    def test_is_current_compares_deployed_code_hash(self, backend):
+        """Verifica que solo un hash idéntico permite omitir la subida."""
+        deployed = _package_info(b"deployed")
+        backend.functions[FUNCTION_NAME]["CodeSha256"] = deployed.code_sha256
+        deployer = AWSDeployer(backend=backend)
+
+        assert deployer.is_current(deployed, FUNCTION_NAME)
+        assert not deployer.is_current(_package_info(b"changed"), FUNCTION_NAME)
+        assert not deployer.is_current(deployed, "missing-function")
+
+    def test_multipart_upload_sends_parts_concurrently(self, backend, package_path):
+        """Verifica la subida multipart en paralelo y el contenido final."""
+        # Las dos primeras partes solo terminan si se suben a la vez
+        barrier = threading.Barrier(2, timeout=5)
+        upload_part = backend.upload_part
+
+        def concurrent_upload_part(bucket, key, upload_id, part_number, data):
+            if part_number <= 2:
+                barrier.wait()
+            return upload_part(bucket, key, upload_id, part_number, data)
+
+        backend.upload_part = concurrent_upload_part
+        deployer = AWSDeployer(
+            environment="staging", backend=backend, max_workers=4, part_size=1024
+        )
+
+        key = deployer.upload_package(package_path)
+
+        assert key.startswith("staging/")
+        assert backend.objects[(deployer.bucket, key)] == package_path.read_bytes()
+        assert backend.pending_uploads == 0
+
+    def test_existing_upload_is_skipped(self, backend, package_path):
+        """Verifica que un paquete ya subido no se vuelve a subir."""
+        deployer = AWSDeployer(backend=backend, part_size=1024)
+        deployer.upload_package(package_path)
+        backend.create_multipart_upload = backend.put_object = None
+
+        deployer.upload_package(package_path)
+
+    def test_failed_part_aborts_upload(self, backend, package_path):
+        """Verifica que un fallo cancela la subida multipart."""
+
+        def failing_upload_part(bucket, key, upload_id, part_number, data):
+            raise DeploymentError("connection reset")
+
+        backend.upload_part = failing_upload_part
+        deployer = AWSDeployer(backend=backend, part_size=1024)
+
+        with pytest.raises(DeploymentError):
+            deployer.upload_package(package_path)
+        assert backend.pending_uploads == 0
+        assert backend.objects == {}
+
+    def test_deploy_updates_function_and_api(self, backend, package_path):
+        """Verifica el despliegue completo y que repetirlo no publica versión."""
+        deployer = AWSDeployer(environment="staging", backend=backend, part_size=1024)
+
+        result = deployer.deploy(package_path, FUNCTION_NAME)
+
+        function = backend.get_function(FUNCTION_NAME)
+        api = backend.find_api("ml-iris-predictor-api-staging")
+        assert result.version == "1"
+        assert result.function_arn == f"{function['FunctionArn']}:1"
+        assert result.api_endpoint == api["ApiEndpoint"]
+        assert api["Target"] == f"{function['FunctionArn']}:{LIVE_ALIAS}"
+        assert backend.permissions == {(api["Target"], api["ApiId"])}
+        assert backend.aliases[(FUNCTION_NAME, LIVE_ALIAS)] == "1"
+        assert deployer.is_current(
+            _package_info(package_path.read_bytes()), FUNCTION_NAME
+        )
+
+        second = deployer.deploy(package_path, FUNCTION_NAME)
+
+        assert len(backend.functions[FUNCTION_NAME]["versions"]) == 1
+        assert second.api_endpoint == result.api_endpoint
+        assert len(backend.apis) == 1
+
+    def test_existing_api_is_pointed_at_live_alias(self, backend, package_path):
+        """Verifica que una API que invocaba $LATEST pasa a invocar el alias."""
+        deployer = AWSDeployer(environment="staging", backend=backend)
+        function_arn = backend.get_function(FUNCTION_NAME)["FunctionArn"]
+        api = backend.create_api("ml-iris-predictor-api-staging", function_arn)
+        deployer.deploy_lambda(package_path, FUNCTION_NAME)
+
+        deployer.deploy(package_path, FUNCTION_NAME)
+
+        assert api["Target"] == f"{function_arn}:{LIVE_ALIAS}"
+        assert (api["Target"], api["ApiId"]) in backend.permissions
+
+    def test_get_function_resolves_qualifiers(self, backend, package_path):
+        """Verifica los qualifiers de versión, $LATEST y alias."""
+        deployer = AWSDeployer(backend=backend)
+        deployer.deploy_lambda(package_path, FUNCTION_NAME)
+        package_path.write_bytes(b"new package")
+        deployer.deploy_lambda(package_path, FUNCTION_NAME)
+        deployer.rollback(FUNCTION_NAME, "1")
+
+        latest = backend.get_function(FUNCTION_NAME, qualifier="$LATEST")
+        alias = backend.get_function(FUNCTION_NAME, qualifier=LIVE_ALIAS)
+        assert latest["Version"] == "$LATEST"
+        assert latest["CodeSha256"] == backend.get_function(FUNCTION_NAME, "2")["CodeSha256"]
+        assert alias["Version"] == "1"
+        assert alias["FunctionArn"].endswith(f":{LIVE_ALIAS}")
+        assert alias["CodeSha256"] == backend.get_function(FUNCTION_NAME, "1")["CodeSha256"]
+        assert backend.get_function(FUNCTION_NAME, qualifier="missing") is None
+        with pytest.raises(DeploymentError):
+            deployer.rollback(FUNCTION_NAME, "$LATEST")
+
+    def test_deploy_requires_existing_function(self, package_path):
+        """Verifica que desplegar a una función inexistente falla."""
+        deployer = AWSDeployer(backend=LocalBackend())
+
+        with pytest.raises(DeploymentError):
+            deployer.deploy_lambda(package_path, FUNCTION_NAME)
+
+    def test_rollback_moves_live_alias(self, backend, package_path):
+        """Verifica que el rollback apunta el alias a la versión anterior."""
+        deployer = AWSDeployer(backend=backend)
+        deployer.deploy_lambda(package_path, FUNCTION_NAME)
+        package_path.write_bytes(b"new package")
+        deployer.deploy_lambda(package_path, FUNCTION_NAME)
+        assert backend.aliases[(FUNCTION_NAME, LIVE_ALIAS)] == "2"
+
+        deployer.rollback(FUNCTION_NAME, "1")
+
+        assert backend.aliases[(FUNCTION_NAME, LIVE_ALIAS)] == "1"
+        with pytest.raises(DeploymentError):
+            deployer.rollback(FUNCTION_NAME, "7")
+
+    def test_rollback_changes_version_served_by_api(self, backend, package_path):
+        """Verifica que la API invoca el alias y sirve la versión del rollback."""
+        deployer = AWSDeployer(environment="staging", backend=backend)
+        deployer.deploy(package_path, FUNCTION_NAME)
+        package_path.write_bytes(b"new package")
+        result = deployer.deploy(package_path, FUNCTION_NAME)
+        api = backend.find_api("ml-iris-predictor-api-staging")
+        assert result.version == "2"
+        assert {backend.invoke(api["Target"]) for _ in range(20)} == {"2"}
+
+        deployer.rollback(FUNCTION_NAME, "1")
+
+        assert {backend.invoke(api["Target"]) for _ in range(20)} == {"1"}
+        # $LATEST sigue teniendo el código nuevo: la API no debe invocarlo
+        assert backend.invoke(api["Target"].rsplit(":", 1)[0]) == "$LATEST"
+
+    def test_canary_traffic_flows_through_api(self, package_path):
+        """Verifica que el routing del canary reparte el tráfico de la API y
+        que tras el rollback solo se sirve la versión estable."""
+        backend = LocalBackend(seed=0)
+        backend.add_function(FUNCTION_NAME)
+        deployer = AWSDeployer(environment="staging", backend=backend)
+        deployer.deploy(package_path, FUNCTION_NAME)
+        api = backend.find_api("ml-iris-predictor-api-staging")
+        package_path.write_bytes(b"slow candidate")
+        served = []
+
+        def api_traffic(seconds):
+            for _ in range(1000):
+                version = backend.invoke(api["Target"])
+                served.append(version)
+                backend.record_invocation(FUNCTION_NAME, version, 80.0 if version == "2" else 40.0)
+
+        deployer._sleep = api_traffic
+
+        result = deployer.deploy(package_path, FUNCTION_NAME, canary=CanaryConfig(10))
+
+        assert not result.canary.promote
+        assert 50 <= served.count("2") <= 150
+        assert result.canary.candidate.invocations == served.count("2")
+        assert {backend.invoke(api["Target"]) for _ in range(100)} == {"1"}
+
+    def _canary_deployer(self, backend, package_path, candidate_latency_ms, candidate_errors=0):
+        """Despliega una versión estable y prepara un sleep que simula el
+        tráfico del alias repartido según su routing."""
+        deployer = AWSDeployer(backend=backend)
+        deployer.deploy_lambda(package_path, FUNCTION_NAME)
+        package_path.write_bytes(b"candidate package")
+        routings = []
+
+        def simulate_traffic(seconds):
+            routing = backend.alias_routing[(FUNCTION_NAME, LIVE_ALIAS)]
+            routings.append(routing)
+            (candidate, weight), = routing.items()
+            candidate_requests = int(1000 * weight)
+            for i in range(1000 - candidate_requests):
+                backend.record_invocation(FUNCTION_NAME, "1", 40.0 + i % 5)
+            for i in range(candidate_requests):
+                backend.record_invocation(
+                    FUNCTION_NAME, candidate, candidate_latency_ms, error=i < candidate_errors
+                )
+
+        deployer._sleep = simulate_traffic
+        return deployer, routings
+
+    def test_canary_promotes_healthy_version(self, backend, package_path):
+        """Verifica que un canary sano recibe todo el tráfico."""
+        deployer, routings = self._canary_deployer(backend, package_path, 41.0)
+
+        result = deployer.deploy(package_path, FUNCTION_NAME, canary=CanaryConfig(10))
+
+        assert routings == [{"2": 0.1}]
+        assert result.canary.promote
+        assert result.canary.candidate.invocations == 100
+        assert result.version == "2"
+        assert backend.aliases[(FUNCTION_NAME, LIVE_ALIAS)] == "2"
+        assert backend.alias_routing[(FUNCTION_NAME, LIVE_ALIAS)] == {}
+
+    @pytest.mark.parametrize("latency_ms, errors", [(80.0, 0), (41.0, 5)])
+    def test_canary_rolls_back_regressions(self, backend, package_path, latency_ms, errors):
+        """Verifica el rollback automático por latencia o por errores."""
+        deployer, _ = self._canary_deployer(backend, package_path, latency_ms, errors)
+
+        result = deployer.deploy(package_path, FUNCTION_NAME, canary=CanaryConfig(10))
+
+        assert not result.canary.promote
+        assert result.version == "1"
+        assert result.function_arn.endswith(":1")
+        assert backend.aliases[(FUNCTION_NAME, LIVE_ALIAS)] == "1"
+        assert backend.alias_routing[(FUNCTION_NAME, LIVE_ALIAS)] == {}
+
+    def test_canary_failure_restores_stable_alias(self, backend, package_path):
+        """Verifica que un error durante la observación retira el canary."""
+        deployer, _ = self._canary_deployer(backend, package_path, 41.0)
+
+        def failing_metrics(*args):
+            raise DeploymentError("metrics unavailable")
+
+        backend.get_version_metrics = failing_metrics
+
+        with pytest.raises(DeploymentError):
+            deployer.deploy(package_path, FUNCTION_NAME, canary=CanaryConfig())
+        assert backend.aliases[(FUNCTION_NAME, LIVE_ALIAS)] == "1"
+        assert backend.alias_routing[(FUNCTION_NAME, LIVE_ALIAS)] == {}
+
+    def test_first_deploy_skips_canary(self, backend, package_path):
+        """Verifica que sin versión estable no hay canary."""
+        deployer = AWSDeployer(backend=backend, sleep=None)
+
+        result = deployer.deploy(package_path, FUNCTION_NAME, canary=CanaryConfig())
+
+        assert result.canary is None
+        assert backend.aliases[(FUNCTION_NAME, LIVE_ALIAS)] == "1"
+
+    def test_invalid_credentials_are_reported(self, backend):
+        """Verifica que un fallo al validar credenciales es AWSCredentialsError."""
+
+        def failing_account_id():
+            raise DeploymentError("InvalidClientTokenId")
+
+        backend.get_account_id = failing_account_id
+
+        with pytest.raises(AWSCredentialsError):
+            AWSDeployer(backend=backend).validate_credentials()
+
+    def test_local_backend_can_store_objects_on_disk(self, tmp_path, package_path):
+        """Verifica el backend local sobre el sistema de archivos."""
+        backend = LocalBackend(root=tmp_path / "s3")
+        deployer = AWSDeployer(backend=backend, bucket="artifacts", part_size=1024)
+
+        key = deployer.upload_package(package_path)
+
+        assert (tmp_path / "s3" / "artifacts" / key).read_bytes() == package_path.read_bytes()
@@ -0,0 +1,113 @@
+"""Tests unitarios para ModelDistiller."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from ml_lambda.data.processor import DataProcessor
+from ml_lambda.model.serializer import ModelMetadata, ModelSerializer
+from ml_lambda.training.distiller import (
+    DistillationConfig,
+    DistillationResult,
+    ModelDistiller,
+)
+from ml_lambda.training.evaluator import EvaluationMetrics
+from ml_lambda.training.trainer import ModelTrainer, TrainingConfig
+
+
+@pytest.fixture(scope="module")
+def teacher_and_data():
+    """Random Forest maestro entrenado con la división estándar de Iris."""
+    processor = DataProcessor()
+    X, y = processor.load_iris()
+    X_train, X_test, y_train, y_test = processor.split_data(X, y)
+    result = ModelTrainer(TrainingConfig(n_estimators=30, n_cv_folds=2)).train(X_train, y_train)
+    return result.model, X_train, X_test, y_test
+
+
+class TestModelDistiller:
+    """Tests para ModelDistiller."""
+
+    @pytest.mark.parametrize(
+        "student_type, expected_class",
+        [("tree", DecisionTreeClassifier), ("logistic", LogisticRegression)],
+    )
+    def test_distill_returns_student_of_requested_type(
+        self, teacher_and_data, student_type, expected_class
+    ):
+        """Verifica que se entrena el tipo de estudiante configurado."""
+        teacher, X_train, X_test, y_test = teacher_and_data
+        distiller = ModelDistiller(DistillationConfig(student_type=student_type, n_augment=3))
+
+        result = distiller.distill(teacher, X_train, X_test, y_test)
+
+        assert isinstance(result, DistillationResult)
+        assert isinstance(result.student, expected_class)
+        assert isinstance(result.metrics, EvaluationMetrics)
+        assert result.n_distillation_samples == len(X_train) * 4
+
+    def test_tree_student_respects_max_depth(self, teacher_and_data):
+        """Verifica que el árbol estudiante no supera la profundidad máxima."""
+        teacher, X_train, X_test, y_test = teacher_and_data
+        distiller = ModelDistiller(DistillationConfig(max_depth=3, n_augment=3))
+
+        result = distiller.distill(teacher, X_train, X_test, y_test)
+
+        assert result.student.get_depth() <= 3
+
+    def test_student_tracks_teacher(self, teacher_and_data):
+        """Verifica que el estudiante reproduce las predicciones del maestro."""
+        teacher, X_train, X_test, y_test = teacher_and_data
+        distiller = ModelDistiller(DistillationConfig())
+
+        result = distiller.distill(teacher, X_train, X_test, y_test)
+
+        assert result.fidelity >= 0.9
+        assert result.metrics.accuracy >= 0.9
+        probabilities = result.student.predict_proba(X_test)
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+
+    def test_distillation_is_deterministic(self, teacher_and_data):
+        """Verifica que la misma semilla produce el mismo estudiante."""
+        teacher, X_train, X_test, y_test = teacher_and_data
+        config = DistillationConfig(n_augment=3)
+
+        first = ModelDistiller(config).distill(teacher, X_train, X_test, y_test)
+        second = ModelDistiller(config).distill(teacher, X_train, X_test, y_test)
+
+        np.testing.assert_array_equal(
+            first.student.predict_proba(X_test), second.student.predict_proba(X_test)
+        )
+
+    def test_invalid_student_type_raises(self):
+        """Verifica que un tipo de estudiante desconocido es rechazado."""
+        with pytest.raises(ValueError, match="student_type"):
+            ModelDistiller(DistillationConfig(student_type="svm"))
+
+    def test_student_serializes_with_model_metadata(self, teacher_and_data, tmp_path):
+        """Verifica que el estudiante se guarda y carga con ModelMetadata."""
+        teacher, X_train, X_test, y_test = teacher_and_data
+        config = DistillationConfig(n_augment=3)
+        result = ModelDistiller(config).distill(teacher, X_train, X_test, y_test)
+        metadata = ModelMetadata(
+            version="v1.0.0",
+            created_at=datetime.now(),
+            accuracy=result.metrics.accuracy,
+            n_features=4,
+            n_classes=3,
+            feature_names=["f1", "f2", "f3", "f4"],
+            class_names=["setosa", "versicolor", "virginica"],
+            training_config={"distillation": result.to_training_config(config)},
+        )
+        serializer = ModelSerializer()
+
+        serializer.save(result.student, metadata, tmp_path / "student.joblib")
+        loaded = serializer.load(tmp_path / "student.joblib")
+
+        assert loaded.metadata.training_config["distillation"]["student_type"] == "tree"
+        np.testing.assert_array_equal(
+            loaded.model.predict(X_test), result.student.predict(X_test)
+        )
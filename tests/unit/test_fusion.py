@@ -0,0 +1,106 @@
+"""Tests unitarios para la fusión del scaler en el modelo."""
+
+import numpy as np
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from ml_lambda.model.fusion import ScaledModel, fuse_scaler
+
+
+@pytest.fixture
+def scaled_iris():
+    """Iris con scaler ajustado y features escaladas."""
+    X, y = load_iris(return_X_y=True)
+    scaler = StandardScaler().fit(X)
+    return X, y, scaler, scaler.transform(X)
+
+
+class TestFuseScaler:
+    """Tests para fuse_scaler."""
+
+    @pytest.mark.parametrize(
+        "model",
+        [
+            RandomForestClassifier(n_estimators=10, random_state=42),
+            DecisionTreeClassifier(random_state=42),
+            LogisticRegression(max_iter=1000),
+        ],
+    )
+    def test_fused_model_matches_scaled_pipeline(self, scaled_iris, model):
+        """Verifica que el modelo fusionado predice igual sobre features crudas."""
+        X, y, scaler, X_scaled = scaled_iris
+        model.fit(X_scaled, y)
+
+        fused = fuse_scaler(model, scaler)
+
+        np.testing.assert_array_equal(fused.predict(X), model.predict(X_scaled))
+        np.testing.assert_allclose(fused.predict_proba(X), model.predict_proba(X_scaled))
+
+    def test_fusion_does_not_modify_original_model(self, scaled_iris):
+        """Verifica que la fusión trabaja sobre una copia."""
+        X, y, scaler, X_scaled = scaled_iris
+        model = DecisionTreeClassifier(random_state=42).fit(X_scaled, y)
+        thresholds = model.tree_.threshold.copy()
+
+        fuse_scaler(model, scaler)
+
+        np.testing.assert_array_equal(model.tree_.threshold, thresholds)
+
+    def test_fusion_without_centering(self, scaled_iris):
+        """Verifica la fusión con un scaler sin centrado (mean_ es None)."""
+        X, y, _, _ = scaled_iris
+        scaler = StandardScaler(with_mean=False).fit(X)
+        model = RandomForestClassifier(n_estimators=10, random_state=0)
+        model.fit(scaler.transform(X), y)
+
+        fused = fuse_scaler(model, scaler)
+
+        np.testing.assert_array_equal(fused.predict(X), model.predict(scaler.transform(X)))
+
+    def test_tree_thresholds_without_short_decimal_form(self):
+        """Verifica el path en los float32 vecinos de umbrales sin decimal corto."""
+        rng = np.random.default_rng(0)
+        X = np.round(rng.uniform(-3.0, 3.0, size=(400, 2)), 7)
+        y = (X[:, 0] * 7 + X[:, 1] > 0.3).astype(int)
+        scaler = StandardScaler().fit(X)
+        model = DecisionTreeClassifier(random_state=0).fit(scaler.transform(X), y)
+
+        fused = fuse_scaler(model, scaler)
+
+        split_nodes = fused.tree_.feature >= 0
+        probes = []
+        for feature, threshold in zip(
+            fused.tree_.feature[split_nodes], fused.tree_.threshold[split_nodes]
+        ):
+            center = np.float32(threshold)
+            for value in (
+                np.nextafter(center, np.float32(-np.inf)),
+                center,
+                np.nextafter(center, np.float32(np.inf)),
+            ):
+                probe = X[0].copy()
+                # Valor tal y como llegaría en un request JSON
+                probe[feature] = float(str(value))
+                probes.append(probe)
+        probes = np.array(probes)
+
+        for inputs in (probes, X):
+            np.testing.assert_array_equal(
+                fused.predict(inputs), model.predict(scaler.transform(inputs))
+            )
+
+    def test_unsupported_model_falls_back_to_scaled_model(self, scaled_iris):
+        """Verifica que los modelos no fusionables escalan por request."""
+        X, y, scaler, X_scaled = scaled_iris
+        model = KNeighborsClassifier().fit(X_scaled, y)
+
+        fused = fuse_scaler(model, scaler)
+
+        assert isinstance(fused, ScaledModel)
+        np.testing.assert_array_equal(fused.classes_, model.classes_)
+        np.testing.assert_array_equal(fused.predict(X), model.predict(X_scaled))
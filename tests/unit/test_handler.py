@@ -1,7 +1,9 @@
 """Tests unitarios para LambdaHandler."""
 
 import json
+import logging
 import pytest
+from io import StringIO
 from unittest.mock import Mock, MagicMock
 from pathlib import Path
 
@@ -47,6 +49,96 @@ def handler_with_model(trained_model, tmp_path, monkeypatch):
     return LambdaHandler()
 
 
+class TestStageTimings:
+    """Tests para la latencia por etapa."""
+
+    def test_header_returns_stage_breakdown(self, handler_with_model, mock_context):
+        """Verifica Server-Timing solo cuando la solicitud lo pide."""
+        event = {
+            "body": json.dumps({"features": [5.1, 3.5, 1.4, 0.2]}),
+            "headers": {"X-Stage-Timings": "1"},
+        }
+
+        response = handler_with_model.handle(event, mock_context)
+        plain = handler_with_model.handle({"body": event["body"]}, mock_context)
+
+        stages = [part.split(";")[0] for part in response["headers"]["Server-Timing"].split(", ")]
+        assert stages == ["parse", "load", "validate", "predict", "serialize"]
+        assert "Server-Timing" not in plain["headers"]
+
+    def test_stages_are_aggregated_across_invocations(self, handler_with_model, mock_context):
+        """Verifica que las etapas se acumulan en un único registro."""
+        from ml_lambda.utils.histogram import StageLatencyRecorder
+
+        logger = Mock()
+        handler_with_model._stage_latency = StageLatencyRecorder(logger=logger)
+        event = {"body": json.dumps({"features": [5.1, 3.5, 1.4, 0.2]})}
+
+        for _ in range(5):
+            handler_with_model.handle(event, mock_context)
+        handler_with_model._stage_latency.flush()
+
+        record = logger.info.call_args
+        assert record.kwargs["invocations"] == 5
+        assert set(record.kwargs["stages"]) == {"parse", "load", "validate", "predict", "serialize"}
+        assert record.kwargs["stages"]["load"]["max_ms"] > record.kwargs["stages"]["load"]["p50_ms"]
+
+
+class TestEmbeddedMetrics:
+    """Tests para las métricas EMF por invocación."""
+
+    def _emf_records(self, handler, events, context, namespace="MLLambda"):
+        handler._logger.metrics_namespace = namespace
+        stream = StringIO()
+        capture = logging.StreamHandler(stream)
+        handler._logger._logger.addHandler(capture)
+        try:
+            for event in events:
+                handler.handle(event, context)
+        finally:
+            handler._logger._logger.removeHandler(capture)
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        return [line for line in lines if "_aws" in line]
+
+    def test_one_record_per_invocation(self, handler_with_model, mock_context):
+        """Verifica cold start, latencia, features fuera de rango y dimensiones."""
+        events = [
+            {"body": json.dumps({"features": [5.1, 3.5, 1.4, 0.2]})},
+            {"body": json.dumps({"features": [9.5, 3.5, 1.4, 0.2]})},
+        ]
+
+        first, second = self._emf_records(handler_with_model, events, mock_context)
+
+        assert (first["ColdStart"], second["ColdStart"]) == (1, 0)
+        assert (first["OutOfRangeFeatures"], second["OutOfRangeFeatures"]) == (0, 1)
+        assert first["Latency"] > 0
+        assert first["ModelVersion"] == "v1.0.0"
+        assert first["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["ModelId", "ModelVersion"]]
+
+    def test_unknown_models_do_not_create_dimensions(self, handler_with_model, mock_context):
+        """Verifica que un model_id sin resolver no se usa como dimensión."""
+        from ml_lambda import config
+
+        event = {"body": json.dumps({"features": [5.1, 3.5, 1.4, 0.2], "model_id": "x-123"})}
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(config.config, "models_dir", None)
+            (record,) = self._emf_records(handler_with_model, [event], mock_context)
+
+        assert record["status_code"] == 404
+        assert (record["ModelId"], record["ModelVersion"]) == ("unknown", "unknown")
+
+    def test_disabled_by_default(self, handler_with_model, mock_context, monkeypatch):
+        """Verifica que las métricas están desactivadas por defecto."""
+        from ml_lambda.config import METRICS_NAMESPACE_ENV, Config
+
+        monkeypatch.delenv(METRICS_NAMESPACE_ENV, raising=False)
+        event = {"body": json.dumps({"features": [5.1, 3.5, 1.4, 0.2]})}
+        namespace = Config().metrics_namespace
+
+        assert namespace == ""
+        assert self._emf_records(handler_with_model, [event], mock_context, namespace) == []
+
+
 class TestLambdaHandler:
     """Tests para LambdaHandler."""
     
@@ -179,6 +271,42 @@ class TestLambdaHandler:
         assert handler_with_model._model is not None
         assert handler_with_model._predictor is not None
     
+    def test_handle_fuses_saved_scaler(self, iris_data, tmp_path, monkeypatch, mock_context):
+        """Test que un modelo entrenado sobre features escaladas recibe features crudas."""
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+        from ml_lambda.model.serializer import ModelSerializer, ModelMetadata
+        from ml_lambda import config
+        from datetime import datetime
+
+        X, y = iris_data
+        scaler = StandardScaler().fit(X)
+        model = RandomForestClassifier(n_estimators=10, random_state=42)
+        model.fit(scaler.transform(X), y)
+        metadata = ModelMetadata(
+            version="v1.0.0",
+            created_at=datetime.now(),
+            accuracy=0.95,
+            n_features=4,
+            n_classes=3,
+            feature_names=["sepal_length", "sepal_width", "petal_length", "petal_width"],
+            class_names=["setosa", "versicolor", "virginica"],
+            training_config={}
+        )
+        ModelSerializer().save(model, metadata, tmp_path / "model.joblib", scaler=scaler)
+        monkeypatch.setattr(config.config, "artifacts_dir", tmp_path)
+        monkeypatch.setattr(config.config, "model_filename", "model.joblib")
+        handler = LambdaHandler()
+        features = [6.7, 3.0, 5.2, 2.3]
+
+        response = handler.handle({"body": json.dumps({"features": features})}, mock_context)
+
+        body = json.loads(response["body"])
+        expected = model.predict_proba(scaler.transform([features]))[0]
+        assert body["prediction"] == int(model.predict(scaler.transform([features]))[0])
+        assert body["probabilities"] == pytest.approx(expected.tolist())
+        assert handler._model is not model
+
     def test_cors_headers_present(self, handler_with_model, mock_context):
         """Test que los headers CORS están presentes."""
         event = {
@@ -0,0 +1,51 @@
+"""Tests unitarios para el cálculo de hashes de artefactos."""
+
+import hashlib
+
+import joblib
+import numpy as np
+
+from ml_lambda.utils.hashing import HashingWriter, compute_file_hash
+
+
+class TestHashingWriter:
+    """Tests para HashingWriter."""
+
+    def test_digest_matches_written_file(self, tmp_path):
+        """Verifica que el hash coincide con el archivo escrito."""
+        path = tmp_path / "artifact.bin"
+        with path.open("wb") as output:
+            writer = HashingWriter(output)
+            writer.write(b"header")
+            writer.write(bytes(range(256)) * 1000)
+            assert writer.tell() == 6 + 256_000
+
+        assert writer.hexdigest() == hashlib.sha256(path.read_bytes()).hexdigest()
+
+    def test_joblib_dump_through_writer_keeps_arrays_loadable(self, tmp_path):
+        """Verifica que joblib serializa arrays alineados a través del writer."""
+        path = tmp_path / "model.joblib"
+        data = {"weights": np.arange(1000, dtype=np.float64)}
+        with path.open("wb") as output:
+            writer = HashingWriter(output)
+            joblib.dump(data, writer)
+
+        assert writer.hexdigest() == hashlib.sha256(path.read_bytes()).hexdigest()
+        loaded = joblib.load(path, mmap_mode="r")
+        np.testing.assert_array_equal(loaded["weights"], data["weights"])
+
+
+class TestComputeFileHash:
+    """Tests para compute_file_hash."""
+
+    def test_matches_hashlib_across_buffer_boundaries(self, tmp_path):
+        """Verifica el hash con lecturas parciales del buffer."""
+        path = tmp_path / "artifact.bin"
+        path.write_bytes(bytes(range(256)) * 41)
+
+        assert compute_file_hash(path, buffer_size=1000) == hashlib.sha256(
+            path.read_bytes()
+        ).hexdigest()
+        assert compute_file_hash(path, algorithm="md5") == hashlib.md5(
+            path.read_bytes()
+        ).hexdigest()
@@ -0,0 +1,82 @@
+"""Tests unitarios para los histogramas de latencia."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from ml_lambda.utils.histogram import LatencyHistogram, StageLatencyRecorder
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyHistogram:
+    """Tests para LatencyHistogram."""
+
+    def test_percentiles_within_relative_precision(self):
+        """Verifica que los percentiles tienen error relativo menor que 1%."""
+        rng = np.random.default_rng(0)
+        values = rng.lognormal(mean=0.0, sigma=1.5, size=20_000)
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for percentile in (50, 90, 99, 99.9):
+            expected = np.percentile(values, percentile, method="inverted_cdf")
+            assert histogram.percentile(percentile) == pytest.approx(expected, rel=0.01, abs=0.001)
+        assert histogram.count == len(values)
+        assert histogram.max_ms == pytest.approx(values.max())
+        assert histogram.mean_ms == pytest.approx(values.mean())
+
+    def test_memory_is_fixed(self):
+        """Verifica que el número de buckets no depende de los valores."""
+        histogram = LatencyHistogram(highest_ms=60_000)
+        buckets = len(histogram._counts)
+        for value in (0.001, 5.0, 59_999.0, 10**9):
+            histogram.record(value)
+
+        assert len(histogram._counts) == buckets < 4000
+        # Los valores por encima de highest_ms se acotan en los percentiles
+        assert histogram.percentile(100) == pytest.approx(60_000, rel=0.01)
+        assert histogram.max_ms == 10**9
+
+    def test_empty_histogram(self):
+        """Verifica el resumen sin valores."""
+        summary = LatencyHistogram().summary()
+
+        assert summary["count"] == 0
+        assert summary["p99_ms"] == 0.0
+
+
+class TestStageLatencyRecorder:
+    """Tests para StageLatencyRecorder."""
+
+    def test_flushes_one_record_per_interval(self):
+        """Verifica que se registra un único resumen por ventana."""
+        clock = _Clock()
+        logger = Mock()
+        recorder = StageLatencyRecorder(flush_interval=60, logger=logger, clock=clock)
+
+        for i in range(100):
+            recorder.record({"parse": 0.05, "predict": 1.0 + i / 100})
+        logger.info.assert_not_called()
+
+        clock.now = 61
+        recorder.record({"parse": 0.05, "predict": 2.0})
+
+        logger.info.assert_called_once()
+        record = logger.info.call_args
+        assert record.args[0] == "stage_latency"
+        assert record.kwargs["invocations"] == 101
+        assert record.kwargs["stages"]["predict"]["count"] == 101
+        assert record.kwargs["stages"]["predict"]["max_ms"] == 2.0
+
+        # La ventana siguiente empieza vacía
+        recorder.flush()
+        assert logger.info.call_count == 1
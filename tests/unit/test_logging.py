@@ -164,3 +164,52 @@ class TestStructuredLoggerFields:
         
         assert "logger" in parsed
         assert parsed["logger"] == "test_logger"
+
+
+class TestEmbeddedMetrics:
+    """Tests for CloudWatch Embedded Metric Format output."""
+
+    def test_flush_writes_emf_record(self, logger_with_capture):
+        """Verify buffered metrics are written as one EMF record."""
+        logger, stream = logger_with_capture
+        logger.put_metric("Latency", 1.5, "Milliseconds")
+        logger.put_metric("Latency", 2.5, "Milliseconds")
+        logger.put_metric("ColdStart", 0, "Count")
+        logger.set_dimensions(ModelVersion="v1.0.0")
+        assert stream.getvalue() == ""
+
+        logger.flush_metrics(request_id="req-1")
+
+        record = json.loads(stream.getvalue())
+        directive = record["_aws"]["CloudWatchMetrics"][0]
+        assert directive["Namespace"] == "MLLambda"
+        assert directive["Dimensions"] == [["ModelVersion"]]
+        assert directive["Metrics"] == [
+            {"Name": "Latency", "Unit": "Milliseconds"},
+            {"Name": "ColdStart", "Unit": "Count"},
+        ]
+        assert record["Latency"] == [1.5, 2.5]
+        assert record["ColdStart"] == 0
+        assert record["ModelVersion"] == "v1.0.0"
+        assert record["request_id"] == "req-1"
+
+    def test_flush_empties_buffer(self, logger_with_capture):
+        """Verify a flush without new metrics writes nothing."""
+        logger, stream = logger_with_capture
+        logger.put_metric("Latency", 1.0, "Milliseconds")
+        logger.flush_metrics()
+        logger.flush_metrics()
+
+        assert len(stream.getvalue().strip().splitlines()) == 1
+
+    def test_long_metric_arrays_are_split(self, logger_with_capture):
+        """Verify metrics with more than 100 values span several records."""
+        logger, stream = logger_with_capture
+        for i in range(150):
+            logger.put_metric("Latency", float(i), "Milliseconds")
+        logger.put_metric("ColdStart", 1, "Count")
+        logger.flush_metrics()
+
+        records = [json.loads(line) for line in stream.getvalue().strip().splitlines()]
+        assert [len(r["Latency"]) for r in records] == [100, 50]
+        assert "ColdStart" in records[0] and "ColdStart" not in records[1]
@@ -0,0 +1,213 @@
+"""Tests unitarios para la recarga en caliente del modelo."""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sklearn.dummy import DummyClassifier
+
+from ml_lambda.inference.handler import LambdaHandler
+from ml_lambda.inference.model_source import (
+    LocalModelSource,
+    ModelWatcher,
+    S3ModelSource,
+    model_source_from_uri,
+)
+from ml_lambda.inference.registry import load_model
+from ml_lambda.model.serializer import ModelMetadata, ModelSerializer
+
+EVENT = {"body": json.dumps({"features": [5.1, 3.5, 1.4, 0.2]})}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _save_constant_model(path, predicted_class):
+    """Guarda un modelo que siempre predice la misma clase (reemplazo atómico)."""
+    X = np.zeros((3, 4))
+    model = DummyClassifier(strategy="constant", constant=predicted_class).fit(X, [0, 1, 2])
+    metadata = ModelMetadata(
+        version=f"v{predicted_class}",
+        created_at=datetime.now(),
+        accuracy=1.0,
+        n_features=4,
+        n_classes=3,
+        feature_names=["sepal_length", "sepal_width", "petal_length", "petal_width"],
+        class_names=["setosa", "versicolor", "virginica"],
+        training_config={},
+    )
+    partial = path.with_suffix(".partial")
+    ModelSerializer().save(model, metadata, partial)
+    os.replace(partial, path)
+
+
+def _prediction(handler):
+    response = handler.handle(EVENT, None)
+    assert response["statusCode"] == 200
+    return json.loads(response["body"])["prediction"]
+
+
+class TestModelSource:
+    """Tests para los orígenes del modelo."""
+
+    def test_local_etag_changes_with_new_version(self, tmp_path):
+        """Verifica que el etag local cambia al reemplazar el archivo."""
+        path = tmp_path / "model.joblib"
+        source = LocalModelSource(path)
+        assert source.etag() is None
+
+        _save_constant_model(path, 0)
+        first = source.etag()
+        _save_constant_model(path, 1)
+        os.utime(path, ns=(1, 1))
+
+        assert first is not None and source.etag() != first
+        assert source.fetch(source.etag()) == path
+
+    def test_source_from_uri(self, tmp_path):
+        """Verifica la elección de origen según la URI."""
+        s3_source = model_source_from_uri("s3://models/iris/model.joblib")
+
+        assert isinstance(s3_source, S3ModelSource)
+        assert (s3_source.bucket, s3_source.key) == ("models", "iris/model.joblib")
+        assert isinstance(model_source_from_uri(str(tmp_path)), LocalModelSource)
+        with pytest.raises(ValueError):
+            S3ModelSource.from_uri("s3://bucket-only")
+
+
+class TestModelWatcher:
+    """Tests para ModelWatcher."""
+
+    def test_checks_at_most_once_per_interval(self, tmp_path):
+        """Verifica que el origen solo se consulta al vencer el intervalo."""
+        checks = []
+
+        class CountingSource(LocalModelSource):
+            def etag(self):
+                checks.append(1)
+                return super().etag()
+
+        path = tmp_path / "model.joblib"
+        _save_constant_model(path, 0)
+        clock = _Clock()
+        watcher = ModelWatcher(
+            CountingSource(path), loader=str, on_swap=None, check_interval=30, clock=clock
+        )
+        watcher.load_initial()
+
+        for now in (0, 10, 29.9, 30, 31, 59, 60):
+            clock.now = now
+            watcher.maybe_refresh()
+            watcher.wait()
+
+        assert len(checks) == 3
+
+
+class TestHotSwap:
+    """Tests para el reemplazo del modelo en LambdaHandler."""
+
+    def test_new_model_is_swapped_without_blocking_requests(self, tmp_path):
+        """Verifica que el modelo anterior sirve mientras se carga el nuevo."""
+        path = tmp_path / "model.joblib"
+        _save_constant_model(path, 0)
+        handler = LambdaHandler(model_source=LocalModelSource(path), check_interval=0.05)
+        assert _prediction(handler) == 0
+
+        loading, release = threading.Event(), threading.Event()
+        load_model = handler._load_model
+
+        def slow_load(model_path):
+            loading.set()
+            release.wait(5)
+            return load_model(model_path)
+
+        handler._watcher._loader = slow_load
+        _save_constant_model(path, 2)
+        os.utime(path, ns=(2, 2))
+        time.sleep(0.1)
+
+        assert _prediction(handler) == 0
+        assert loading.wait(5)
+        assert _prediction(handler) == 0
+
+        release.set()
+        handler._watcher.wait(5)
+
+        assert _prediction(handler) == 2
+        assert handler._metadata.version == "v2"
+
+    def test_swap_between_reads_keeps_prediction_and_version_consistent(self, tmp_path):
+        """Verifica que un swap a mitad de _prepare no mezcla modelo y versión."""
+        _save_constant_model(tmp_path / "v0.joblib", 0)
+        _save_constant_model(tmp_path / "v2.joblib", 2)
+        handler = LambdaHandler(model_source=LocalModelSource(tmp_path / "v0.joblib"))
+        handler.warm_up()
+        current, new = handler._loaded, load_model(tmp_path / "v2.joblib")
+
+        class SwapOnRead:
+            """El watcher publica el modelo nuevo justo al leer el Predictor."""
+
+            metadata = current.metadata
+
+            @property
+            def predictor(self):
+                handler._swap_model(new, None)
+                return current.predictor
+
+        handler._loaded = SwapOnRead()
+        served = []
+        complete = handler._complete
+
+        def record(invocation, result):
+            served.append((result.prediction, invocation.model_version))
+            return complete(invocation, result)
+
+        handler._complete = record
+
+        assert _prediction(handler) == 0
+        assert _prediction(handler) == 2
+        assert served == [(0, "v0"), (2, "v2")]
+
+    def test_failed_reload_keeps_serving_current_model(self, tmp_path):
+        """Verifica que un modelo nuevo corrupto no reemplaza al actual."""
+        path = tmp_path / "model.joblib"
+        _save_constant_model(path, 1)
+        handler = LambdaHandler(model_source=LocalModelSource(path), check_interval=0.05)
+        assert _prediction(handler) == 1
+
+        path.write_bytes(b"not a model")
+        time.sleep(0.1)
+        _prediction(handler)
+        handler._watcher.wait(5)
+
+        assert _prediction(handler) == 1
+        _save_constant_model(path, 2)
+        os.utime(path, ns=(3, 3))
+        time.sleep(0.1)
+        _prediction(handler)
+        handler._watcher.wait(5)
+
+        assert _prediction(handler) == 2
+
+    def test_hot_swap_disabled_by_default(self, tmp_path):
+        """Verifica que sin intervalo el modelo no se vuelve a comprobar."""
+        path = tmp_path / "model.joblib"
+        _save_constant_model(path, 1)
+        handler = LambdaHandler(model_source=LocalModelSource(path), check_interval=0)
+        assert _prediction(handler) == 1
+
+        _save_constant_model(path, 2)
+        os.utime(path, ns=(4, 4))
+        handler._watcher._next_check = 0
+
+        assert _prediction(handler) == 1
+        assert handler._watcher._thread is None
@@ -1,14 +1,23 @@
 """Tests unitarios para la creación de paquetes Lambda."""
 
 import hashlib
+import importlib.util
+import json
+import os
+import sys
 import zipfile
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 from ml_lambda.deploy import packager as packager_module
 from ml_lambda.deploy.packager import PackageBuilder
+from ml_lambda.deploy.slimming import SlimmingConfig
 from ml_lambda.utils.exceptions import PackageTooLargeError
 
+# Runtime que coincide con el intérprete de los tests (los .pyc se compilan)
+BUILD_RUNTIME = f"python{sys.version_info.major}.{sys.version_info.minor}"
+
 
 def _build_without_dependencies(
     builder: PackageBuilder, source_dir: Path, model_path: Path, output_path: Path
@@ -36,18 +45,44 @@ class TestPackageBuilder:
         output_path = tmp_path / "build" / "deployment.zip"
 
         package_info = _build_without_dependencies(
-            PackageBuilder(), source_dir, model_path, output_path
+            PackageBuilder(runtime=BUILD_RUNTIME), source_dir, model_path, output_path
         )
 
         with zipfile.ZipFile(output_path) as package:
             names = set(package.namelist())
+            bytecode = package.read(importlib.util.cache_from_source("ml_lambda/handler.py"))
 
-        assert names == {"ml_lambda/handler.py", "artifacts/model.joblib"}
+        # Solo el .pyc generado en el build; los .pyc de la fuente se excluyen
+        assert names == {
+            "ml_lambda/handler.py",
+            importlib.util.cache_from_source("ml_lambda/handler.py"),
+            "artifacts/model.joblib",
+        }
+        assert bytecode[:4] == importlib.util.MAGIC_NUMBER
+        assert int.from_bytes(bytecode[4:8], "little") == 0b01  # unchecked-hash
         assert package_info.included_files == sorted(names)
         assert package_info.path == output_path
         assert package_info.size_bytes == output_path.stat().st_size
         assert package_info.sha256_hash == hashlib.sha256(output_path.read_bytes()).hexdigest()
 
+    def test_identical_inputs_produce_identical_packages(self, tmp_path):
+        source_dir = tmp_path / "src"
+        (source_dir / "ml_lambda").mkdir(parents=True)
+        (source_dir / "ml_lambda" / "handler.py").write_text("def handle():\n    return 1\n")
+        model_path = tmp_path / "model.joblib"
+        model_path.write_bytes(b"serialized model")
+
+        first = _build_without_dependencies(
+            PackageBuilder(runtime=BUILD_RUNTIME), source_dir, model_path, tmp_path / "first.zip"
+        )
+        for path in (source_dir / "ml_lambda" / "handler.py", model_path):
+            os.utime(path, (1_700_000_000, 1_700_000_000))
+        second = _build_without_dependencies(
+            PackageBuilder(runtime=BUILD_RUNTIME), source_dir, model_path, tmp_path / "second.zip"
+        )
+
+        assert first.sha256_hash == second.sha256_hash
+
     def test_build_rejects_packages_over_size_limit(self, tmp_path):
         source_dir = tmp_path / "src"
         source_dir.mkdir()
@@ -64,6 +99,23 @@ class TestPackageBuilder:
 
         assert not output_path.exists()
 
+    def test_report_is_written_even_when_package_is_too_large(self, tmp_path):
+        source_dir = tmp_path / "src"
+        source_dir.mkdir()
+        (source_dir / "payload.bin").write_bytes(bytes(range(256)) * 100)
+        model_path = tmp_path / "model.joblib"
+        model_path.write_bytes(b"model")
+        report_path = tmp_path / "report.json"
+
+        builder = PackageBuilder(report_path=report_path, report_imports=False)
+        builder.MAX_SIZE_MB = 0.0001
+
+        with pytest.raises(PackageTooLargeError):
+            _build_without_dependencies(builder, source_dir, model_path, tmp_path / "p.zip")
+
+        report = json.loads(report_path.read_text())
+        assert report["directories"]["."]["uncompressed_bytes"] == 25600
+
     def test_build_requires_source_and_model(self, tmp_path):
         builder = PackageBuilder()
         model_path = tmp_path / "model.joblib"
@@ -77,6 +129,226 @@ class TestPackageBuilder:
         with pytest.raises(FileNotFoundError, match="Model file"):
             builder.build(source_dir, tmp_path / "missing.joblib", tmp_path / "package.zip")
 
+    def test_dependency_cache_is_reused_across_builds(self, tmp_path):
+        source_dir = tmp_path / "src"
+        (source_dir / "ml_lambda").mkdir(parents=True)
+        (source_dir / "ml_lambda" / "handler.py").write_text("handler = True")
+        model_path = tmp_path / "model.joblib"
+        model_path.write_bytes(b"model v1")
+        lock_path = tmp_path / "poetry.lock"
+        lock_path.write_text("numpy 1.26.4")
+
+        installs = []
+
+        def fake_install(target_dir):
+            installs.append(target_dir)
+            (target_dir / "numpy").mkdir()
+            (target_dir / "numpy" / "__init__.py").write_text("version = 1")
+
+        builder = PackageBuilder(
+            cache_dir=tmp_path / "cache", lock_path=lock_path, compile_bytecode=False
+        )
+        builder._install_dependencies = fake_install
+
+        builder.build(source_dir, model_path, tmp_path / "first.zip")
+        model_path.write_bytes(b"model v2")
+        builder.build(source_dir, model_path, tmp_path / "second.zip")
+
+        assert len(installs) == 1
+        with zipfile.ZipFile(tmp_path / "second.zip") as package:
+            assert set(package.namelist()) == {
+                "numpy/__init__.py",
+                "ml_lambda/handler.py",
+                "artifacts/model.joblib",
+            }
+            assert package.read("artifacts/model.joblib") == b"model v2"
+
+        lock_path.write_text("numpy 2.0.0")
+        builder.build(source_dir, model_path, tmp_path / "third.zip")
+
+        assert len(installs) == 2
+        assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    def test_layers_split_dependencies_code_and_model(self, tmp_path):
+        source_dir = tmp_path / "src"
+        (source_dir / "ml_lambda").mkdir(parents=True)
+        (source_dir / "ml_lambda" / "handler.py").write_text("handler = True")
+        model_path = tmp_path / "model.joblib"
+        model_path.write_bytes(b"model v1")
+        lock_path = tmp_path / "poetry.lock"
+        lock_path.write_text("numpy 1.26.4")
+        output_dir = tmp_path / "layers"
+
+        installs = []
+
+        def fake_install(target_dir):
+            installs.append(target_dir)
+            (target_dir / "numpy").mkdir()
+            (target_dir / "numpy" / "__init__.py").write_text("version = 1")
+
+        builder = PackageBuilder(lock_path=lock_path, compile_bytecode=False)
+        builder._install_dependencies = fake_install
+
+        first = builder.build_layers(source_dir, model_path, output_dir)
+
+        with zipfile.ZipFile(first.dependencies.path) as layer:
+            assert layer.namelist() == ["python/numpy/__init__.py"]
+        with zipfile.ZipFile(first.code.path) as code:
+            assert code.namelist() == ["ml_lambda/handler.py"]
+        with zipfile.ZipFile(first.model.path) as model:
+            assert model.read("artifacts/model.joblib") == b"model v1"
+
+        manifest = json.loads(first.manifest_path.read_text())
+        assert manifest == first.to_manifest()
+        assert manifest["environment"] == {"ML_LAMBDA_ARTIFACTS_DIR": "/opt/artifacts"}
+        assert manifest["artifacts"]["model"]["file"] == first.model.path.name
+        assert manifest["artifacts"]["model"]["sha256"] == first.model.sha256_hash
+
+        model_path.write_bytes(b"model v2")
+        second = builder.build_layers(source_dir, model_path, output_dir)
+
+        # Solo cambia el artefacto del modelo; la capa de dependencias se reutiliza
+        assert len(installs) == 1
+        assert second.dependencies.path == first.dependencies.path
+        assert second.dependencies.sha256_hash == first.dependencies.sha256_hash
+        assert second.code.path == first.code.path
+        assert second.model.path != first.model.path
+        assert first.model.path.exists()
+
+        lock_path.write_text("numpy 2.0.0")
+        third = builder.build_layers(source_dir, model_path, output_dir)
+
+        assert len(installs) == 2
+        assert third.dependencies.path != first.dependencies.path
+
+    def test_layers_reject_pruning(self, tmp_path):
+        source_dir = tmp_path / "src"
+        source_dir.mkdir()
+        model_path = tmp_path / "model.joblib"
+        model_path.write_bytes(b"model")
+
+        builder = PackageBuilder(slimming=SlimmingConfig(prune_unused=True))
+
+        with pytest.raises(ValueError):
+            builder.build_layers(source_dir, model_path, tmp_path / "layers")
+
+    def test_failed_install_does_not_leave_cache_entry(self, tmp_path):
+        source_dir = tmp_path / "src"
+        source_dir.mkdir()
+        model_path = tmp_path / "model.joblib"
+        model_path.write_bytes(b"model")
+        lock_path = tmp_path / "poetry.lock"
+        lock_path.write_text("lock")
+
+        def failing_install(target_dir):
+            (target_dir / "partial.py").write_text("")
+            raise packager_module.subprocess.CalledProcessError(1, "pip")
+
+        builder = PackageBuilder(cache_dir=tmp_path / "cache", lock_path=lock_path)
+        builder._install_dependencies = failing_install
+
+        with pytest.raises(packager_module.subprocess.CalledProcessError):
+            builder.build(source_dir, model_path, tmp_path / "package.zip")
+
+        assert list((tmp_path / "cache").iterdir()) == []
+
+    def test_build_slims_dependencies_and_prunes_untraced_modules(self, tmp_path, monkeypatch):
+        source_dir = tmp_path / "src"
+        (source_dir / "ml_lambda").mkdir(parents=True)
+        (source_dir / "ml_lambda" / "handler.py").write_text("handler = True")
+        model_path = tmp_path / "model.joblib"
+        model_path.write_bytes(b"model")
+
+        def fake_install(target_dir):
+            (target_dir / "fakelib").mkdir()
+            for name in ("__init__.py", "used.py", "unused.py", "stubs.pyi"):
+                (target_dir / "fakelib" / name).write_text("")
+
+        monkeypatch.setattr(
+            packager_module,
+            "trace_imports",
+            lambda dependencies_dir, staging_dir, features: {"fakelib/used.py"},
+        )
+        builder = PackageBuilder(
+            slimming=SlimmingConfig(prune_unused=True), compile_bytecode=False
+        )
+        builder._install_dependencies = fake_install
+
+        package_info = builder.build(source_dir, model_path, tmp_path / "package.zip")
+
+        assert package_info.included_files == [
+            "artifacts/model.joblib",
+            "fakelib/__init__.py",
+            "fakelib/used.py",
+            "ml_lambda/handler.py",
+        ]
+
+    def test_bytecode_follows_exclusions_and_pruning(self, tmp_path, monkeypatch):
+        source_dir = tmp_path / "src"
+        (source_dir / "ml_lambda").mkdir(parents=True)
+        (source_dir / "ml_lambda" / "handler.py").write_text("handler = True")
+        model_path = tmp_path / "model.joblib"
+        model_path.write_bytes(b"model")
+
+        def fake_install(target_dir):
+            for name in ("__init__.py", "used.py", "unused.py", "tests/test_used.py"):
+                (target_dir / "fakelib" / name).parent.mkdir(parents=True, exist_ok=True)
+                (target_dir / "fakelib" / name).write_text("")
+
+        monkeypatch.setattr(
+            packager_module,
+            "trace_imports",
+            lambda dependencies_dir, staging_dir, features: {"fakelib/used.py"},
+        )
+        builder = PackageBuilder(
+            slimming=SlimmingConfig(remove_tests=False, prune_unused=True), runtime=BUILD_RUNTIME
+        )
+        builder._install_dependencies = fake_install
+
+        package_info = builder.build(source_dir, model_path, tmp_path / "package.zip")
+
+        pyc = importlib.util.cache_from_source
+        assert set(package_info.included_files) == {
+            "artifacts/model.joblib",
+            "fakelib/__init__.py",
+            pyc("fakelib/__init__.py"),
+            "fakelib/used.py",
+            pyc("fakelib/used.py"),
+            "ml_lambda/handler.py",
+            pyc("ml_lambda/handler.py"),
+        }
+
+    def test_bytecode_is_skipped_for_a_different_runtime(self, tmp_path, monkeypatch):
+        source_dir = tmp_path / "src"
+        (source_dir / "ml_lambda").mkdir(parents=True)
+        (source_dir / "ml_lambda" / "handler.py").write_text("handler = True")
+        model_path = tmp_path / "model.joblib"
+        model_path.write_bytes(b"model")
+        logger = Mock()
+        monkeypatch.setattr(packager_module, "logger", logger)
+
+        package_info = _build_without_dependencies(
+            PackageBuilder(runtime="python2.7"), source_dir, model_path, tmp_path / "package.zip"
+        )
+
+        assert package_info.included_files == ["artifacts/model.joblib", "ml_lambda/handler.py"]
+        assert logger.warning.call_args.args[0] == "bytecode_compilation_skipped"
+        assert logger.warning.call_args.kwargs["runtime"] == "python2.7"
+        assert (
+            PackageBuilder(runtime="python2.7").dependency_cache_key()
+            != PackageBuilder(runtime=BUILD_RUNTIME).dependency_cache_key()
+        )
+
+    def test_bytecode_compilation_errors_are_logged(self, tmp_path, monkeypatch):
+        (tmp_path / "broken.py").write_text("def broken(:\n")
+        logger = Mock()
+        monkeypatch.setattr(packager_module, "logger", logger)
+
+        PackageBuilder(runtime=BUILD_RUNTIME)._compile_bytecode(tmp_path)
+
+        assert logger.warning.call_args.args[0] == "bytecode_compilation_failed"
+        assert "broken.py" in logger.warning.call_args.kwargs["stdout"]
+
     def test_production_requirements_fall_back_when_export_is_unavailable(self, monkeypatch):
         calls = []
 
@@ -3,7 +3,7 @@
 import numpy as np
 import pytest
 
-from ml_lambda.data.processor import DataProcessor, DatasetStats
+from ml_lambda.data.processor import DataProcessor, DatasetStats, StatsAccumulator
 from ml_lambda.utils.exceptions import DataValidationError
 
 
@@ -151,3 +151,222 @@ class TestDataProcessorComputeStats:
         # Iris tiene 50 muestras por clase
         for class_id, count in stats.class_distribution.items():
             assert count == 50
+
+    def test_compute_stats_moments_and_quantiles(self):
+        """Verifica media, varianza y cuantiles frente a numpy."""
+        processor = DataProcessor()
+        X, y = processor.load_iris()
+        stats = processor.compute_stats(X, y)
+
+        np.testing.assert_allclose(stats.feature_means, X.mean(axis=0))
+        np.testing.assert_allclose(stats.feature_variances, X.var(axis=0))
+        np.testing.assert_allclose(stats.feature_quantiles[0.5], np.median(X, axis=0))
+        assert stats.feature_ranges == list(zip(X.min(axis=0), X.max(axis=0)))
+
+    def test_compute_stats_non_integer_labels(self):
+        """Verifica la distribución con labels que no admiten bincount."""
+        X = np.arange(8, dtype=float).reshape(4, 2)
+        y = np.array([-1.0, 1.0, 1.0, -1.0])
+
+        stats = DataProcessor().compute_stats(X, y)
+
+        assert stats.class_distribution == {-1: 2, 1: 2}
+
+
+class TestStatsAccumulator:
+    """Tests para la combinación de estadísticas por bloques."""
+
+    def test_merge_matches_single_pass(self):
+        """Verifica que combinar acumuladores parciales equivale a una pasada."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(loc=1e6, scale=3.0, size=(5000, 3))
+        y = rng.integers(0, 4, size=5000)
+
+        left = StatsAccumulator().update(X[:1234], y[:1234])
+        right = StatsAccumulator().update(X[1234:3000], y[1234:3000]).update(X[3000:], y[3000:])
+        merged = left.merge(right).result()
+
+        np.testing.assert_allclose(merged.feature_means, X.mean(axis=0))
+        np.testing.assert_allclose(merged.feature_variances, X.var(axis=0), rtol=1e-9)
+        assert merged.class_distribution == dict(zip(*np.unique(y, return_counts=True)))
+        assert merged.n_samples == 5000
+
+    def test_quantile_sketch_is_bounded(self):
+        """Verifica que el sketch retiene como máximo sample_size filas."""
+        rng = np.random.default_rng(1)
+        accumulator = StatsAccumulator(sample_size=500, random_state=0)
+        for _ in range(10):
+            accumulator.update(rng.uniform(size=(1000, 2)), np.zeros(1000, dtype=int))
+
+        stats = accumulator.result()
+
+        assert len(accumulator._sample) == 500
+        np.testing.assert_allclose(stats.feature_quantiles[0.5], [0.5, 0.5], atol=0.08)
+
+    def test_merge_rejects_feature_mismatch(self):
+        """Verifica que no se combinan datasets con distinto número de features."""
+        first = StatsAccumulator().update(np.zeros((2, 3)), np.zeros(2, dtype=int))
+        second = StatsAccumulator().update(np.zeros((2, 4)), np.zeros(2, dtype=int))
+
+        with pytest.raises(DataValidationError, match="inconsistente"):
+            first.merge(second)
+
+    def test_result_on_empty_accumulator_raises(self):
+        """Verifica que un acumulador vacío no produce estadísticas."""
+        with pytest.raises(DataValidationError, match="vacío"):
+            StatsAccumulator().result()
+
+
+class TestDataProcessorChunked:
+    """Tests para la lectura y el procesamiento por bloques."""
+
+    @pytest.fixture
+    def iris_sources(self, tmp_path):
+        """Iris escrito como CSV (con cabecera) y como .npy, label al final."""
+        X, y = DataProcessor().load_iris()
+        rows = np.column_stack([X, y])
+        csv_path = tmp_path / "iris.csv"
+        np.savetxt(csv_path, rows, delimiter=",", header="a,b,c,d,label", comments="")
+        npy_path = tmp_path / "iris.npy"
+        np.save(npy_path, rows)
+        return X, y, csv_path, npy_path
+
+    @pytest.mark.parametrize("source_name", ["csv", "npy"])
+    def test_iter_chunks_reassembles_dataset(self, iris_sources, source_name):
+        """Verifica que los bloques reconstruyen el dataset original."""
+        X, y, csv_path, npy_path = iris_sources
+        source, skip = (csv_path, 1) if source_name == "csv" else (npy_path, 0)
+
+        chunks = list(DataProcessor().iter_chunks(source, chunk_size=40, skip_header=skip))
+
+        assert [len(X_chunk) for X_chunk, _ in chunks] == [40, 40, 40, 30]
+        np.testing.assert_allclose(np.vstack([c[0] for c in chunks]), X)
+        np.testing.assert_array_equal(np.concatenate([c[1] for c in chunks]), y)
+
+    def test_iter_chunks_rejects_nulls(self, tmp_path):
+        """Verifica que un campo vacío en el CSV se detecta como nulo."""
+        csv_path = tmp_path / "nulls.csv"
+        csv_path.write_text("1.0,2.0,0\n3.0,,1\n")
+
+        with pytest.raises(DataValidationError, match="nulos"):
+            list(DataProcessor().iter_chunks(csv_path))
+
+    def test_iter_chunks_rejects_unknown_format(self, tmp_path):
+        """Verifica que solo se aceptan fuentes CSV o .npy."""
+        with pytest.raises(DataValidationError, match="no soportado"):
+            list(DataProcessor().iter_chunks(tmp_path / "data.parquet"))
+
+    def test_compute_stats_chunked_matches_in_memory(self, iris_sources):
+        """Verifica que las estadísticas incrementales coinciden con compute_stats."""
+        X, y, _, npy_path = iris_sources
+        processor = DataProcessor()
+
+        streamed = processor.compute_stats_chunked(processor.iter_chunks(npy_path, chunk_size=7))
+        expected = processor.compute_stats(X, y)
+
+        assert streamed.n_samples == expected.n_samples
+        assert streamed.n_features == expected.n_features
+        assert streamed.n_classes == expected.n_classes
+        assert streamed.class_distribution == expected.class_distribution
+        assert streamed.feature_ranges == expected.feature_ranges
+
+    def test_fit_scaler_chunked_matches_full_fit(self, iris_sources):
+        """Verifica que partial_fit por bloques equivale a ajustar con todo."""
+        X, _, _, npy_path = iris_sources
+        processor = DataProcessor()
+
+        scaler = processor.fit_scaler_chunked(processor.iter_chunks(npy_path, chunk_size=16))
+
+        reference = DataProcessor()
+        reference.normalize(X, fit=True)
+        np.testing.assert_allclose(scaler.mean_, reference.scaler.mean_)
+        np.testing.assert_allclose(scaler.scale_, reference.scaler.scale_)
+        assert processor.scaler is scaler
+
+    def test_split_chunks_is_reproducible_and_complete(self, iris_sources):
+        """Verifica que la división por bloques conserva muestras y proporción."""
+        _, _, _, npy_path = iris_sources
+        processor = DataProcessor(test_size=0.2, random_state=7)
+
+        first = list(processor.split_chunks(processor.iter_chunks(npy_path, chunk_size=50)))
+        second = list(processor.split_chunks(processor.iter_chunks(npy_path, chunk_size=50)))
+
+        n_train = sum(len(part[0]) for part in first)
+        n_test = sum(len(part[1]) for part in first)
+        assert (n_train, n_test) == (120, 30)
+        for part_a, part_b in zip(first, second):
+            for array_a, array_b in zip(part_a, part_b):
+                np.testing.assert_array_equal(array_a, array_b)
+
+
+class TestDataProcessorCache:
+    """Tests para la caché de datos divididos y normalizados."""
+
+    def test_cache_hit_skips_data_stage(self, tmp_path, monkeypatch):
+        """Verifica que una segunda ejecución carga los arrays cacheados."""
+        first = DataProcessor(cache_dir=tmp_path)
+        expected = first.load_split_normalized()
+
+        second = DataProcessor(cache_dir=tmp_path)
+
+        def fail_load():
+            raise AssertionError("load_iris no debe llamarse con la caché caliente")
+
+        monkeypatch.setattr(second, "load_iris", fail_load)
+        cached = second.load_split_normalized()
+
+        for expected_array, cached_array in zip(expected, cached):
+            assert isinstance(cached_array, np.memmap)
+            np.testing.assert_array_equal(cached_array, expected_array)
+        np.testing.assert_array_equal(second.scaler.mean_, first.scaler.mean_)
+
+    def test_cache_key_depends_on_split_settings(self, tmp_path):
+        """Verifica que test_size y random_state forman parte de la clave."""
+        base = DataProcessor(test_size=0.2, random_state=42).cache_key()
+
+        assert DataProcessor(test_size=0.3, random_state=42).cache_key() != base
+        assert DataProcessor(test_size=0.2, random_state=1).cache_key() != base
+        assert DataProcessor(test_size=0.2, random_state=42).cache_key() == base
+
+    def test_cache_key_depends_on_scaler_params(self, tmp_path):
+        """Verifica que la configuración del scaler usado forma parte de la clave."""
+        base = DataProcessor().cache_key()
+        processor = DataProcessor(scaler_params={"with_mean": False})
+
+        assert processor.cache_key() != base
+        assert DataProcessor(scaler_params={"with_mean": True}).cache_key() == base
+
+        X_train, _, _, _ = processor.load_split_normalized()
+        assert processor.scaler.with_mean is False
+        assert not np.allclose(np.asarray(X_train).mean(axis=0), 0.0)
+
+    def test_cache_key_depends_on_source_content(self, tmp_path):
+        """Verifica que la clave cambia cuando cambia el contenido de la fuente."""
+        source = tmp_path / "data.csv"
+        source.write_text("1.0,2.0,0\n3.0,4.0,1\n")
+        processor = DataProcessor()
+        before = processor.cache_key(source)
+
+        source.write_text("1.0,2.0,0\n3.0,5.0,1\n")
+
+        assert processor.cache_key(source) != before
+
+    def test_file_source_is_cached(self, tmp_path):
+        """Verifica la caché con una fuente CSV."""
+        X, y = DataProcessor().load_iris()
+        source = tmp_path / "iris.csv"
+        np.savetxt(source, np.column_stack([X, y]), delimiter=",")
+        cache_dir = tmp_path / "cache"
+
+        X_train, X_test, _, _ = DataProcessor(cache_dir=cache_dir).load_split_normalized(source)
+
+        assert len(X_train) + len(X_test) == 150
+        assert len(list(cache_dir.iterdir())) == 1
+
+    def test_without_cache_dir_nothing_is_written(self, tmp_path, monkeypatch):
+        """Verifica que sin cache_dir no se escribe en disco."""
+        monkeypatch.chdir(tmp_path)
+
+        DataProcessor().load_split_normalized()
+
+        assert list(tmp_path.iterdir()) == []
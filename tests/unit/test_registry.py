@@ -0,0 +1,218 @@
+"""Tests unitarios para el registro multi-modelo."""
+
+import json
+import threading
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sklearn.dummy import DummyClassifier
+
+from ml_lambda.inference.handler import LambdaHandler
+from ml_lambda.inference.registry import ModelRegistry, estimate_memory_bytes, load_model
+from ml_lambda.model.serializer import ModelMetadata, ModelSerializer
+from ml_lambda.utils.exceptions import InputValidationError, ModelNotFoundError
+
+
+def _save_model(models_dir, model_id, version, predicted_class, latest=True):
+    """Guarda un modelo que siempre predice predicted_class."""
+    model = DummyClassifier(strategy="constant", constant=predicted_class)
+    model.fit(np.zeros((3, 4)), [0, 1, 2])
+    metadata = ModelMetadata(
+        version=version,
+        created_at=datetime.now(),
+        accuracy=1.0,
+        n_features=4,
+        n_classes=3,
+        feature_names=["sepal_length", "sepal_width", "petal_length", "petal_width"],
+        class_names=["setosa", "versicolor", "virginica"],
+        training_config={},
+    )
+    ModelSerializer().save(model, metadata, models_dir / model_id / version / "model.joblib")
+    if latest:
+        (models_dir / model_id / "LATEST").write_text(version + "\n")
+
+
+def _sized_loader(size_bytes):
+    """Loader real con un tamaño estimado fijo, para controlar el presupuesto."""
+
+    def loader(path):
+        loaded = load_model(path)
+        loaded.size_bytes = size_bytes
+        return loaded
+
+    return loader
+
+
+class TestModelRegistry:
+    """Tests para ModelRegistry."""
+
+    def test_resolves_latest_and_explicit_versions(self, tmp_path):
+        """Verifica la resolución de versiones y los errores."""
+        _save_model(tmp_path, "customer-a", "v1", 0)
+        _save_model(tmp_path, "customer-a", "v2", 1)
+        registry = ModelRegistry(tmp_path, memory_budget_bytes=10**9)
+
+        assert registry.resolve("customer-a")[0] == "v2"
+        assert registry.get("customer-a", "v1").metadata.version == "v1"
+        with pytest.raises(ModelNotFoundError):
+            registry.get("customer-a", "v3")
+        with pytest.raises(ModelNotFoundError):
+            registry.get("customer-b")
+        for invalid in ("../customer-a", "a/b", 7):
+            with pytest.raises(InputValidationError):
+                registry.get(invalid)
+
+    def test_lru_eviction_respects_memory_budget(self, tmp_path):
+        """Verifica que se descartan los modelos usados hace más tiempo."""
+        for model_id in ("a", "b", "c"):
+            _save_model(tmp_path, model_id, "v1", 0)
+        registry = ModelRegistry(tmp_path, memory_budget_bytes=250, loader=_sized_loader(100))
+
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")
+        registry.get("c")
+
+        assert registry.loaded_models == [("a", "v1"), ("c", "v1")]
+        assert registry.loaded_bytes == 200
+        assert (registry.hits, registry.misses, registry.evictions) == (1, 3, 1)
+
+    def test_lookup_reports_cache_hits(self, tmp_path):
+        """Verifica que lookup indica si el modelo ya estaba cargado."""
+        _save_model(tmp_path, "a", "v1", 0)
+        registry = ModelRegistry(tmp_path, memory_budget_bytes=10**9)
+
+        first, first_hit = registry.lookup("a")
+        second, second_hit = registry.lookup("a", "v1")
+
+        assert (first_hit, second_hit) == (False, True)
+        assert first is second
+
+    def test_slow_load_does_not_block_cached_models(self, tmp_path):
+        """Verifica que la carga de un modelo no bloquea los aciertos de otro."""
+        for model_id in ("a", "b"):
+            _save_model(tmp_path, model_id, "v1", 0)
+        loading, release = threading.Event(), threading.Event()
+        loads = []
+
+        def slow_loader(path):
+            loads.append(path.parent.parent.name)
+            if path.parent.parent.name == "a":
+                loading.set()
+                assert release.wait(5)
+            return load_model(path)
+
+        registry = ModelRegistry(tmp_path, memory_budget_bytes=10**9, loader=slow_loader)
+        registry.get("b")
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.lookup("a")))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        assert loading.wait(5)
+
+        # Con la carga de "a" en curso, "b" se sirve desde la caché
+        assert registry.lookup("b")[1] is True
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert loads == ["b", "a"]
+        assert results[0][0] is results[1][0]
+        assert registry.misses == 2
+
+    def test_failed_load_is_not_cached(self, tmp_path):
+        """Verifica que un error de carga se propaga y la siguiente solicitud reintenta."""
+        _save_model(tmp_path, "a", "v1", 0)
+        calls = []
+
+        def flaky_loader(path):
+            calls.append(path)
+            if len(calls) == 1:
+                raise OSError("read error")
+            return load_model(path)
+
+        registry = ModelRegistry(tmp_path, memory_budget_bytes=10**9, loader=flaky_loader)
+
+        with pytest.raises(OSError):
+            registry.get("a")
+        assert registry.get("a").metadata.version == "v1"
+
+    def test_resolution_is_cached_for_ttl(self, tmp_path):
+        """Verifica que las solicitudes en caliente no releen LATEST hasta el TTL."""
+        _save_model(tmp_path, "a", "v1", 0)
+        now = [0.0]
+        registry = ModelRegistry(
+            tmp_path, memory_budget_bytes=10**9, resolve_ttl=5.0, clock=lambda: now[0]
+        )
+        registry.get("a")
+        _save_model(tmp_path, "a", "v2", 1)
+
+        now[0] = 4.0
+        assert registry.get("a").metadata.version == "v1"
+        now[0] = 5.0
+        assert registry.get("a").metadata.version == "v2"
+
+    def test_model_over_budget_is_kept_alone(self, tmp_path):
+        """Verifica que un modelo mayor que el presupuesto sigue sirviéndose."""
+        for model_id in ("a", "b"):
+            _save_model(tmp_path, model_id, "v1", 0)
+        registry = ModelRegistry(tmp_path, memory_budget_bytes=50, loader=_sized_loader(100))
+
+        registry.get("a")
+        registry.get("b")
+
+        assert registry.loaded_models == [("b", "v1")]
+
+    def test_memory_estimate_counts_array_buffers(self, trained_model):
+        """Verifica que la estimación incluye los arrays del modelo."""
+        array = np.zeros(100_000)
+
+        assert estimate_memory_bytes(array) >= array.nbytes
+        assert estimate_memory_bytes(trained_model) > 10_000
+
+
+class TestHandlerModelSelection:
+    """Tests para la selección de modelo por solicitud en LambdaHandler."""
+
+    def _handle(self, handler, **body):
+        event = {"body": json.dumps({"features": [5.1, 3.5, 1.4, 0.2], **body})}
+        return handler.handle(event, None)
+
+    def test_requests_are_routed_by_model_id(self, tmp_path):
+        """Verifica que cada solicitud usa el modelo y la versión indicados."""
+        _save_model(tmp_path, "customer-a", "v1", 0, latest=False)
+        _save_model(tmp_path, "customer-a", "v2", 1)
+        _save_model(tmp_path, "customer-b", "v1", 2)
+        handler = LambdaHandler(registry=ModelRegistry(tmp_path, memory_budget_bytes=10**9))
+
+        predictions = [
+            json.loads(self._handle(handler, **body)["body"])["prediction"]
+            for body in (
+                {"model_id": "customer-a"},
+                {"model_id": "customer-a", "model_version": "v1"},
+                {"model_id": "customer-b"},
+            )
+        ]
+
+        assert predictions == [1, 0, 2]
+        # El modelo por defecto no se carga para solicitudes con model_id
+        assert handler._predictor is None
+
+    def test_unknown_and_invalid_models(self, tmp_path):
+        """Verifica 404 para modelos inexistentes y 400 para ids inválidos."""
+        handler = LambdaHandler(registry=ModelRegistry(tmp_path, memory_budget_bytes=10**9))
+
+        assert self._handle(handler, model_id="missing")["statusCode"] == 404
+        assert self._handle(handler, model_id="../etc")["statusCode"] == 400
+
+    def test_model_selection_disabled_without_registry(self, monkeypatch):
+        """Verifica que sin registro configurado el model_id no existe."""
+        from ml_lambda import config
+
+        monkeypatch.setattr(config.config, "models_dir", None)
+
+        assert self._handle(LambdaHandler(), model_id="customer-a")["statusCode"] == 404
@@ -0,0 +1,88 @@
+"""Tests unitarios para el reporte de tamaño e importación del paquete."""
+
+import json
+
+import pytest
+
+from ml_lambda.deploy.archive import write_zip
+from ml_lambda.deploy.report import STDLIB_BUCKET, build_report, write_report
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def package_path(tmp_path):
+    """Paquete con una dependencia, su librería vendorizada y el código."""
+    root = tmp_path / "package"
+    _write(root / "fakelib" / "__init__.py", "import json\n")
+    _write(root / "fakelib" / "core" / "engine.py", "x = 1\n" * 1000)
+    _write(root / "fakelib.libs" / "libfake.so", "binary" * 100)
+    _write(root / "fake_lib-1.0.dist-info" / "METADATA", "Name: fake-lib\nVersion: 1.0\n")
+    _write(root / "fake_lib-1.0.dist-info" / "top_level.txt", "fakelib\n")
+    _write(root / "ml_lambda" / "__init__.py", "")
+    _write(
+        root / "ml_lambda" / "lambda_function.py",
+        "import fakelib\n\n"
+        "def lambda_handler(event, context):\n"
+        "    return {'statusCode': 200, 'body': event['body']}\n",
+    )
+    _write(root / "artifacts" / "model.joblib", "model")
+
+    path = tmp_path / "package.zip"
+    write_zip(
+        [(p.relative_to(root).as_posix(), p) for p in sorted(root.rglob("*")) if p.is_file()],
+        path,
+    )
+    return path
+
+
+class TestBuildReport:
+    """Tests para build_report."""
+
+    def test_sizes_are_grouped_by_distribution_and_directory(self, package_path):
+        """Verifica el desglose por distribución y directorio."""
+        report = build_report(package_path)
+
+        assert set(report["distributions"]) == {"fake-lib", "ml_lambda", "artifacts"}
+        fake_lib = report["distributions"]["fake-lib"]
+        assert fake_lib["files"] == 5
+        assert fake_lib["compressed_bytes"] < fake_lib["uncompressed_bytes"]
+        assert list(report["distributions"])[0] == "fake-lib"
+        assert "fakelib/core" in report["directories"]
+        assert report["totals"]["files"] == 8
+        assert report["totals"]["package_bytes"] == package_path.stat().st_size
+        assert report["import_times"] is None
+
+    def test_import_times_are_attributed_to_distributions(self, package_path):
+        """Verifica que el coste de importación se agrupa por distribución."""
+        report = build_report(package_path, import_features=[5.1, 3.5, 1.4, 0.2])
+
+        import_times = report["import_times"]["distributions"]
+        assert {"fake-lib", "ml_lambda", STDLIB_BUCKET} <= set(import_times)
+        assert report["import_times"]["total_us"] == sum(import_times.values())
+        assert report["import_error"] is None
+
+    def test_failed_import_trace_is_recorded(self, package_path, tmp_path):
+        """Verifica que un fallo de importación queda en el reporte."""
+        broken = tmp_path / "broken.zip"
+        entry = tmp_path / "lambda_function.py"
+        entry.write_text("import missing_dependency\n")
+        write_zip([("ml_lambda/lambda_function.py", entry)], broken)
+
+        report = build_report(broken, import_features=[5.1, 3.5, 1.4, 0.2])
+
+        assert report["import_times"] is None
+        assert "missing_dependency" in report["import_error"]
+
+    def test_write_report_is_stable_json(self, package_path, tmp_path):
+        """Verifica que el reporte se escribe con orden estable para diffs."""
+        report = build_report(package_path)
+
+        write_report(report, tmp_path / "first.json")
+        write_report(build_report(package_path), tmp_path / "second.json")
+
+        assert json.loads((tmp_path / "first.json").read_text()) == report
+        assert (tmp_path / "first.json").read_text() == (tmp_path / "second.json").read_text()
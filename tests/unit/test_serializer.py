@@ -3,11 +3,14 @@
 **Validates: Requirements 5.1, 5.2, 5.3, 5.5**
 """
 
+import hashlib
 from datetime import datetime
 
+import numpy as np
 import pytest
 from sklearn.datasets import load_iris
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
 
 from src.ml_lambda.model.serializer import (
     ModelMetadata,
@@ -67,6 +70,7 @@ class TestModelSerializer:
 
         assert isinstance(hash_value, str)
         assert len(hash_value) == 64  # SHA256 hex length
+        assert hash_value == hashlib.sha256(model_path.read_bytes()).hexdigest()
 
     def test_load_returns_serialized_model(
         self, trained_model, sample_metadata, tmp_path
@@ -110,6 +114,31 @@ class TestModelSerializer:
         assert result.metadata.n_features == sample_metadata.n_features
         assert result.metadata.n_classes == sample_metadata.n_classes
 
+    def test_save_and_load_scaler(self, trained_model, sample_metadata, tmp_path):
+        """Verifica que el scaler se guarda junto al modelo."""
+        X, _ = load_iris(return_X_y=True)
+        scaler = StandardScaler().fit(X)
+        serializer = ModelSerializer()
+        model_path = tmp_path / "model.joblib"
+        serializer.save(trained_model, sample_metadata, model_path, scaler=scaler)
+
+        result = serializer.load(model_path)
+
+        np.testing.assert_array_equal(result.scaler.mean_, scaler.mean_)
+        np.testing.assert_array_equal(result.scaler.scale_, scaler.scale_)
+
+    def test_load_without_scaler_returns_none(
+        self, trained_model, sample_metadata, tmp_path
+    ):
+        """Verifica que los modelos guardados sin scaler cargan con scaler None."""
+        serializer = ModelSerializer()
+        model_path = tmp_path / "model.joblib"
+        serializer.save(trained_model, sample_metadata, model_path)
+
+        result = serializer.load(model_path)
+
+        assert result.scaler is None
+
     def test_load_raises_on_missing_file(self, tmp_path):
         """Verifica que load() lanza error si archivo no existe."""
         serializer = ModelSerializer()
@@ -0,0 +1,261 @@
+"""Tests unitarios para el servidor HTTP de inferencia."""
+
+import asyncio
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from ml_lambda.config import ARTIFACTS_DIR_ENV
+from ml_lambda.inference.batching import MicroBatcher
+from ml_lambda.inference.handler import LambdaHandler
+from ml_lambda.inference.server import (
+    HTTPRequest,
+    InferenceServer,
+    bind_socket,
+    to_api_gateway_event,
+)
+from ml_lambda.model.serializer import ModelMetadata, ModelSerializer
+
+PREDICT_BODY = json.dumps({"features": [5.1, 3.5, 1.4, 0.2]})
+
+
+@pytest.fixture
+def artifacts_dir(trained_model, tmp_path, monkeypatch):
+    """Directorio de artefactos con un modelo entrenado."""
+    metadata = ModelMetadata(
+        version="v1.0.0",
+        created_at=datetime.now(),
+        accuracy=0.95,
+        n_features=4,
+        n_classes=3,
+        feature_names=["sepal_length", "sepal_width", "petal_length", "petal_width"],
+        class_names=["setosa", "versicolor", "virginica"],
+        training_config={},
+    )
+    ModelSerializer().save(trained_model, metadata, tmp_path / "model.joblib")
+    from ml_lambda import config
+
+    monkeypatch.setattr(config.config, "artifacts_dir", tmp_path)
+    return tmp_path
+
+
+@contextmanager
+def _serving(server):
+    """Atiende en un hilo con su propio event loop; retorna el puerto."""
+    sock = bind_socket("127.0.0.1", 0)
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    thread = threading.Thread(
+        target=loop.run_until_complete, args=(server.serve(sock, stop),), daemon=True
+    )
+    thread.start()
+    try:
+        yield sock.getsockname()[1]
+    finally:
+        loop.call_soon_threadsafe(stop.set)
+        thread.join(timeout=5)
+        loop.close()
+
+
+@pytest.fixture
+def running_server(artifacts_dir):
+    """Servidor en marcha; retorna (servidor, puerto)."""
+    server = InferenceServer(LambdaHandler(), logger=Mock())
+    with _serving(server) as port:
+        yield server, port
+
+
+def _post(connection, body=PREDICT_BODY, path="/predict"):
+    connection.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    return response.status, response.read(), response
+
+
+class TestApiGatewayEvent:
+    """Tests para la traducción de HTTP a eventos de API Gateway."""
+
+    def test_event_matches_proxy_payload(self):
+        """Verifica los campos del evento proxy."""
+        request = HTTPRequest(
+            "POST",
+            "/predict?debug=1",
+            "HTTP/1.1",
+            {"content-type": "application/json"},
+            PREDICT_BODY.encode(),
+        )
+
+        event = to_api_gateway_event(request, "req-1", "10.0.0.1")
+
+        assert event["httpMethod"] == "POST"
+        assert event["path"] == "/predict"
+        assert event["queryStringParameters"] == {"debug": "1"}
+        assert event["body"] == PREDICT_BODY
+        assert event["requestContext"]["requestId"] == "req-1"
+        assert event["requestContext"]["identity"]["sourceIp"] == "10.0.0.1"
+        assert event["isBase64Encoded"] is False
+
+
+class TestInferenceServer:
+    """Tests para InferenceServer."""
+
+    def test_keep_alive_serves_several_requests(self, running_server):
+        """Verifica varias predicciones sobre la misma conexión."""
+        _, port = running_server
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+        results = [_post(connection) for _ in range(3)]
+
+        assert [status for status, _, _ in results] == [200, 200, 200]
+        assert json.loads(results[0][1])["class_name"] == "setosa"
+        assert results[0][2].getheader("Connection") == "keep-alive"
+        connection.close()
+
+    def test_concurrent_connections(self, running_server):
+        """Verifica solicitudes simultáneas desde varias conexiones."""
+        _, port = running_server
+
+        def predict(_):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            try:
+                return _post(connection)[0]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert list(pool.map(predict, range(32))) == [200] * 32
+
+    def test_routes_and_errors(self, running_server):
+        """Verifica salud, CORS, rutas desconocidas y errores del handler."""
+        _, port = running_server
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+        connection.request("GET", "/health")
+        health = connection.getresponse()
+        assert (health.status, json.loads(health.read())) == (200, {"status": "ok"})
+        connection.request("OPTIONS", "/predict")
+        options = connection.getresponse()
+        options.read()
+        assert options.status == 204
+        assert options.getheader("Access-Control-Allow-Origin") == "*"
+        assert _post(connection, path="/unknown")[0] == 404
+        connection.request("GET", "/predict")
+        method_not_allowed = connection.getresponse()
+        method_not_allowed.read()
+        assert method_not_allowed.status == 405
+        assert _post(connection, body=json.dumps({"features": [1.0]}))[0] == 400
+        connection.close()
+
+    def test_logs_stage_latencies(self, running_server):
+        """Verifica que cada solicitud registra la latencia de cada etapa."""
+        server, port = running_server
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        _post(connection)
+        connection.close()
+
+        record = server._logger.info.call_args
+        assert record.args[0] == "http_request"
+        for stage in ("parse", "load", "validate", "predict", "serialize"):
+            assert record.kwargs[f"{stage}_ms"] >= 0
+        assert record.kwargs["latency_ms"] >= record.kwargs["predict_ms"]
+
+    @pytest.mark.parametrize("batched", [False, True])
+    def test_slow_requests_do_not_block_the_event_loop(self, artifacts_dir, batched):
+        """Verifica que dos solicitudes lentas se atienden a la vez."""
+        handler = LambdaHandler()
+        handler.warm_up()
+        validate = handler._validator.validate_features_with_ranges
+
+        def slow_validate(features):
+            time.sleep(0.5)
+            return validate(features)
+
+        handler._validator.validate_features_with_ranges = slow_validate
+        batcher = MicroBatcher(max_batch_size=8, max_wait_ms=5) if batched else None
+        server = InferenceServer(handler, logger=Mock(), batcher=batcher)
+
+        with _serving(server) as port:
+
+            def predict(_):
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                try:
+                    return _post(connection)[0]
+                finally:
+                    connection.close()
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                statuses = list(pool.map(predict, range(2)))
+            elapsed = time.perf_counter() - start
+
+        assert statuses == [200, 200]
+        # En serie tardarían al menos 1 s
+        assert elapsed < 0.9
+
+    def test_oversized_header_line_is_rejected(self, running_server):
+        """Verifica 431 ante una cabecera mayor que el límite del reader."""
+        _, port = running_server
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"POST /predict HTTP/1.1\r\nX-Big: " + b"a" * 70_000 + b"\r\n\r\n")
+            response = sock.recv(1024)
+
+        assert response.startswith(b"HTTP/1.1 431")
+
+    def test_malformed_request_is_rejected(self, running_server):
+        """Verifica 400 ante una línea de solicitud inválida."""
+        _, port = running_server
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"GARBAGE\r\n\r\n")
+            response = sock.recv(1024)
+
+        assert response.startswith(b"HTTP/1.1 400")
+
+
+class TestServeScript:
+    """Tests para scripts/serve.py con varios workers."""
+
+    def test_serves_with_multiple_workers(self, artifacts_dir):
+        """Verifica que el servidor multi-proceso y con lotes responde y se detiene."""
+        project_root = Path(__file__).resolve().parents[2]
+        env = dict(os.environ)
+        env[ARTIFACTS_DIR_ENV] = str(artifacts_dir)
+        env["PYTHONPATH"] = os.pathsep.join([str(project_root / "src"), str(project_root)])
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "scripts.serve",
+                "--port",
+                "0",
+                "--workers",
+                "2",
+                "--max-batch-size",
+                "8",
+            ],
+            cwd=project_root,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        try:
+            banner = process.stdout.readline()
+            port = int(banner.split("http://127.0.0.1:")[1].split()[0])
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            statuses = [_post(connection)[0] for _ in range(4)]
+            connection.close()
+            assert statuses == [200] * 4
+        finally:
+            process.terminate()
+            assert process.wait(timeout=10) is not None
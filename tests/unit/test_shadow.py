@@ -0,0 +1,174 @@
+"""Tests unitarios para la evaluación en sombra."""
+
+import json
+import threading
+from unittest.mock import Mock
+
+import numpy as np
+from sklearn.dummy import DummyClassifier
+
+from ml_lambda.inference.handler import LambdaHandler
+from ml_lambda.inference.predictor import Predictor
+from ml_lambda.inference.registry import LoadedModel
+from ml_lambda.inference.shadow import ShadowEvaluator, ShadowStats
+
+EVENT = {"body": json.dumps({"features": [5.1, 3.5, 1.4, 0.2]})}
+CLASS_NAMES = ["setosa", "versicolor", "virginica"]
+
+
+def _constant_predictor(predicted_class):
+    model = DummyClassifier(strategy="constant", constant=predicted_class)
+    return Predictor(model.fit(np.zeros((3, 4)), [0, 1, 2]), CLASS_NAMES)
+
+
+class _BlockingPredictor(Predictor):
+    """Predictor de sombra que no termina hasta que se libera el evento."""
+
+    def __init__(self, predictor, release):
+        super().__init__(predictor._model, CLASS_NAMES)
+        self.release = release
+        self.entered = threading.Event()
+
+    def score_batch(self, rows):
+        self.entered.set()
+        self.release.wait()
+        return super().score_batch(rows)
+
+
+class TestShadowStats:
+    """Tests para ShadowStats."""
+
+    def test_agreement_and_probability_deltas(self):
+        """Verifica tasa de acuerdo y diferencias de probabilidad."""
+        stats = ShadowStats()
+        stats.add(
+            np.array([0, 1]),
+            np.array([0, 2]),
+            np.array([[1.0, 0.0, 0.0], [0.0, 0.6, 0.4]]),
+            np.array([[0.9, 0.1, 0.0], [0.0, 0.3, 0.7]]),
+        )
+
+        assert stats.samples == 2
+        assert stats.agreement_rate == 0.5
+        assert np.isclose(stats.mean_prob_delta, 0.2)
+        assert np.isclose(stats.max_prob_delta, 0.3)
+
+
+class TestShadowEvaluator:
+    """Tests para ShadowEvaluator."""
+
+    def test_scores_in_batches_and_logs_aggregates(self, trained_model):
+        """Verifica que se puntúa por lotes y se registra solo el agregado."""
+        primary = Predictor(trained_model, CLASS_NAMES)
+        logger = Mock()
+        evaluator = ShadowEvaluator(
+            _constant_predictor(0), batch_size=4, log_every=8, logger=logger
+        )
+        rows = [[5.1, 3.5, 1.4, 0.2], [6.7, 3.0, 5.2, 2.3]] * 4
+
+        for row in rows[:3]:
+            evaluator.submit(row, primary.predict(row))
+        assert evaluator.stats.samples == 0
+
+        for row in rows[3:]:
+            evaluator.submit(row, primary.predict(row))
+            evaluator.wait()
+
+        assert evaluator.stats.samples == 8
+        assert evaluator.stats.agreement_rate == 0.5
+        logger.info.assert_called_once()
+        assert logger.info.call_args.args[0] == "shadow_evaluation"
+        assert logger.info.call_args.kwargs["agreement_rate"] == 0.5
+
+    def test_waits_for_invocation_budget(self):
+        """Verifica que no se lanza un lote sin tiempo restante suficiente."""
+        predictor = _constant_predictor(0)
+        evaluator = ShadowEvaluator(predictor, batch_size=1, min_remaining_ms=500)
+        result = predictor.predict([5.1, 3.5, 1.4, 0.2])
+        context = Mock()
+        context.get_remaining_time_in_millis.return_value = 100
+
+        evaluator.submit([5.1, 3.5, 1.4, 0.2], result, context)
+        evaluator.wait()
+        assert evaluator.stats.samples == 0
+
+        context.get_remaining_time_in_millis.return_value = 10_000
+        evaluator.submit([5.1, 3.5, 1.4, 0.2], result, context)
+        evaluator.wait()
+        assert evaluator.stats.samples == 2
+
+    def test_drops_samples_beyond_max_pending(self):
+        """Verifica que la cola pendiente está acotada."""
+        release = threading.Event()
+        predictor = _constant_predictor(0)
+        evaluator = ShadowEvaluator(
+            _BlockingPredictor(predictor, release), batch_size=2, max_pending=2
+        )
+        result = predictor.predict([5.1, 3.5, 1.4, 0.2])
+
+        for _ in range(6):
+            evaluator.submit([5.1, 3.5, 1.4, 0.2], result)
+        release.set()
+        evaluator.flush()
+
+        assert evaluator.stats.samples == 4
+        assert evaluator.dropped == 2
+
+    def test_failures_are_logged_not_raised(self):
+        """Verifica que un fallo del modelo de sombra no se propaga."""
+        predictor = _constant_predictor(0)
+        broken = Mock()
+        broken.score_batch.side_effect = ValueError("shape mismatch")
+        logger = Mock()
+        evaluator = ShadowEvaluator(broken, batch_size=1, logger=logger)
+
+        evaluator.submit([5.1, 3.5, 1.4, 0.2], predictor.predict([5.1, 3.5, 1.4, 0.2]))
+        evaluator.wait()
+
+        assert evaluator.failures == 1
+        assert logger.error.call_args.args[0] == "shadow_evaluation_failed"
+
+
+class TestPrimaryLatency:
+    """Tests del camino principal con evaluación en sombra."""
+
+    def _handler(self, trained_model, shadow):
+        handler = LambdaHandler(shadow=shadow)
+        handler._loaded = LoadedModel(
+            trained_model, Mock(version="v1.0.0"), Predictor(trained_model, CLASS_NAMES), 0
+        )
+        return handler
+
+    def test_response_does_not_wait_for_shadow(self, trained_model):
+        """Verifica que la respuesta no espera a un modelo de sombra bloqueado."""
+        release = threading.Event()
+        shadow = ShadowEvaluator(
+            _BlockingPredictor(_constant_predictor(0), release), batch_size=1
+        )
+        handler = self._handler(trained_model, shadow)
+
+        responses = [handler.handle(EVENT, None) for _ in range(5)]
+
+        assert [r["statusCode"] for r in responses] == [200] * 5
+        assert shadow.stats.samples == 0
+        release.set()
+        shadow.flush()
+        assert shadow.stats.samples == 5
+
+    def test_primary_path_completes_while_shadow_batch_is_blocked(self, trained_model):
+        """Verifica que varios lotes de sombra pendientes no frenan al modelo principal."""
+        release = threading.Event()
+        blocking = _BlockingPredictor(_constant_predictor(0), release)
+        shadow = ShadowEvaluator(blocking, batch_size=4)
+        baseline = json.loads(self._handler(trained_model, None).handle(EVENT, None)["body"])
+        handler = self._handler(trained_model, shadow)
+
+        responses = [handler.handle(EVENT, None) for _ in range(12)]
+
+        assert blocking.entered.wait(timeout=5)
+        predictions = [json.loads(r["body"])["probabilities"] for r in responses]
+        assert predictions == [baseline["probabilities"]] * 12
+        assert shadow.stats.samples == 0
+        release.set()
+        shadow.flush()
+        assert shadow.stats.samples == 12
@@ -0,0 +1,152 @@
+"""Tests unitarios para la reducción de dependencias del paquete."""
+
+import pytest
+
+from ml_lambda.deploy import slimming as slimming_module
+from ml_lambda.deploy.slimming import (
+    SlimmingConfig,
+    slim_dependencies,
+    trace_imports,
+    unused_modules,
+)
+
+
+def _write(path, content="x = 1\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def dependencies_dir(tmp_path):
+    """Dependencias instaladas con tests, stubs y metadatos de pip."""
+    root = tmp_path / "dependencies"
+    _write(root / "fakelib" / "__init__.py", "")
+    _write(root / "fakelib" / "used.py")
+    _write(root / "fakelib" / "unused.py")
+    _write(root / "fakelib" / "data.json", "{}")
+    _write(root / "fakelib" / "_core.abi3.so", "binary")
+    _write(root / "fakelib" / "core.pyi")
+    _write(root / "fakelib" / "tests" / "test_core.py")
+    _write(root / "fakelib.libs" / "libfake.so", "binary")
+    _write(root / "fakelib-1.0.dist-info" / "METADATA", "Name: fakelib")
+    _write(
+        root / "fakelib-1.0.dist-info" / "RECORD",
+        "fakelib/__init__.py,sha256=x,0\nfakelib.libs/libfake.so,sha256=y,6\n",
+    )
+    _write(root / "fakelib-1.0.dist-info" / "licenses" / "LICENSE.md", "MIT")
+    return root
+
+
+@pytest.fixture
+def staging_dir(tmp_path):
+    """Código con un entry point que importa una parte de fakelib."""
+    root = tmp_path / "staging"
+    _write(root / "ml_lambda" / "__init__.py", "")
+    _write(
+        root / "ml_lambda" / "lambda_function.py",
+        "import fakelib.used\n\n"
+        "def lambda_handler(event, context):\n"
+        "    return {'statusCode': 200, 'body': event['body']}\n",
+    )
+    return root
+
+
+def _files(root):
+    return {p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file()}
+
+
+class TestSlimDependencies:
+    """Tests para slim_dependencies."""
+
+    def test_removes_tests_stubs_and_dist_info_clutter(self, dependencies_dir):
+        """Verifica que se eliminan solo los archivos innecesarios en runtime."""
+        result = slim_dependencies(dependencies_dir, SlimmingConfig(strip_binaries=False))
+
+        assert _files(dependencies_dir) == {
+            "fakelib/__init__.py",
+            "fakelib/used.py",
+            "fakelib/unused.py",
+            "fakelib/data.json",
+            "fakelib/_core.abi3.so",
+            "fakelib.libs/libfake.so",
+            "fakelib-1.0.dist-info/METADATA",
+            "fakelib-1.0.dist-info/top_level.txt",
+            "fakelib-1.0.dist-info/licenses/LICENSE.md",
+        }
+        assert (dependencies_dir / "fakelib-1.0.dist-info" / "top_level.txt").read_text() == (
+            "fakelib\n"
+        )
+        assert result.removed_files == 3
+        assert result.bytes_removed > 0
+
+    def test_disabled_steps_keep_files(self, dependencies_dir):
+        """Verifica que cada paso puede desactivarse."""
+        before = _files(dependencies_dir)
+
+        slim_dependencies(
+            dependencies_dir,
+            SlimmingConfig(
+                remove_tests=False,
+                remove_patterns=[],
+                clean_dist_info=False,
+                strip_binaries=False,
+            ),
+        )
+
+        assert _files(dependencies_dir) == before
+
+    def test_strips_shared_objects_when_strip_is_available(self, dependencies_dir, monkeypatch):
+        """Verifica que solo las extensiones (no las de auditwheel) pasan por strip."""
+        calls = []
+
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            return slimming_module.subprocess.CompletedProcess(command, 0)
+
+        monkeypatch.setattr(slimming_module.shutil, "which", lambda name: "/usr/bin/strip")
+        monkeypatch.setattr(slimming_module.subprocess, "run", fake_run)
+
+        result = slim_dependencies(dependencies_dir, SlimmingConfig())
+
+        extension = dependencies_dir / "fakelib" / "_core.abi3.so"
+        assert result.stripped_binaries == 1
+        assert calls == [["/usr/bin/strip", "--strip-debug", str(extension)]]
+
+    def test_cache_fields_change_with_layout_version(self, monkeypatch):
+        """Verifica que un cambio de layout invalida las capas cacheadas."""
+        before = SlimmingConfig().cache_fields()
+
+        monkeypatch.setattr(
+            slimming_module, "SLIMMING_LAYOUT_VERSION", slimming_module.SLIMMING_LAYOUT_VERSION + 1
+        )
+
+        assert SlimmingConfig().cache_fields() != before
+
+
+class TestImportPruning:
+    """Tests para la poda de módulos no importados."""
+
+    def test_trace_and_prune_unused_modules(self, dependencies_dir, staging_dir):
+        """Verifica que solo se podan módulos que la inferencia no importa."""
+        loaded = trace_imports(dependencies_dir, staging_dir, [5.1, 3.5, 1.4, 0.2])
+
+        assert loaded == {"fakelib/__init__.py", "fakelib/used.py"}
+        assert unused_modules(dependencies_dir, loaded, keep_patterns=[]) == {
+            "fakelib/unused.py",
+            "fakelib/_core.abi3.so",
+            "fakelib/tests/test_core.py",
+        }
+        assert unused_modules(dependencies_dir, loaded, keep_patterns=["fakelib/[u_]*"]) == {
+            "fakelib/tests/test_core.py",
+        }
+
+    def test_trace_fails_when_sample_prediction_fails(self, dependencies_dir, staging_dir):
+        """Verifica que una traza incompleta no se usa para podar."""
+        _write(
+            staging_dir / "ml_lambda" / "lambda_function.py",
+            "def lambda_handler(event, context):\n"
+            "    return {'statusCode': 500, 'body': 'error'}\n",
+        )
+
+        with pytest.raises(RuntimeError, match="Import trace failed"):
+            trace_imports(dependencies_dir, staging_dir, [5.1, 3.5, 1.4, 0.2])
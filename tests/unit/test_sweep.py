@@ -0,0 +1,109 @@
+"""Tests unitarios para el barrido de configuraciones."""
+
+import csv
+import json
+
+import pytest
+
+from ml_lambda.data.processor import DataProcessor
+from ml_lambda.training.sweep import SweepResult, SweepRunner, config_key, expand_grid
+from ml_lambda.training.trainer import TrainingConfig
+
+
+@pytest.fixture(scope="module")
+def split_data():
+    """División estándar de Iris."""
+    processor = DataProcessor()
+    X, y = processor.load_iris()
+    return processor.split_data(X, y)
+
+
+class TestExpandGrid:
+    """Tests para expand_grid."""
+
+    def test_expand_grid_builds_cartesian_product(self):
+        """Verifica que se genera una configuración por combinación."""
+        configs = expand_grid(
+            {"n_estimators": [5, 10], "max_depth": [2, 3, None]},
+            base=TrainingConfig(n_cv_folds=3),
+        )
+
+        assert len(configs) == 6
+        assert {(c.n_estimators, c.max_depth) for c in configs} == {
+            (5, 2), (5, 3), (5, None), (10, 2), (10, 3), (10, None)
+        }
+        assert all(c.n_cv_folds == 3 for c in configs)
+
+    def test_expand_grid_rejects_unknown_fields(self):
+        """Verifica que los campos desconocidos se rechazan."""
+        with pytest.raises(ValueError, match="learning_rate"):
+            expand_grid({"learning_rate": [0.1]})
+
+    def test_config_key_is_stable(self):
+        """Verifica que configuraciones iguales comparten clave."""
+        assert config_key(TrainingConfig(n_estimators=5)) == config_key(
+            TrainingConfig(n_estimators=5)
+        )
+        assert config_key(TrainingConfig(n_estimators=5)) != config_key(TrainingConfig())
+
+
+class TestSweepRunner:
+    """Tests para SweepRunner."""
+
+    def test_run_trains_every_config(self, split_data, tmp_path):
+        """Verifica que cada configuración produce un resultado medido."""
+        X_train, X_test, y_train, y_test = split_data
+        configs = expand_grid({"n_estimators": [3, 5]}, base=TrainingConfig(n_cv_folds=2))
+        runner = SweepRunner(tmp_path / "results.jsonl", max_workers=2, latency_samples=5)
+
+        results = runner.run(configs, X_train, y_train, X_test, y_test)
+
+        assert [r.config["n_estimators"] for r in results] == [3, 5]
+        for result in results:
+            assert isinstance(result, SweepResult)
+            assert 0.0 <= result.accuracy <= 1.0
+            assert result.model_size_bytes > 0
+            assert result.inference_latency_ms > 0
+        assert len((tmp_path / "results.jsonl").read_text().splitlines()) == 2
+
+    def test_run_resumes_from_results_file(self, split_data, tmp_path):
+        """Verifica que las configuraciones registradas no se reentrenan."""
+        X_train, X_test, y_train, y_test = split_data
+        results_path = tmp_path / "results.jsonl"
+        done = TrainingConfig(n_estimators=3, n_cv_folds=2)
+        recorded = SweepResult(
+            config_key=config_key(done),
+            config={"n_estimators": 3},
+            accuracy=0.123,
+            cv_mean=0.1,
+            cv_std=0.0,
+            training_time_seconds=0.0,
+            model_size_bytes=1,
+            inference_latency_ms=0.1,
+        )
+        results_path.write_text(
+            json.dumps(recorded.__dict__) + "\n" + '{"config_key": "trunc'
+        )
+        pending = TrainingConfig(n_estimators=4, n_cv_folds=2)
+        runner = SweepRunner(results_path, max_workers=1, latency_samples=1)
+
+        results = runner.run([done, pending], X_train, y_train, X_test, y_test)
+
+        assert results[0].accuracy == 0.123
+        assert results[1].config["n_estimators"] == 4
+        assert set(runner.load_results()) == {config_key(done), config_key(pending)}
+
+    def test_write_table_sorts_by_accuracy(self, tmp_path):
+        """Verifica que la tabla CSV incluye métricas y configuración."""
+        results = [
+            SweepResult("a", {"n_estimators": 5}, 0.8, 0.8, 0.0, 1.0, 10, 0.5),
+            SweepResult("b", {"n_estimators": 10}, 0.9, 0.9, 0.0, 2.0, 20, 0.7),
+        ]
+
+        SweepRunner.write_table(results, tmp_path / "table.csv")
+
+        with (tmp_path / "table.csv").open() as table:
+            rows = list(csv.DictReader(table))
+        assert [row["config_key"] for row in rows] == ["b", "a"]
+        assert rows[0]["n_estimators"] == "10"
+        assert rows[0]["inference_latency_ms"] == "0.7"
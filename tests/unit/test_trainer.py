@@ -5,6 +5,14 @@ import warnings
 import numpy as np
 import pytest
 from sklearn.datasets import load_iris
+from sklearn.metrics import (
+    accuracy_score,
+    classification_report,
+    confusion_matrix,
+    f1_score,
+    precision_score,
+    recall_score,
+)
 
 from src.ml_lambda.training.evaluator import EvaluationMetrics, ModelEvaluator
 from src.ml_lambda.training.trainer import ModelTrainer, TrainingConfig, TrainingResult
@@ -187,6 +195,65 @@ class TestModelEvaluator:
 
         assert len(metrics.classification_report) > 0
 
+    def test_evaluate_matches_sklearn_metrics(self):
+        """Verifica que las métricas derivadas de la matriz coinciden con sklearn."""
+        rng = np.random.default_rng(0)
+        y_true = rng.integers(0, 4, size=500)
+        y_pred = np.where(rng.random(500) < 0.7, y_true, rng.integers(0, 3, size=500))
+
+        class FixedModel:
+            def predict(self, X):
+                return y_pred
+
+        metrics = ModelEvaluator().evaluate(FixedModel(), None, y_true)
+
+        assert metrics.accuracy == pytest.approx(accuracy_score(y_true, y_pred))
+        assert metrics.precision == pytest.approx(
+            precision_score(y_true, y_pred, average="weighted", zero_division=0)
+        )
+        assert metrics.recall == pytest.approx(
+            recall_score(y_true, y_pred, average="weighted", zero_division=0)
+        )
+        assert metrics.f1_score == pytest.approx(
+            f1_score(y_true, y_pred, average="weighted", zero_division=0)
+        )
+        np.testing.assert_array_equal(metrics.confusion_matrix, confusion_matrix(y_true, y_pred))
+        assert metrics.classification_report == classification_report(
+            y_true, y_pred, zero_division=0
+        )
+
+    def test_evaluate_without_bootstrap_has_no_intervals(self, trained_model):
+        """Verifica que los intervalos de confianza son opcionales."""
+        model, X, y = trained_model
+
+        metrics = ModelEvaluator().evaluate(model, X, y)
+
+        assert metrics.confidence_intervals is None
+
+    def test_evaluate_bootstrap_intervals_contain_estimate(self, trained_model):
+        """Verifica que los intervalos bootstrap acotan la métrica observada."""
+        model, X, y = trained_model
+        X_noisy = X + np.random.default_rng(0).normal(0, 0.5, size=X.shape)
+
+        metrics = ModelEvaluator().evaluate(
+            model, X_noisy, y, n_bootstrap=500, random_state=0
+        )
+
+        assert set(metrics.confidence_intervals) == {"accuracy", "precision", "recall", "f1_score"}
+        low, high = metrics.confidence_intervals["accuracy"]
+        assert 0.0 <= low <= metrics.accuracy <= high <= 1.0
+        assert low < high
+
+    def test_bootstrap_rejects_empty_confusion_matrix(self):
+        """Verifica que el bootstrap exige al menos una muestra."""
+        with pytest.raises(ValueError, match="no tiene muestras"):
+            ModelEvaluator.bootstrap_confidence_intervals(np.zeros((3, 3), dtype=int))
+
+    def test_confusion_matrix_rejects_mismatched_lengths(self):
+        """Verifica que y_true e y_pred deben tener la misma longitud."""
+        with pytest.raises(ValueError, match="misma longitud"):
+            ModelEvaluator.confusion_matrix(np.array([0, 1]), np.array([0]))
+
     def test_check_accuracy_threshold_passes(self, trained_model):
         """Verifica que check_accuracy_threshold pasa con accuracy alto."""
         model, X, y = trained_model
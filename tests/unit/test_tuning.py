@@ -0,0 +1,165 @@
+"""Tests unitarios para el ajuste de memoria de Lambda."""
+
+from datetime import datetime
+
+import pytest
+
+from ml_lambda.deploy import tuning
+from ml_lambda.deploy.tuning import (
+    FULL_VCPU_MEMORY_MB,
+    PRICE_PER_REQUEST,
+    PowerTuner,
+    TierResult,
+    apply_memory_setting,
+    cpu_share,
+    format_table,
+    recommend,
+    request_cost,
+)
+from ml_lambda.model.serializer import ModelMetadata, ModelSerializer
+
+
+def _tier(memory_mb, p99_ms, cost_per_million):
+    return TierResult(
+        memory_mb=memory_mb,
+        cpu_share=cpu_share(memory_mb),
+        method="scaled",
+        cold_start_ms=1000.0,
+        mean_ms=p99_ms / 2,
+        p50_ms=p99_ms / 2,
+        p99_ms=p99_ms,
+        cost_per_million=cost_per_million,
+    )
+
+
+@pytest.fixture
+def artifacts_dir(trained_model, tmp_path):
+    """Directorio de artefactos con un modelo serializado."""
+    metadata = ModelMetadata(
+        version="v1.0.0",
+        created_at=datetime.now(),
+        accuracy=0.95,
+        n_features=4,
+        n_classes=3,
+        feature_names=["sepal_length", "sepal_width", "petal_length", "petal_width"],
+        class_names=["setosa", "versicolor", "virginica"],
+        training_config={},
+    )
+    ModelSerializer().save(trained_model, metadata, tmp_path / "model.joblib")
+    return tmp_path
+
+
+class TestCost:
+    """Tests para el modelo de CPU y coste de Lambda."""
+
+    def test_cpu_share_is_proportional_to_memory(self):
+        """Verifica que 1769 MB equivalen a una vCPU completa."""
+        assert cpu_share(FULL_VCPU_MEMORY_MB) == 1.0
+        assert cpu_share(FULL_VCPU_MEMORY_MB * 2) == 2.0
+
+    def test_duration_is_billed_per_started_millisecond(self):
+        """Verifica el redondeo de la duración facturada."""
+        assert request_cost(1024, 1.2, price_per_gb_second=1.0) == pytest.approx(
+            0.002 + PRICE_PER_REQUEST
+        )
+        assert request_cost(512, 2.0, price_per_gb_second=1.0) == pytest.approx(
+            0.001 + PRICE_PER_REQUEST
+        )
+
+
+class TestRecommend:
+    """Tests para recommend y format_table."""
+
+    def test_cheapest_tier_meeting_latency_target(self):
+        """Verifica que se elige el tier más barato dentro del objetivo."""
+        results = [_tier(128, 200.0, 0.40), _tier(512, 40.0, 0.45), _tier(1769, 12.0, 0.60)]
+
+        assert recommend(results).memory_mb == 128
+        assert recommend(results, max_p99_ms=50).memory_mb == 512
+        assert recommend(results, max_p99_ms=5).memory_mb == 1769
+
+    def test_table_marks_recommendation(self):
+        """Verifica que la tabla tiene una fila por tier y marca la elegida."""
+        results = [_tier(128, 200.0, 0.40), _tier(512, 40.0, 0.45)]
+
+        lines = format_table(results, results[1]).splitlines()
+
+        assert len(lines) == 3
+        assert lines[2].endswith("<- recommended")
+
+
+class TestPowerTuner:
+    """Tests para PowerTuner."""
+
+    def test_scaled_benchmark_of_lambda_handler(self, artifacts_dir):
+        """Verifica el benchmark real del handler escalado por tier."""
+        tuner = PowerTuner(
+            artifacts_dir, tiers=(1769, 256, 3008), invocations=20, warmup=2, use_cgroup=False
+        )
+
+        results = tuner.run()
+
+        assert [r.memory_mb for r in results] == [256, 1769, 3008]
+        assert {r.method for r in results} == {"scaled"}
+        slow, full, large = results
+        assert slow.p50_ms == pytest.approx(full.p50_ms / cpu_share(256))
+        assert large.p50_ms == pytest.approx(full.p50_ms)
+        assert large.cost_per_million > full.cost_per_million
+
+    def test_falls_back_to_scaled_when_cgroup_join_fails(
+        self, artifacts_dir, tmp_path, monkeypatch
+    ):
+        """Verifica el modo scaled si el benchmark no puede unirse al cgroup."""
+
+        class DeniedQuota:
+            def __init__(self, root, share):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                pass
+
+            def join(self):
+                raise PermissionError("cgroup.procs")
+
+        monkeypatch.setattr(tuning, "_cgroup_cpu_root", lambda: tmp_path)
+        monkeypatch.setattr(tuning, "_CpuQuota", DeniedQuota)
+
+        results = PowerTuner(artifacts_dir, tiers=(256, 1769), invocations=5, warmup=1).run()
+
+        assert {r.method for r in results} == {"scaled"}
+
+    def test_benchmark_failure_is_reported(self, tmp_path):
+        """Verifica que un modelo ausente hace fallar el benchmark."""
+        tuner = PowerTuner(tmp_path, invocations=1, warmup=0, use_cgroup=False)
+
+        with pytest.raises(RuntimeError):
+            tuner.run()
+
+
+class TestApplyMemorySetting:
+    """Tests para apply_memory_setting."""
+
+    def test_updates_config_and_terraform(self, tmp_path):
+        """Verifica que se reescriben ambas configuraciones."""
+        config_path = tmp_path / "config.py"
+        config_path.write_bytes(b"    lambda_timeout: int = 30\r\n    lambda_memory: int = 256\r\n")
+        terraform_path = tmp_path / "main.tf"
+        terraform_path.write_text('  timeout       = 30\n  memory_size   = 512\n')
+
+        apply_memory_setting(1024, config_path, terraform_path)
+
+        assert config_path.read_bytes() == (
+            b"    lambda_timeout: int = 30\r\n    lambda_memory: int = 1024\r\n"
+        )
+        assert "memory_size   = 1024" in terraform_path.read_text()
+
+    def test_missing_setting_raises(self, tmp_path):
+        """Verifica el error si el archivo no tiene la configuración."""
+        config_path = tmp_path / "config.py"
+        config_path.write_text("other = 1\n")
+
+        with pytest.raises(ValueError):
+            apply_memory_setting(512, config_path)
@@ -47,6 +47,14 @@ class TestInputValidator:
         assert result == features
         assert any("fuera de rango" in record.message for record in caplog.records)
 
+    def test_validate_features_with_ranges_counts_out_of_range(self):
+        """Test del recuento de features fuera de rango."""
+        assert InputValidator.validate_features_with_ranges([5.1, 3.5, 1.4, 0.2]) == (
+            [5.1, 3.5, 1.4, 0.2],
+            0,
+        )
+        assert InputValidator.validate_features_with_ranges([100.0, 9.0, 1.4, 0.2])[1] == 2
+
     def test_validate_body_size_valid(self):
         """Test de body con tamaño válido."""
         body = '{"features": [1, 2, 3, 4]}'